@@ -10,10 +10,21 @@ from .graphbot.store.base_store import ObjectNotFoundError
 from .assay_finder.router import router as assay_router
 from .gap_finder.router import router as gap_router
 from .graphbot.chats.router import router as graph_chat_router
+from .graphbot.jobs.router import router as graph_job_router
+from .graphbot.graph.router import router as graph_router
+from .graphbot.ingest.router import router as graph_ingest_router
+from .graphbot.sources.router import router as graph_sources_router
+from .graphbot.communities.router import router as graph_communities_router
 
 from .graphbot.chats.service import ChatService
+from .graphbot.jobs.service import JobService
+from .graphbot.graph.service import GraphService
+from .graphbot.ingest.service import IngestService
+from .graphbot.sources.service import SourceService
+from .graphbot.communities.service import CommunityService
+from .graphbot.knowledge.ingest import Ingestor
 from .graphbot.settings import settings
-from .graphbot.factory import make_store, make_chatbot
+from .graphbot.factory import make_store, make_chatbot, make_job_store, make_knowledge_index
 
 from .ai import OpenAIProvider
 
@@ -36,14 +47,45 @@ async def lifespan(app: FastAPI):
     app.state.settings = settings
 
     store = make_store(settings)
-    chatbot = make_chatbot(settings)
-
-    app.state.chat_service = ChatService(store, chatbot)
+    app.state.knowledge_index = make_knowledge_index(settings)
+    app.state.graph_service = GraphService(app.state.knowledge_index)
+    app.state.source_service = SourceService(app.state.knowledge_index)
+    app.state.community_service = CommunityService(app.state.knowledge_index)
+
+    chatbot = make_chatbot(settings, app.state.knowledge_index)
+    chatbot.open()
+
+    app.state.ingest_service = IngestService(
+        Ingestor(settings.graphrag_root),
+        app.state.knowledge_index,
+        chatbot,
+        watch_interval=settings.ingest_watch_interval,
+    )
+    app.state.ingest_service.watch()
+
+    app.state.chat_service = ChatService(
+        store,
+        chatbot,
+        max_queue_depth=settings.chat_queue_depth,
+        queue_deadline=settings.chat_queue_deadline,
+    )
+    app.state.job_service = JobService(
+        make_job_store(settings),
+        app.state.chat_service,
+        workers=settings.job_workers,
+        max_queued=settings.job_queue_size,
+    )
+    app.state.job_service.start()
     
     app.state.provider = OpenAIProvider(api_key=os.getenv("OPENAI_API_KEY"))
 
     yield
 
+    await app.state.job_service.stop()
+    await app.state.ingest_service.stop()
+    chatbot.close()
+    await store.close()
+
 app = FastAPI(
     title="Chatbot API",
     version="1.0.0",
@@ -69,6 +111,11 @@ async def object_not_found_handler(request: Request, exc: ObjectNotFoundError):
 app.include_router(assay_router, prefix="/api/v1")
 app.include_router(gap_router, prefix="/api/v1")
 app.include_router(graph_chat_router, prefix="/api/v1/chats")
+app.include_router(graph_job_router, prefix="/api/v1")
+app.include_router(graph_router, prefix="/api/v1/graph")
+app.include_router(graph_ingest_router, prefix="/api/v1/ingest")
+app.include_router(graph_sources_router, prefix="/api/v1/sources")
+app.include_router(graph_communities_router, prefix="/api/v1/communities")
 
 @app.get("/")
 def root():
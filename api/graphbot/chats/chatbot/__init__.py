@@ -1,4 +1,4 @@
 from .chatbot import ChatBot
 
 from .dummy_bot import DummyBot
-from .chatbot_message import ChatBotMessage, to_chatbot_messages
\ No newline at end of file
+from .chatbot_message import ChatBotMessage, ChatHistory
\ No newline at end of file
@@ -1,9 +1,33 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
+from uuid import UUID
+
 from .chatbot_message import ChatBotMessage
 
 
 class ChatBot(ABC):
 
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def reload(self) -> None:
+        """The knowledge it answers from changed: drop anything derived from it."""
+        pass
+
+    def spaces(self) -> list[dict]:
+        """The knowledge spaces `reply` accepts as `space`, if it serves more than one."""
+        return []
+
     @abstractmethod
-    async def reply(self, user_input: str, chat_history: list[ChatBotMessage], method: str) -> str:
+    async def reply(
+        self,
+        user_input: str,
+        chat_history: Sequence[ChatBotMessage],
+        method: str,
+        chat_uuid: UUID | None = None,
+        space: str | None = None,
+    ) -> str:
         pass
@@ -1,13 +1,48 @@
-from dataclasses import dataclass
-from typing import List
+from typing import Iterator, Protocol, Sequence, overload
 
-from ..models import ChatMessage, ROLE
+from ..models import ChatMessage
 
 
-@dataclass(frozen=True)
-class ChatBotMessage:
+class ChatBotMessage(Protocol):
     role: str
     content: str
 
-def to_chatbot_messages(messages: List[ChatMessage]) -> List[ChatBotMessage]:
-    return [ChatBotMessage(role=m.role.value, content=m.content) for m in messages]
+
+class ChatHistory(Sequence[ChatBotMessage]):
+    """
+    Read-only view over the first `len(messages)` entries of a chat, taken when
+    the view is created. Nothing is copied: messages are frozen and chats only
+    grow at the end while a reply is in flight (the chat lock is held), so the
+    view stays valid for the whole `ChatBot.reply` call.
+    """
+
+    __slots__ = ("_messages", "_len")
+
+    def __init__(self, messages: list[ChatMessage]) -> None:
+        self._messages = messages
+        self._len = len(messages)
+
+    def __len__(self) -> int:
+        return self._len
+
+    @overload
+    def __getitem__(self, i: int) -> ChatBotMessage: ...
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[ChatBotMessage]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._messages[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("chat history index out of range")
+        return self._messages[i]
+
+    def __iter__(self) -> Iterator[ChatBotMessage]:
+        messages = self._messages
+        for i in range(self._len):
+            yield messages[i]
+
+    def __repr__(self) -> str:
+        return f"ChatHistory({self._len} messages)"
@@ -1,8 +1,18 @@
+from typing import Sequence
+from uuid import UUID
+
 from .chatbot import ChatBot
 from .chatbot_message import ChatBotMessage
 
 
 class DummyBot(ChatBot):
 
-    async def reply(self, user_input: str, chat_history: list[ChatBotMessage], method: str) -> str:
+    async def reply(
+        self,
+        user_input: str,
+        chat_history: Sequence[ChatBotMessage],
+        method: str,
+        chat_uuid: UUID | None = None,
+        space: str | None = None,
+    ) -> str:
         return user_input[::-1]
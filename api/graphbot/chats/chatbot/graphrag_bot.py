@@ -1,67 +1,85 @@
 import asyncio
-from pathlib import Path
-
-from graphrag.cli.query import run_drift_search, run_global_search, run_local_search
-from graphrag.cli.main import SearchType
+import json
+import logging
+import time
+from typing import Sequence
+from uuid import UUID
 
 from .chatbot import ChatBot
 from .chatbot_message import ChatBotMessage
-from ...settings import settings
+from ...knowledge import ConversationContexts, EmbeddingCache, GraphRAGSearch, KnowledgeIndex
+from ...knowledge.method_router import AUTO_METHOD, SearchMethodRouter
+from ...knowledge.worker_pool import SearchProcessPool
 
-INVALID_METHOD_ERROR = "Invalid method"
+logger = logging.getLogger(__name__)
 
 class GraphRAGBot(ChatBot):
 
-    async def reply(
+    def __init__(
         self,
-        user_input: str,
-        chat_history: list[ChatBotMessage],
-        method: str,
-        config: Path | None = None,
-    ) -> str:
-        # Ejecutamos la búsqueda sin bloquear el loop actual porque
-        # las funciones `run_*_search` usan `asyncio.run` internamente.
-        return await asyncio.to_thread(
-            self._run_search,
-            user_input,
-            chat_history,
-            method,
-            config,
-        )
+        index: KnowledgeIndex,
+        embedding_cache: EmbeddingCache | None = None,
+        pool: SearchProcessPool | None = None,
+    ):
+        self.index = index
+        self.search = GraphRAGSearch(index, embedding_cache)
+        self.router = SearchMethodRouter(index)
+        self.pool = pool
+        self.conversations = ConversationContexts()
+
+    def open(self) -> None:
+        if self.pool is not None:
+            self.pool.start()
 
-    def _run_search(
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def reload(self) -> None:
+        # El índice en proceso ya se recargó; los contextos guardados apuntan a la versión anterior.
+        self.conversations = ConversationContexts(self.conversations.max_chats)
+        if self.pool is not None:
+            self.pool.restart()
+
+    async def reply(
         self,
         user_input: str,
-        chat_history: list[ChatBotMessage],
+        chat_history: Sequence[ChatBotMessage],
         method: str,
-        config: Path | None,
+        chat_uuid: UUID | None = None,
+        space: str | None = None,
     ) -> str:
-        match method:
-            case SearchType.LOCAL.value:
-                response, _context_data = run_local_search(
-                    config_filepath=config,
-                    data_dir=None,
-                    root_dir=settings.graphrag_root,
-                    streaming=False,
-                    community_level=2,
-                    response_type="Multiple Paragraphs",
-                    query=user_input,
-                )
-            case SearchType.GLOBAL.value:
-                response, _context_data = run_global_search(
-                    config_filepath=config,
-                    root_dir=settings.graphrag_root,
-                    streaming=False,
-                    query=user_input,
-                )
-            case SearchType.DRIFT.value:
-                response, _context_data = run_drift_search(
-                    config_filepath=config,
-                    root_dir=settings.graphrag_root,
-                    streaming=False,  # Drift search does not support streaming (yet)
-                    query=user_input,
-                )
-            case _:
-                raise ValueError(INVALID_METHOD_ERROR)
+        requested = method
+        decision = None
+        if method == AUTO_METHOD:
+            # The first route after a (re)load builds the text index: not on the loop.
+            decision = await asyncio.to_thread(self.router.route, user_input)
+            method = decision.method
+
+        start = time.perf_counter()
+
+        # Cada chat conserva su contexto de búsqueda local entre turnos (solo en modo
+        # hilo: los procesos del pool no comparten memoria con este).
+        conversation = None
+        if self.pool is not None:
+            response = await self.pool.run(method, user_input)
+        else:
+            if chat_uuid is not None:
+                conversation = self.conversations.get(chat_uuid)
+            # Ejecutamos la búsqueda sin bloquear el loop actual: la construcción
+            # del contexto de graphrag es síncrona y usa su propio `asyncio.run`.
+            response = await asyncio.to_thread(self.search.run, method, user_input, conversation)
+
+        # Una línea JSON por búsqueda para poder ajustar el router con datos reales.
+        logger.info("search %s", json.dumps({
+            "requested": requested,
+            "method": method,
+            "reason": decision.reason if decision else None,
+            "entity_hits": list(decision.entity_hits) if decision else [],
+            "latency_s": round(time.perf_counter() - start, 3),
+            "query_chars": len(user_input),
+            "mode": "process" if self.pool is not None else "thread",
+            "conversation": conversation.stats() if conversation is not None and method == "local" else None,
+        }, ensure_ascii=False))
 
         return response
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Iterable, Sequence
+from uuid import UUID
+
+from .chatbot import ChatBot
+from .chatbot_message import ChatBotMessage
+from ...knowledge.spaces import KnowledgeSpaces
+
+
+class MultiSpaceBot(ChatBot):
+    """
+    One chatbot per GraphRAG space, picked by the `space` of each message
+    (`default` when it has none). The default space's bot is pinned; the
+    others are loaded on first use and evicted by `KnowledgeSpaces`.
+    """
+
+    def __init__(
+        self,
+        knowledge_spaces: KnowledgeSpaces[ChatBot],
+        default: str,
+        default_bot: ChatBot,
+        preload: Iterable[str] = (),
+    ) -> None:
+        self.knowledge_spaces = knowledge_spaces
+        self.default = default
+        self.default_bot = default_bot
+        self.preload = list(preload)
+        knowledge_spaces.add(default, default_bot, pinned=True)
+
+    def open(self) -> None:
+        self.default_bot.open()
+        self.knowledge_spaces.preload(self.preload)
+
+    def close(self) -> None:
+        self.knowledge_spaces.close()
+
+    def reload(self) -> None:
+        # Only the default space is ingested into while serving (see `IngestService`).
+        self.default_bot.reload()
+
+    def spaces(self) -> list[dict]:
+        return [{**space, "default": space["name"] == self.default} for space in self.knowledge_spaces.stats()]
+
+    async def reply(
+        self,
+        user_input: str,
+        chat_history: Sequence[ChatBotMessage],
+        method: str,
+        chat_uuid: UUID | None = None,
+        space: str | None = None,
+    ) -> str:
+        name = space or self.default
+        # `touch` is a dictionary lookup under the registry lock (nothing is
+        # weighed or loaded while it is held); loading a space reads its tables
+        # and vectors: never on the event loop.
+        bot = self.knowledge_spaces.touch(name) or await asyncio.to_thread(self.knowledge_spaces.get, name)
+        return await bot.reply(user_input, chat_history, method, chat_uuid=chat_uuid)
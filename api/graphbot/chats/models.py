@@ -1,18 +1,91 @@
 from dataclasses import dataclass, field
 from enum import Enum
+from uuid import UUID
 
-from ..store import BaseModel
+from ..store import BaseModel, Mutation
 
 
 class ROLE(str, Enum):
     ASSISTANT = "assistant"
     USER = "user"
 
-@dataclass
+# Frozen and slotted: no per-message __dict__, and history views can hand the
+# stored objects to chatbots without copying them. `role` is always one of the
+# ROLE singletons (a `str`), never a fresh string.
+@dataclass(frozen=True, slots=True)
 class ChatMessage:
     role: ROLE
     content: str
 
 @dataclass
 class Chat(BaseModel):
-    messages: list[ChatMessage] = field(default_factory=list)
\ No newline at end of file
+    messages: list[ChatMessage] = field(default_factory=list)
+    # Messages trimmed from the head so far: `messages[i]` has sequence number `offset + i`.
+    offset: int = 0
+
+    def trim_messages(self, max_messages: int) -> int:
+        """Drop the oldest messages past `max_messages`; returns how many were dropped."""
+        excess = len(self.messages) - max_messages
+        if max_messages <= 0 or excess <= 0:
+            return 0
+
+        del self.messages[:excess]
+        self.offset += excess
+        return excess
+
+    def approx_bytes(self) -> int:
+        # Message text plus a rough per-message overhead (slotted object, str header, list slot).
+        return sum(len(m.content) for m in self.messages) + 104 * len(self.messages)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Chat":
+        return cls(
+            uuid=UUID(str(data["uuid"])),
+            messages=[ChatMessage(role=ROLE(m["role"]), content=m["content"]) for m in data.get("messages", [])],
+            offset=data.get("offset", 0),
+        )
+
+@dataclass(frozen=True)
+class AppendMessage(Mutation[Chat]):
+    role: ROLE
+    content: str
+
+    def __call__(self, chat: Chat) -> None:
+        chat.messages.append(ChatMessage(role=ROLE(self.role), content=self.content))
+
+
+@dataclass(frozen=True)
+class MessagePage:
+    """Messages `start` (inclusive) to `end` (exclusive) by sequence number; `first` is the oldest one kept."""
+    start: int
+    end: int
+    first: int
+    messages: list[ChatMessage]
+
+    @property
+    def next_before(self) -> int | None:
+        return self.start if self.start > self.first else None
+
+@dataclass(frozen=True)
+class ReadMessages:
+    """
+    Read query for `BaseStore.read`: the last `limit` messages before sequence
+    number `before` (or before the end). Stores that index messages answer it
+    without loading the whole chat.
+    """
+    limit: int
+    before: int | None = None
+
+    def bounds(self, first: int, end: int) -> tuple[int, int]:
+        stop = end if self.before is None else max(first, min(self.before, end))
+        return max(first, stop - self.limit), stop
+
+    def __call__(self, chat: Chat) -> MessagePage:
+        end = chat.offset + len(chat.messages)
+        start, stop = self.bounds(chat.offset, end)
+        return MessagePage(
+            start=start,
+            end=end,
+            first=chat.offset,
+            messages=chat.messages[start - chat.offset:stop - chat.offset],
+        )
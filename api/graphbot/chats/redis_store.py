@@ -0,0 +1,222 @@
+import json
+import time
+
+from typing import Callable
+from uuid import UUID
+
+import redis
+
+from .models import ROLE, AppendMessage, Chat, ChatMessage, MessagePage, ReadMessages
+from ..store import BaseStore, ObjectNotFoundError
+from ..store.base_store import R
+
+
+class RedisChatStore(BaseStore[Chat]):
+    """
+    `BaseStore[Chat]` on any server speaking the Redis protocol, shared by every
+    API instance behind a load balancer.
+
+    Per chat: a hash `<prefix>chat:{uuid}:meta` with its metadata (including
+    `appended`, messages ever added, so sequence numbers survive `LTRIM`) and a
+    list `<prefix>chat:{uuid}:messages` with one `[role, content]` JSON entry per
+    message. The `{uuid}` hash tag keeps both keys in the same cluster slot.
+    Appending a message is one `RPUSH` (plus `LTRIM` / `EXPIRE` when
+    `max_messages` / `idle_ttl` are set) in a single round-trip transaction.
+
+    `client` can be any `redis.Redis`-compatible object (e.g. `fakeredis` for
+    an in-process server); otherwise one is built on a connection pool for `url`.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        prefix: str = "graphbot:",
+        max_connections: int = 32,
+        max_messages: int = 0,
+        idle_ttl: float = 0,
+        client: "redis.Redis | None" = None,
+    ) -> None:
+        self.prefix = prefix
+        self.max_messages = max_messages
+        self.idle_ttl = int(idle_ttl)
+
+        if client is None:
+            pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+            client = redis.Redis(connection_pool=pool)
+        self.client = client
+
+    # Keys
+    def _meta_key(self, uuid: UUID) -> str:
+        return f"{self.prefix}chat:{{{uuid}}}:meta"
+
+    def _messages_key(self, uuid: UUID) -> str:
+        return f"{self.prefix}chat:{{{uuid}}}:messages"
+
+    # BaseStore
+    def create(self, obj: Chat) -> bool:
+        # One MULTI/EXEC: nobody sees the chat before its messages, and a failed
+        # write leaves no chat behind.
+        def write(pipe: redis.client.Pipeline) -> bool:
+            if pipe.exists(self._meta_key(obj.uuid)):
+                return False
+            pipe.multi()
+            pipe.hset(self._meta_key(obj.uuid), "created_at", time.time())
+            self._write_messages(pipe, obj)
+            self._expire(pipe, obj.uuid)
+            return True
+
+        return self._transaction(obj.uuid, write)
+
+    def get(self, uuid: UUID) -> Chat | None:
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.hget(self._meta_key(uuid), "created_at")
+            pipe.hget(self._meta_key(uuid), "appended")
+            pipe.lrange(self._messages_key(uuid), 0, -1)
+            created_at, appended, raw = pipe.execute()
+
+        if created_at is None:
+            return None
+        return self._chat(uuid, appended, raw)
+
+    def require(self, uuid: UUID) -> Chat:
+        obj = self.get(uuid)
+        if obj is None:
+            raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+        return obj
+
+    def update(self, uuid: UUID, obj: Chat) -> bool:
+        if obj.uuid != uuid:
+            raise ValueError(f"Object's UUID ({obj.uuid}) does not match the UUID argument ({uuid})")
+
+        def write(pipe: redis.client.Pipeline) -> bool:
+            if not pipe.exists(self._meta_key(uuid)):
+                return False
+            pipe.multi()
+            pipe.delete(self._messages_key(uuid))
+            self._write_messages(pipe, obj)
+            self._expire(pipe, uuid)
+            return True
+
+        return self._transaction(uuid, write)
+
+    def mutate(self, uuid: UUID, fn: Callable[[Chat], None]) -> Chat:
+        def write(pipe: redis.client.Pipeline) -> Chat:
+            if not pipe.exists(self._meta_key(uuid)):
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+            appended = pipe.hget(self._meta_key(uuid), "appended")
+            obj = self._chat(uuid, appended, pipe.lrange(self._messages_key(uuid), 0, -1))
+            fn(obj)
+
+            pipe.multi()
+            pipe.delete(self._messages_key(uuid))
+            self._write_messages(pipe, obj)
+            self._expire(pipe, uuid)
+            return obj
+
+        return self._transaction(uuid, write)
+
+    def apply(self, uuid: UUID, mutation: Callable[[Chat], None]) -> None:
+        if not isinstance(mutation, AppendMessage):
+            return super().apply(uuid, mutation)
+
+        def write(pipe: redis.client.Pipeline) -> None:
+            if not pipe.exists(self._meta_key(uuid)):
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+            pipe.multi()
+            pipe.rpush(self._messages_key(uuid), _encode(mutation.role, mutation.content))
+            pipe.hincrby(self._meta_key(uuid), "appended", 1)
+            if self.max_messages > 0:
+                pipe.ltrim(self._messages_key(uuid), -self.max_messages, -1)
+            self._expire(pipe, uuid)
+
+        self._transaction(uuid, write)
+
+    def read(self, uuid: UUID, query: Callable[[Chat], R]) -> R:
+        if not isinstance(query, ReadMessages):
+            return super().read(uuid, query)
+
+        meta_key, messages_key = self._meta_key(uuid), self._messages_key(uuid)
+        with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    # Sizes first, under WATCH, to turn the query into list offsets...
+                    pipe.watch(meta_key, messages_key)
+                    if not pipe.exists(meta_key):
+                        raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+                    end = int(pipe.hget(meta_key, "appended") or 0)
+                    first = end - pipe.llen(messages_key)
+                    start, stop = query.bounds(first, end)
+
+                    # ...then the page in MULTI/EXEC: it fails, and the read starts
+                    # over, if an append or trim ran in between.
+                    pipe.multi()
+                    if stop > start:
+                        pipe.lrange(messages_key, start - first, stop - first - 1)
+                    raw = pipe.execute()[0] if stop > start else []
+                    return MessagePage(start=start, end=end, first=first, messages=[_decode(m) for m in raw])
+                except redis.WatchError:
+                    continue
+                finally:
+                    pipe.reset()
+
+    def delete(self, uuid: UUID) -> bool:
+        with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._meta_key(uuid))
+            pipe.delete(self._messages_key(uuid))
+            deleted, _ = pipe.execute()
+        return deleted > 0
+
+    def count(self) -> int:
+        # O(chats): only used by metrics.
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.prefix}chat:*:meta", count=1000))
+
+    def close(self) -> None:
+        self.client.close()
+
+    # Helpers
+    def _transaction(self, uuid: UUID, write: Callable[["redis.client.Pipeline"], object]):
+        """
+        Optimistic transaction on the chat's keys: `write` reads in immediate
+        mode, calls `pipe.multi()` and queues its writes; it is retried if
+        another client touched the keys in between.
+        """
+        keys = (self._meta_key(uuid), self._messages_key(uuid))
+        with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    pipe.watch(*keys)
+                    result = write(pipe)
+                    if pipe.explicit_transaction:
+                        pipe.execute()
+                    return result
+                except redis.WatchError:
+                    continue
+                finally:
+                    pipe.reset()
+
+    def _chat(self, uuid: UUID, appended: bytes | None, raw: list) -> Chat:
+        return Chat(uuid=uuid, messages=[_decode(m) for m in raw], offset=int(appended or 0) - len(raw))
+
+    def _write_messages(self, pipe: "redis.client.Pipeline", obj: Chat) -> None:
+        pipe.hset(self._meta_key(obj.uuid), "appended", obj.offset + len(obj.messages))
+        messages = obj.messages[-self.max_messages:] if self.max_messages > 0 else obj.messages
+        if messages:
+            pipe.rpush(self._messages_key(obj.uuid), *(_encode(m.role, m.content) for m in messages))
+
+    def _expire(self, pipe: "redis.client.Pipeline", uuid: UUID) -> None:
+        if self.idle_ttl > 0:
+            pipe.expire(self._meta_key(uuid), self.idle_ttl)
+            pipe.expire(self._messages_key(uuid), self.idle_ttl)
+
+
+def _encode(role: ROLE | str, content: str) -> str:
+    return json.dumps([ROLE(role).value, content], ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode(raw: bytes | str) -> ChatMessage:
+    role, content = json.loads(raw)
+    return ChatMessage(role=ROLE(role), content=content)
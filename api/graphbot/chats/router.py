@@ -1,38 +1,128 @@
+import asyncio
 from uuid import UUID
-from fastapi import APIRouter, Request, Response, status, Depends, HTTPException
+from fastapi import APIRouter, Request, Response, status, Depends, HTTPException, Query
 
-from .schemas import PromptAnswerResponse, MessageRequest, CreateChatResponse
-from .service import ChatService, ChatBusyError
+from .models import MessagePage
+from .schemas import (
+    PromptAnswerResponse, MessageRequest, CreateChatResponse,
+    ChatResponse, ChatMessagesResponse, ChatMessageResponse, SpaceResponse,
+)
+from .service import ChatService, ChatQueueFullError, ChatQueueTimeoutError
 from ..deps import Deps
+from ..knowledge.spaces import SpaceNotFoundError
 
 router = APIRouter(tags=["chats"])
 
 
+def _page_fields(page: MessagePage) -> dict:
+    return {
+        "messages": [
+            ChatMessageResponse(seq=page.start + i, role=m.role.value, content=m.content)
+            for i, m in enumerate(page.messages)
+        ],
+        "next_before": page.next_before,
+        "end": page.end,
+    }
+
+
 @router.get("", response_model=CreateChatResponse, status_code=status.HTTP_201_CREATED)
-def create_chat(
+async def create_chat(
     request: Request,
     response: Response,
     service: ChatService = Depends(Deps.get_chat_service),
 ) -> CreateChatResponse:
     
-    new_chat = service.create_chat()
+    new_chat = await service.create_chat()
 
     response.headers["Location"] = f"/api/v1/chats/{new_chat.uuid}/messages"
 
     return CreateChatResponse(chat_uuid=new_chat.uuid)
 
 
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+async def get_chat_metrics(
+    request: Request,
+    service: ChatService = Depends(Deps.get_chat_service),
+) -> dict:
+    return await service.metrics()
+
+
+@router.get("/spaces", response_model=list[SpaceResponse], status_code=status.HTTP_200_OK)
+async def get_spaces(
+    request: Request,
+    service: ChatService = Depends(Deps.get_chat_service),
+) -> list[SpaceResponse]:
+    """Knowledge spaces a message can name as `space`, and which of them are in memory."""
+    # Weighing the loaded spaces reads their indexes: not on the event loop.
+    return [SpaceResponse(**space) for space in await asyncio.to_thread(service.spaces)]
+
+
 @router.post("/{chat_uuid}/messages", response_model=PromptAnswerResponse, status_code=status.HTTP_200_OK)
 async def post_chat_message(
     request: Request,
+    response: Response,
     chat_uuid: UUID,
     payload: MessageRequest,
     service: ChatService = Depends(Deps.get_chat_service),
 ) -> PromptAnswerResponse:
+    """
+    Answers once the chat's earlier messages are answered. `queue_position` (and
+    the `X-Queue-Position` header) tell how many were ahead when it arrived; a
+    429 carries the same header with the messages that made the queue full.
+    """
+    positions: list[int] = []
     try:
-        answer = await service.reply_to_user(chat_uuid, payload.message, payload.metodo)
+        answer = await service.reply_to_user(
+            chat_uuid, payload.message, payload.metodo, space=payload.space,
+            on_queued=lambda ticket, position: positions.append(position),
+        )
+
+        response.headers["X-Queue-Position"] = str(positions[0])
+        return PromptAnswerResponse(answer=answer, queue_position=positions[0])
 
-        return PromptAnswerResponse(answer=answer)
+    except SpaceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     
-    except ChatBusyError as e:
-        raise HTTPException(status_code=409, detail=str(e))
+    except ChatQueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "5", "X-Queue-Position": str(e.position)},
+        )
+
+    except ChatQueueTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
+@router.get("/{chat_uuid}/queue", status_code=status.HTTP_200_OK)
+async def get_chat_queue(
+    request: Request,
+    chat_uuid: UUID,
+    service: ChatService = Depends(Deps.get_chat_service),
+) -> dict:
+    await service.require_chat(chat_uuid)
+    return service.queue_status(chat_uuid)
+
+
+@router.get("/{chat_uuid}", response_model=ChatResponse, status_code=status.HTTP_200_OK)
+async def get_chat(
+    request: Request,
+    chat_uuid: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    service: ChatService = Depends(Deps.get_chat_service),
+) -> ChatResponse:
+    # The chat with its latest `limit` messages; older ones via GET /{chat_uuid}/messages?before=.
+    page = await service.get_messages(chat_uuid, limit)
+
+    return ChatResponse(uuid=chat_uuid, **_page_fields(page))
+
+
+@router.get("/{chat_uuid}/messages", response_model=ChatMessagesResponse, status_code=status.HTTP_200_OK)
+async def get_chat_messages(
+    request: Request,
+    chat_uuid: UUID,
+    before: int | None = Query(None, ge=0, description="Only messages with `seq` lower than this"),
+    limit: int = Query(50, ge=1, le=200),
+    service: ChatService = Depends(Deps.get_chat_service),
+) -> ChatMessagesResponse:
+    page = await service.get_messages(chat_uuid, limit, before)
+
+    return ChatMessagesResponse(**_page_fields(page))
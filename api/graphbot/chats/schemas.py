@@ -7,15 +7,32 @@ class CreateChatResponse(BaseModel):
 
 class MessageRequest(BaseModel):
     message: str = Field(example="¡Hola! ¿Qué tal?")
-    metodo: str = Field(example="local")
+    metodo: str = Field(example="local", description="local | global | drift | auto")
+    space: str | None = Field(default=None, example=None, description="Knowledge space to answer from; the default one if null")
 
 class PromptAnswerResponse(BaseModel):
     answer: str = Field(example="No puedo ayudarte con eso.")
+    queue_position: int = Field(
+        default=0, example=0,
+        description="Messages of the chat ahead of this one when it arrived (0: answered right away)",
+    )
+
+class SpaceResponse(BaseModel):
+    name: str = Field(example="biology_space")
+    default: bool = Field(example=True)
+    loaded: bool = Field(example=True)
+    pinned: bool = Field(example=True)
+    approx_mb: float = Field(example=180.5)
 
 class ChatMessageResponse(BaseModel):
+    seq: int = Field(example=0, description="Position of the message in the chat, stable across pages")
     role: str = Field(example="assistant")
     content: str = Field(example="¡Hola! ¿Qué tal?")
 
-class ChatResponse(BaseModel):
-    uuid: UUID = Field(default_factory=uuid4, example=str(uuid4()))
+class ChatMessagesResponse(BaseModel):
     messages: list[ChatMessageResponse] = Field(default_factory=list, example=[])
+    next_before: int | None = Field(example=None, description="`before` for the previous page; null at the first message")
+    end: int = Field(example=0, description="`seq` the next message will get")
+
+class ChatResponse(ChatMessagesResponse):
+    uuid: UUID = Field(default_factory=uuid4, example=str(uuid4()))
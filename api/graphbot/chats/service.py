@@ -1,62 +1,185 @@
 import asyncio
-from collections import defaultdict
-from typing import Dict
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict
 from uuid import UUID
 
-from .models import ROLE, ChatMessage, Chat
-from .chatbot import ChatBot, to_chatbot_messages
-from ..store import BaseStore
+from .models import ROLE, AppendMessage, ChatMessage, Chat, MessagePage, ReadMessages
+from .chatbot import ChatBot, ChatHistory
+from ..store import AsyncBaseStore
 
 
-class ChatBusyError(RuntimeError):
+class ChatQueueFullError(RuntimeError):
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(message)
+        # Messages ahead: the one being answered plus those waiting.
+        self.position = position
+
+
+class ChatQueueTimeoutError(RuntimeError):
     pass
 
 
 class ChatService:
-    def __init__(self, store: BaseStore[Chat], chatbot: ChatBot):
+    def __init__(
+        self,
+        store: AsyncBaseStore[Chat],
+        chatbot: ChatBot,
+        max_queue_depth: int = 4,
+        queue_deadline: float = 300,
+    ):
         self.store = store
         self.chatbot = chatbot
+        self.max_queue_depth = max_queue_depth
+        self.queue_deadline = queue_deadline
 
-        self._locks: Dict[UUID, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Only chats with a reply in flight have an entry: it is removed with its last user.
+        self._queues: Dict[UUID, _ChatQueue] = {}
     
     # "Repository"
-    def create_chat(self) -> Chat:
+    async def create_chat(self) -> Chat:
         new_chat = Chat()
-        if not self.store.create(new_chat):
+        if not await self.store.create(new_chat):
             raise Exception("Could not create a new chat")
         return new_chat
 
-    def get_chat(self, chat_uuid: UUID) -> Chat | None:
-        return self.store.get(chat_uuid)
-
-    def require_chat(self, chat_uuid: UUID) -> Chat:
-        return self.store.require(chat_uuid)
+    async def get_chat(self, chat_uuid: UUID) -> Chat | None:
+        return await self.store.get(chat_uuid)
 
-    def add_message(self, chat_uuid: UUID, role: ROLE, content: str) -> ChatMessage:
-        chat_msg = ChatMessage(role=role, content=content)
-        self.store.mutate(chat_uuid, lambda c: c.messages.append(chat_msg))
-        return chat_msg
+    async def require_chat(self, chat_uuid: UUID) -> Chat:
+        return await self.store.require(chat_uuid)
 
-    def delete_chat(self, chat_uuid: UUID) -> bool:
-        return self.store.delete(chat_uuid)
-
-    # Service
-    def count_messages(self, chat_uuid: UUID) -> int:
-        return len(self.require_chat(chat_uuid).messages)
+    async def add_message(self, chat_uuid: UUID, role: ROLE, content: str) -> ChatMessage:
+        await self.store.apply(chat_uuid, AppendMessage(role=role, content=content))
+        return ChatMessage(role=role, content=content)
 
-    async def reply_to_user(self, chat_uuid: UUID, user_text: str, method: str) -> str:
-        lock = self._locks[chat_uuid]
+    async def get_messages(self, chat_uuid: UUID, limit: int, before: int | None = None) -> MessagePage:
+        return await self.store.read(chat_uuid, ReadMessages(limit=limit, before=before))
 
-        if lock.locked():
-            raise ChatBusyError("An user message is already being processed.")
+    async def delete_chat(self, chat_uuid: UUID) -> bool:
+        return await self.store.delete(chat_uuid)
 
-        async with lock:
-            chat = self.require_chat(chat_uuid)
-            chat_history = to_chatbot_messages(chat.messages)
-
-            assistant_answer = await self.chatbot.reply(user_text, chat_history, method)
-
-            self.add_message(chat_uuid, ROLE.USER, user_text)
-            self.add_message(chat_uuid, ROLE.ASSISTANT, assistant_answer)
+    # Service
+    async def count_messages(self, chat_uuid: UUID) -> int:
+        return len((await self.require_chat(chat_uuid)).messages)
+
+    async def metrics(self) -> dict:
+        return {
+            "store": await self.store.stats(),
+            "active_chat_queues": len(self._queues),
+            "waiting_messages": sum(q.waiting for q in self._queues.values()),
+        }
+
+    async def reply_to_user(
+        self,
+        chat_uuid: UUID,
+        user_text: str,
+        method: str,
+        wait: bool = False,
+        space: str | None = None,
+        on_queued: Callable[[int, int], None] | None = None,
+    ) -> str:
+        """
+        Answers `user_text` once every earlier message of the chat has been answered.
+
+        Requests queue per chat in arrival order: `ChatQueueFullError` when
+        `max_queue_depth` are already waiting, `ChatQueueTimeoutError` when the
+        turn does not come within `queue_deadline` seconds. `wait=True` (used by
+        background jobs, already bounded by their own queue) skips both limits.
+        `space` picks the knowledge space to answer from (the default one if None).
+
+        `on_queued(ticket, position)` is called once the message is in the
+        queue, with `position` messages ahead of it (0: answered right away);
+        `queue_position(chat_uuid, ticket)` follows it from there.
+        """
+        async with self._turn(chat_uuid, bounded=not wait, on_queued=on_queued):
+            chat = await self.require_chat(chat_uuid)
+            chat_history = ChatHistory(chat.messages)
+
+            assistant_answer = await self.chatbot.reply(
+                user_text, chat_history, method, chat_uuid=chat_uuid, space=space,
+            )
+
+            await self.add_message(chat_uuid, ROLE.USER, user_text)
+            await self.add_message(chat_uuid, ROLE.ASSISTANT, assistant_answer)
 
             return assistant_answer
+
+    def spaces(self) -> list[dict]:
+        return self.chatbot.spaces()
+
+    def queue_status(self, chat_uuid: UUID) -> dict:
+        queue = self._queues.get(chat_uuid)
+        return {
+            "processing": queue is not None and queue.lock.locked(),
+            "waiting": queue.waiting if queue is not None else 0,
+            "max_waiting": self.max_queue_depth,
+        }
+
+    def queue_position(self, chat_uuid: UUID, ticket: int) -> int | None:
+        """Messages ahead of `ticket` (0: being answered); None once it has left the queue."""
+        queue = self._queues.get(chat_uuid)
+        if queue is None:
+            return None
+        try:
+            return queue.tickets.index(ticket)
+        except ValueError:
+            return None
+
+    @asynccontextmanager
+    async def _turn(
+        self,
+        chat_uuid: UUID,
+        bounded: bool,
+        on_queued: Callable[[int, int], None] | None = None,
+    ) -> AsyncIterator[None]:
+        queue = self._queues.get(chat_uuid)
+        if queue is None:
+            queue = self._queues[chat_uuid] = _ChatQueue()
+
+        if bounded and queue.lock.locked() and queue.waiting >= self.max_queue_depth:
+            raise ChatQueueFullError(
+                f"{queue.waiting} messages are already waiting for this chat.", position=len(queue.tickets),
+            )
+
+        ticket = queue.next_ticket
+        queue.next_ticket += 1
+        queue.tickets.append(ticket)
+        if on_queued is not None:
+            on_queued(ticket, len(queue.tickets) - 1)
+
+        queue.users += 1
+        try:
+            # asyncio.Lock wakes its waiters in FIFO order.
+            if queue.lock.locked():
+                queue.waiting += 1
+                try:
+                    await asyncio.wait_for(queue.lock.acquire(), self.queue_deadline if bounded else None)
+                except asyncio.TimeoutError:
+                    raise ChatQueueTimeoutError(f"Waited {self.queue_deadline:g}s for earlier messages of this chat.")
+                finally:
+                    queue.waiting -= 1
+            else:
+                await queue.lock.acquire()
+
+            try:
+                yield
+            finally:
+                queue.lock.release()
+        finally:
+            queue.tickets.remove(ticket)
+            queue.users -= 1
+            if not queue.users:
+                del self._queues[chat_uuid]
+
+
+class _ChatQueue:
+    __slots__ = ("lock", "waiting", "users", "tickets", "next_ticket")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()
+        self.waiting = 0
+        self.users = 0
+        # Tickets in arrival order; the head is being answered. A few entries at most.
+        self.tickets: deque[int] = deque()
+        self.next_ticket = 0
@@ -0,0 +1,240 @@
+import sqlite3
+import threading
+import time
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+from uuid import UUID
+
+from .models import ROLE, AppendMessage, Chat, ChatMessage, MessagePage, ReadMessages
+from ..store import BaseStore, ObjectNotFoundError
+from ..store.base_store import R
+
+# Messages are keyed by their sequence number in the chat, so a page is a range
+# of the primary key and `end` its last key; `first_seq` is `Chat.offset`.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    uuid        TEXT PRIMARY KEY,
+    created_at  REAL NOT NULL,
+    first_seq   INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS messages (
+    chat_uuid   TEXT NOT NULL REFERENCES chats(uuid) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    role        TEXT NOT NULL,
+    content     TEXT NOT NULL,
+    PRIMARY KEY (chat_uuid, seq)
+) WITHOUT ROWID;
+"""
+
+# Files written before messages had a `seq`: numbered in id order, as they were read.
+MIGRATE_ROWID_MESSAGES = """
+ALTER TABLE messages RENAME TO messages_by_id;
+DROP INDEX IF EXISTS messages_by_chat;
+ALTER TABLE chats ADD COLUMN first_seq INTEGER NOT NULL DEFAULT 0;
+""" + SCHEMA + """
+INSERT INTO messages (chat_uuid, seq, role, content)
+    SELECT chat_uuid, ROW_NUMBER() OVER (PARTITION BY chat_uuid ORDER BY id) - 1, role, content FROM messages_by_id;
+DROP TABLE messages_by_id;
+"""
+
+# Fixed SQL text so sqlite3's per-connection statement cache reuses the prepared statements.
+SQL_INSERT_CHAT = "INSERT OR IGNORE INTO chats (uuid, created_at, first_seq) VALUES (?, ?, ?)"
+SQL_CHAT_BOUNDS = (
+    "SELECT first_seq, COALESCE((SELECT MAX(seq) + 1 FROM messages WHERE chat_uuid = chats.uuid), first_seq)"
+    " FROM chats WHERE uuid = ?"
+)
+SQL_SET_FIRST_SEQ = "UPDATE chats SET first_seq = ? WHERE uuid = ?"
+SQL_SELECT_MESSAGES = "SELECT role, content FROM messages WHERE chat_uuid = ? ORDER BY seq"
+SQL_SELECT_MESSAGE_RANGE = (
+    "SELECT role, content FROM messages WHERE chat_uuid = ? AND seq >= ? AND seq < ? ORDER BY seq"
+)
+SQL_APPEND_MESSAGE = (
+    "INSERT INTO messages (chat_uuid, seq, role, content)"
+    " SELECT uuid, COALESCE((SELECT MAX(seq) + 1 FROM messages WHERE chat_uuid = chats.uuid), first_seq), ?, ?"
+    " FROM chats WHERE uuid = ?"
+)
+SQL_PUT_MESSAGE = "INSERT OR REPLACE INTO messages (chat_uuid, seq, role, content) VALUES (?, ?, ?, ?)"
+SQL_DELETE_MESSAGES_OUTSIDE = "DELETE FROM messages WHERE chat_uuid = ? AND (seq < ? OR seq >= ?)"
+SQL_DELETE_CHAT = "DELETE FROM chats WHERE uuid = ?"
+SQL_COUNT_CHATS = "SELECT COUNT(*) FROM chats"
+
+
+class SQLiteChatStore(BaseStore[Chat]):
+    """
+    `BaseStore[Chat]` on SQLite in WAL mode, with chats and messages in separate
+    tables. Safe to share between processes (several uvicorn workers) on one node.
+
+    Each thread gets its own connection. Appending a message (`apply` with
+    `AppendMessage`) is a single-row INSERT, reading a page (`read` with
+    `ReadMessages`) a range scan of the primary key, and `update` / `mutate`
+    write only the messages that changed.
+    """
+
+    def __init__(self, path: Path, busy_timeout_ms: int = 5000) -> None:
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._write() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(messages)")}
+            if columns and "seq" not in columns:
+                # `executescript` would commit the transaction first; the statements run one by one.
+                for statement in filter(str.strip, MIGRATE_ROWID_MESSAGES.split(";")):
+                    conn.execute(statement)
+            else:
+                for statement in filter(str.strip, SCHEMA.split(";")):
+                    conn.execute(statement)
+
+    # BaseStore
+    def create(self, obj: Chat) -> bool:
+        with self._write() as conn:
+            if conn.execute(SQL_INSERT_CHAT, (str(obj.uuid), time.time(), obj.offset)).rowcount == 0:
+                return False
+            self._write_changes(conn, Chat(uuid=obj.uuid, offset=obj.offset), obj)
+            return True
+
+    def get(self, uuid: UUID) -> Chat | None:
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            return self._select_chat(conn, uuid)
+        finally:
+            conn.execute("COMMIT")
+
+    def require(self, uuid: UUID) -> Chat:
+        obj = self.get(uuid)
+        if obj is None:
+            raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+        return obj
+
+    def update(self, uuid: UUID, obj: Chat) -> bool:
+        if obj.uuid != uuid:
+            raise ValueError(f"Object's UUID ({obj.uuid}) does not match the UUID argument ({uuid})")
+
+        with self._write() as conn:
+            stored = self._select_chat(conn, uuid)
+            if stored is None:
+                return False
+            self._write_changes(conn, stored, obj)
+            return True
+
+    def mutate(self, uuid: UUID, fn: Callable[[Chat], None]) -> Chat:
+        with self._write() as conn:
+            stored = self._select_chat(conn, uuid)
+            if stored is None:
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+            obj = Chat(uuid=uuid, messages=list(stored.messages), offset=stored.offset)
+            fn(obj)
+            self._write_changes(conn, stored, obj)
+            return obj
+
+    def apply(self, uuid: UUID, mutation: Callable[[Chat], None]) -> None:
+        if not isinstance(mutation, AppendMessage):
+            return super().apply(uuid, mutation)
+
+        with self._write() as conn:
+            if conn.execute(SQL_APPEND_MESSAGE, (ROLE(mutation.role).value, mutation.content, str(uuid))).rowcount == 0:
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+    def read(self, uuid: UUID, query: Callable[[Chat], R]) -> R:
+        if not isinstance(query, ReadMessages):
+            return super().read(uuid, query)
+
+        # Two lookups of the primary key (the bounds) and a range scan of it; no
+        # other row is loaded, however long the chat.
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            bounds = conn.execute(SQL_CHAT_BOUNDS, (str(uuid),)).fetchone()
+            if bounds is None:
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+            first, end = bounds
+            start, stop = query.bounds(first, end)
+            rows = conn.execute(SQL_SELECT_MESSAGE_RANGE, (str(uuid), start, stop)).fetchall()
+        finally:
+            conn.execute("COMMIT")
+
+        return MessagePage(
+            start=start,
+            end=end,
+            first=first,
+            messages=[ChatMessage(role=ROLE(role), content=content) for role, content in rows],
+        )
+
+    def delete(self, uuid: UUID) -> bool:
+        with self._write() as conn:
+            return conn.execute(SQL_DELETE_CHAT, (str(uuid),)).rowcount > 0
+
+    def count(self) -> int:
+        return self._conn().execute(SQL_COUNT_CHATS).fetchone()[0]
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    # Connections
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _select_chat(conn: sqlite3.Connection, uuid: UUID) -> Chat | None:
+        bounds = conn.execute(SQL_CHAT_BOUNDS, (str(uuid),)).fetchone()
+        if bounds is None:
+            return None
+        messages = [
+            ChatMessage(role=ROLE(role), content=content)
+            for role, content in conn.execute(SQL_SELECT_MESSAGES, (str(uuid),))
+        ]
+        return Chat(uuid=uuid, messages=messages, offset=bounds[0])
+
+    @staticmethod
+    def _write_changes(conn: sqlite3.Connection, stored: Chat, obj: Chat) -> None:
+        """Writes `obj` over `stored`: trimmed and dropped messages are deleted, changed and new ones put."""
+        uuid = str(stored.uuid)
+        end = obj.offset + len(obj.messages)
+        if obj.offset > stored.offset or end < stored.offset + len(stored.messages):
+            conn.execute(SQL_DELETE_MESSAGES_OUTSIDE, (uuid, obj.offset, end))
+        if obj.offset != stored.offset:
+            conn.execute(SQL_SET_FIRST_SEQ, (obj.offset, uuid))
+
+        conn.executemany(SQL_PUT_MESSAGE, (
+            (uuid, seq, ROLE(message.role).value, message.content)
+            for seq, message in enumerate(obj.messages, obj.offset)
+            if not 0 <= seq - stored.offset < len(stored.messages) or stored.messages[seq - stored.offset] != message
+        ))
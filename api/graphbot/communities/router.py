@@ -0,0 +1,42 @@
+import asyncio
+from dataclasses import asdict
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from .schemas import CommunityDetailResponse, CommunityListResponse, LevelListResponse
+from .service import CommunityService
+from ..deps import Deps
+
+router = APIRouter(tags=["communities"])
+
+
+@router.get("", response_model=CommunityListResponse, status_code=status.HTTP_200_OK)
+async def list_communities(
+    level: int | None = Query(None, ge=0, description="Only communities of this level; all if omitted"),
+    sort: Literal["rating", "size"] = Query("rating"),
+    min_rating: float | None = Query(None, ge=0, le=10),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    service: CommunityService = Depends(Deps.get_community_service),
+) -> CommunityListResponse:
+    total, communities = await asyncio.to_thread(service.communities, level, sort, min_rating, offset, limit)
+    return CommunityListResponse(total=total, communities=[asdict(c) for c in communities])
+
+
+@router.get("/levels", response_model=LevelListResponse, status_code=status.HTTP_200_OK)
+async def list_levels(service: CommunityService = Depends(Deps.get_community_service)) -> LevelListResponse:
+    """Per-level rollups: community, report and entity counts, ratings and the top communities."""
+    levels = await asyncio.to_thread(service.levels)
+    return LevelListResponse(levels=[asdict(level) for level in levels])
+
+
+@router.get("/{community}", response_model=CommunityDetailResponse, status_code=status.HTTP_200_OK)
+async def get_community(
+    community: int,
+    service: CommunityService = Depends(Deps.get_community_service),
+) -> CommunityDetailResponse:
+    """A community with its report findings, its ancestors and its children."""
+    detail = await asyncio.to_thread(service.detail, community)
+    if detail is None:
+        raise HTTPException(status_code=404, detail=f"Community not found: {community}")
+    return CommunityDetailResponse(**asdict(detail))
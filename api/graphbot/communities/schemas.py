@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+
+
+class CommunitySummaryResponse(BaseModel):
+    community: int = Field(example=17)
+    parent: int | None = Field(default=None, example=3, description="None for top-level communities")
+    level: int = Field(example=1)
+    title: str = Field(example="Spaceflight and Murine Musculoskeletal Changes")
+    rating: float | None = Field(default=None, example=7.5, description="Impact rating of the report, 0-10")
+    size: int = Field(example=12, description="Entities in the community")
+    children: int = Field(example=2)
+    summary: str = Field(example="The community centres on mice flown on the ISS…")
+
+
+class CommunityListResponse(BaseModel):
+    total: int = Field(example=51, description="Communities matching the filters, before `offset`/`limit`")
+    communities: list[CommunitySummaryResponse] = Field(default_factory=list)
+
+
+class FindingResponse(BaseModel):
+    summary: str = Field(example="Microgravity reduces bone density in the humerus")
+    explanation: str = Field(example="Mice flown for 30 days showed…")
+
+
+class CommunityDetailResponse(BaseModel):
+    community: CommunitySummaryResponse
+    rating_explanation: str | None = Field(default=None)
+    findings: list[FindingResponse] = Field(default_factory=list)
+    path: list[CommunitySummaryResponse] = Field(default_factory=list, description="Ancestors, top level first")
+    children: list[CommunitySummaryResponse] = Field(default_factory=list, description="Highest rated first")
+
+
+class LevelRollupResponse(BaseModel):
+    level: int = Field(example=0)
+    communities: int = Field(example=14)
+    reports: int = Field(example=14)
+    entities: int = Field(example=180, description="Sum of the community sizes")
+    mean_rating: float | None = Field(default=None, example=6.4)
+    max_rating: float | None = Field(default=None, example=8.5)
+    top: list[CommunitySummaryResponse] = Field(default_factory=list, description="Highest rated communities")
+
+
+class LevelListResponse(BaseModel):
+    levels: list[LevelRollupResponse] = Field(default_factory=list)
@@ -0,0 +1,33 @@
+from ..knowledge import CommunityHierarchy, KnowledgeIndex
+from ..knowledge.communities import CommunityDetail, CommunitySummary, LevelRollup
+
+
+class CommunityService:
+    """
+    Community overviews without running global search: the hierarchy, its
+    reports and the per-level rollups come from `CommunityHierarchy`, built
+    once per index version, so browsing it never calls the LLM.
+    """
+
+    def __init__(self, index: KnowledgeIndex) -> None:
+        self.index = index
+
+    @property
+    def hierarchy(self) -> CommunityHierarchy:
+        return self.index.derived("communities", CommunityHierarchy)
+
+    def communities(
+        self,
+        level: int | None,
+        sort: str,
+        min_rating: float | None,
+        offset: int,
+        limit: int,
+    ) -> tuple[int, list[CommunitySummary]]:
+        return self.hierarchy.communities(level, sort, min_rating, offset, limit)
+
+    def detail(self, community: int) -> CommunityDetail | None:
+        return self.hierarchy.detail(community)
+
+    def levels(self) -> list[LevelRollup]:
+        return self.hierarchy.rollups
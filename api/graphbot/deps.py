@@ -1,6 +1,11 @@
 from fastapi import Request
 
 from .chats.service import ChatService
+from .communities.service import CommunityService
+from .graph.service import GraphService
+from .ingest.service import IngestService
+from .jobs.service import JobService
+from .sources.service import SourceService
 
 
 class Deps:
@@ -9,5 +14,25 @@ class Deps:
     def get_chat_service(cls, request: Request) -> ChatService:
         return request.app.state.chat_service
 
+    @classmethod
+    def get_job_service(cls, request: Request) -> JobService:
+        return request.app.state.job_service
+
+
+
+
+    @classmethod
+    def get_graph_service(cls, request: Request) -> GraphService:
+        return request.app.state.graph_service
 
+    @classmethod
+    def get_ingest_service(cls, request: Request) -> IngestService:
+        return request.app.state.ingest_service
 
+    @classmethod
+    def get_source_service(cls, request: Request) -> SourceService:
+        return request.app.state.source_service
+
+    @classmethod
+    def get_community_service(cls, request: Request) -> CommunityService:
+        return request.app.state.community_service
@@ -1,22 +1,92 @@
+from pathlib import Path
+
 from .settings import AppSettings
 from .chats.models import Chat
+from .jobs.models import Job
 
-from .store import MemoryStore
+from .store import AsyncStoreAdapter, MemoryStore, BoundedMemoryStore, FileStore
 from .chats.chatbot import DummyBot
 
 def make_store(settings: AppSettings):
+    # Stores that touch the disk run in worker threads so they never block the event loop.
     store = settings.store.lower()
     if store == "memory":
-        return MemoryStore[Chat]()
+        return AsyncStoreAdapter(BoundedMemoryStore[Chat](
+            settings.store_shards,
+            max_objects=settings.store_max_chats,
+            idle_ttl=settings.store_idle_ttl,
+            trim=lambda chat: chat.trim_messages(settings.store_max_messages),
+            weigh=Chat.approx_bytes,
+        ))
+    elif store == "file":
+        return AsyncStoreAdapter(FileStore[Chat](Path(settings.store_path), Chat), offload=True)
+    elif store == "sqlite":
+        from .chats.sqlite_store import SQLiteChatStore
+        return AsyncStoreAdapter(SQLiteChatStore(Path(settings.sqlite_path)), offload=True)
+    elif store == "redis":
+        from .chats.redis_store import RedisChatStore
+        return AsyncStoreAdapter(RedisChatStore(
+            settings.redis_url,
+            prefix=settings.redis_prefix,
+            max_connections=settings.redis_max_connections,
+            max_messages=settings.store_max_messages,
+            idle_ttl=settings.store_idle_ttl,
+        ), offload=True)
     
     raise RuntimeError(f"Unknown store: {settings.store}")
 
-def make_chatbot(settings: AppSettings):
+def make_job_store(settings: AppSettings):
+    # Jobs hold an asyncio.Event and only make sense in the process running them.
+    return MemoryStore[Job]()
+
+def make_knowledge_index(settings: AppSettings, root: Path | None = None):
+    # Lazy: nothing is read until the first search or graph request.
+    from .knowledge import KnowledgeIndex
+    return KnowledgeIndex(root or settings.graphrag_root, arrow_cache=settings.graphrag_arrow_cache)
+
+def make_chatbot(settings: AppSettings, index=None):
     chatbot = settings.chatbot.lower()
     if chatbot in "dummy":
         return DummyBot()
     elif chatbot == "graphrag":
-        from .chats.chatbot.graphrag_bot import GraphRAGBot
-        return GraphRAGBot()
+        from .chats.chatbot.multi_space_bot import MultiSpaceBot
+        from .knowledge.spaces import KnowledgeSpaces, discover_spaces
+
+        root = settings.graphrag_root.resolve()
+        spaces = KnowledgeSpaces(
+            discover_spaces(settings.graphrag_spaces_dir or root.parent, root),
+            build=lambda name, space_root: make_graphrag_bot(settings, space_root),
+            load=lambda bot: bot.index.load(),
+            weigh=lambda bot: bot.index.approx_bytes(),
+            close=lambda bot: bot.close(),
+            memory_budget=settings.graphrag_spaces_memory_mb * 1_000_000,
+            is_loaded=lambda bot: bot.index.loaded,
+        )
+        default_bot = make_graphrag_bot(settings, settings.graphrag_root, index, settings.graphrag_workers)
+        return MultiSpaceBot(spaces, root.name, default_bot, settings.graphrag_preload_spaces)
 
     raise RuntimeError(f"Unknown chatbot: {settings.chatbot}")
+
+def make_graphrag_bot(settings: AppSettings, root: Path, index=None, workers: int = 0):
+    from .chats.chatbot.graphrag_bot import GraphRAGBot
+    from .knowledge import EmbeddingCache
+    from .knowledge.worker_pool import SearchProcessPool
+
+    cache_dir = root / "cache" / "query_embedding"
+    pool = None
+    if workers > 0:
+        pool = SearchProcessPool(
+            root,
+            workers=workers,
+            max_tasks_per_worker=settings.graphrag_worker_max_tasks,
+            max_pending=settings.graphrag_max_pending,
+            embedding_cache_dir=cache_dir,
+            embedding_cache_size=settings.embedding_cache_size,
+            arrow_cache=settings.graphrag_arrow_cache,
+        )
+
+    return GraphRAGBot(
+        index or make_knowledge_index(settings, root),
+        EmbeddingCache(cache_dir, settings.embedding_cache_size),
+        pool,
+    )
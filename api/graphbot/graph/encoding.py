@@ -0,0 +1,98 @@
+import json
+import struct
+
+import numpy as np
+
+from ..knowledge.graph import GraphSlice, KnowledgeGraph
+
+BINARY_MAGIC = b"KGB1"
+BINARY_VERSION = 1
+FLAG_DESCRIPTIONS = 1
+
+# magic, version, level, flags, node count, edge count, string count, string bytes
+_HEADER = struct.Struct("<4sIiIIIII")
+
+
+def node_dict(graph: KnowledgeGraph, node: int, level: int = 0, community: int | None = None) -> dict:
+    if community is None:
+        communities = graph.communities.get(level)
+        community = int(communities[node]) if communities is not None else -1
+    return {
+        "id": graph.ids[node],
+        "label": graph.titles[node],
+        "community": int(community),
+        "level": level,
+        "degree": int(graph.degree[node]),
+    }
+
+
+def edge_dict(graph: KnowledgeGraph, edge: int, descriptions: bool = True) -> dict:
+    data = {
+        "id": graph.edge_ids[edge],
+        "source": graph.ids[graph.edge_source[edge]],
+        "target": graph.ids[graph.edge_target[edge]],
+        "weight": float(graph.edge_weight[edge]),
+    }
+    if descriptions:
+        data["description"] = graph.edge_descriptions[edge]
+    return data
+
+
+def to_json(graph: KnowledgeGraph, view: GraphSlice, descriptions: bool = True) -> bytes:
+    """
+    Same shape as the static `public/data/graph.json` the frontend loads
+    (`lib/graph-data.ts`), so it can switch to this endpoint as is.
+    """
+    nodes = [node_dict(graph, n, view.level, c) for n, c in zip(view.nodes, view.community)]
+    edges = [edge_dict(graph, e, descriptions) for e in view.edges]
+
+    return json.dumps({"nodes": nodes, "edges": edges}, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def to_binary(graph: KnowledgeGraph, view: GraphSlice, descriptions: bool = False) -> bytes:
+    """
+    Little-endian, every section 4-byte aligned so it maps onto JS typed arrays:
+
+        header      magic "KGB1", u32 version, i32 level, u32 flags,
+                    u32 nodes (N), u32 edges (E), u32 strings (S), u32 string bytes (B)
+        community   i32[N]
+        degree      i32[N]
+        source      u32[E]   index into the node arrays
+        target      u32[E]
+        weight      f32[E]
+        offsets     u32[S + 1] into the UTF-8 blob
+        blob        u8[B], zero-padded to a multiple of 4
+
+    Strings, in order: N node ids, N labels, E edge ids and, with flag bit 0,
+    E edge descriptions.
+    """
+    strings = [*graph.ids[view.nodes], *graph.titles[view.nodes], *graph.edge_ids[view.edges]]
+    if descriptions:
+        strings.extend(graph.edge_descriptions[view.edges])
+
+    encoded = [s.encode() for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = b"".join(encoded)
+    blob += b"\0" * (-len(blob) % 4)
+
+    header = _HEADER.pack(
+        BINARY_MAGIC,
+        BINARY_VERSION,
+        view.level,
+        FLAG_DESCRIPTIONS if descriptions else 0,
+        len(view.nodes),
+        len(view.edges),
+        len(encoded),
+        int(offsets[-1]),
+    )
+    return b"".join((
+        header,
+        view.community.astype("<i4").tobytes(),
+        graph.degree[view.nodes].astype("<i4").tobytes(),
+        view.source.astype("<u4").tobytes(),
+        view.target.astype("<u4").tobytes(),
+        graph.edge_weight[view.edges].astype("<f4").tobytes(),
+        offsets.tobytes(),
+        blob,
+    ))
@@ -0,0 +1,128 @@
+import asyncio
+import gzip
+from typing import Literal
+from fastapi import APIRouter, Request, Response, Depends, HTTPException, Query
+
+from .service import GraphQuery, GraphService
+from ..deps import Deps
+
+router = APIRouter(tags=["graph"])
+
+
+@router.get("")
+async def get_graph(
+    request: Request,
+    level: int = Query(0, ge=0, description="Community level used for `community` of each node"),
+    min_degree: int = Query(0, ge=0),
+    community: int | None = Query(None, description="Only nodes of this community at `level`"),
+    max_nodes: int | None = Query(None, ge=1, description="Keep the highest-degree nodes"),
+    max_edges: int | None = Query(None, ge=0, description="Keep the heaviest edges"),
+    format: Literal["json", "binary"] = Query("json"),
+    descriptions: bool | None = Query(None, description="Edge descriptions (default: json yes, binary no)"),
+    service: GraphService = Depends(Deps.get_graph_service),
+) -> Response:
+    query = GraphQuery(
+        level=level,
+        min_degree=min_degree,
+        community=community,
+        max_nodes=max_nodes,
+        max_edges=max_edges,
+        format=format,
+        descriptions=descriptions if descriptions is not None else format == "json",
+    )
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+
+    etag = await asyncio.to_thread(service.etag, query)
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    try:
+        encoded = await asyncio.to_thread(service.encode, query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers["ETag"] = encoded.etag
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(encoded.gzipped, media_type=encoded.media_type, headers=headers)
+
+    return Response(encoded.body, media_type=encoded.media_type, headers=headers)
+
+
+@router.get("/nodes/{node}/neighbors")
+async def get_neighbors(
+    node: str,
+    limit: int = Query(10, ge=1, le=500),
+    level: int = Query(0, ge=0),
+    service: GraphService = Depends(Deps.get_graph_service),
+) -> dict:
+    """`node` is an entity id or its exact title. Neighbours come heaviest relationship first."""
+    result = await asyncio.to_thread(service.neighbors, node, limit, level)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Node not found: {node}")
+    return result
+
+
+@router.get("/nodes/{node}/ego")
+async def get_ego_network(
+    request: Request,
+    node: str,
+    hops: int = Query(1, ge=1, le=4),
+    max_nodes: int | None = Query(500, ge=1),
+    max_edges: int | None = Query(None, ge=0),
+    level: int = Query(0, ge=0),
+    format: Literal["json", "binary"] = Query("json"),
+    descriptions: bool | None = Query(None),
+    service: GraphService = Depends(Deps.get_graph_service),
+) -> Response:
+    """Nodes within `hops` of `node` and the edges between them, in the same encodings as `GET /graph`."""
+    result = await asyncio.to_thread(
+        service.ego, node, hops, max_nodes, max_edges, level, format,
+        descriptions if descriptions is not None else format == "json",
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Node not found: {node}")
+
+    body, media_type = result
+    if len(body) > 1024 and "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            gzip.compress(body, compresslevel=6),
+            media_type=media_type,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(body, media_type=media_type, headers={"Vary": "Accept-Encoding"})
+
+
+@router.get("/path")
+async def get_shortest_path(
+    source: str,
+    target: str,
+    level: int = Query(0, ge=0),
+    service: GraphService = Depends(Deps.get_graph_service),
+) -> dict:
+    """Strongest connection between two entities: Dijkstra with cost 1 / weight. Empty when not connected."""
+    result = await asyncio.to_thread(service.path, source, target, level)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return result
+
+
+@router.get("/autocomplete")
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    service: GraphService = Depends(Deps.get_graph_service),
+) -> list[dict]:
+    """Entities whose title words start with the typed words, best connected first."""
+    return await asyncio.to_thread(service.autocomplete, q, limit)
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, max_length=1000),
+    kind: list[Literal["entity", "report"]] = Query(["entity", "report"]),
+    limit: int = Query(10, ge=1, le=100),
+    service: GraphService = Depends(Deps.get_graph_service),
+) -> list[dict]:
+    """Full-text (BM25) search over entity descriptions and community report summaries."""
+    return await asyncio.to_thread(service.search, q, tuple(kind), limit)
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from .encoding import edge_dict, node_dict, to_binary, to_json
+from ..knowledge import KnowledgeIndex, TextIndex
+from ..knowledge.graph import GraphSlice, KnowledgeGraph
+
+JSON_MEDIA_TYPE = "application/json"
+BINARY_MEDIA_TYPE = "application/vnd.graphbot.graph"
+
+
+@dataclass(frozen=True)
+class GraphQuery:
+    level: int = 0
+    min_degree: int = 0
+    community: int | None = None
+    max_nodes: int | None = None
+    max_edges: int | None = None
+    format: str = "json"
+    descriptions: bool = True
+
+
+@dataclass(frozen=True)
+class EncodedGraph:
+    etag: str
+    media_type: str
+    body: bytes
+    gzipped: bytes
+
+
+class GraphService:
+    """
+    Serves the knowledge graph of a `KnowledgeIndex`. The graph arrays are built
+    on first use; encoded (and gzipped) responses are kept in a small LRU keyed
+    by query, and their ETag only depends on the index version and the query.
+    """
+
+    def __init__(self, index: KnowledgeIndex, cache_size: int = 64) -> None:
+        self.index = index
+        self.cache_size = cache_size
+
+        self._encoded: OrderedDict[tuple[str, GraphQuery], EncodedGraph] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def graph(self) -> KnowledgeGraph:
+        return self.index.derived("graph", KnowledgeGraph)
+
+    @property
+    def text(self) -> TextIndex:
+        return self.index.derived("text_index", TextIndex)
+
+    def etag(self, query: GraphQuery) -> str:
+        digest = hashlib.sha1(f"{self.index.version}:{query}".encode()).hexdigest()[:20]
+        return f'"{digest}"'
+
+    def encode(self, query: GraphQuery) -> EncodedGraph:
+        key = (self.index.version, query)
+        with self._lock:
+            cached = self._encoded.get(key)
+            if cached is not None:
+                self._encoded.move_to_end(key)
+                return cached
+
+        graph = self.graph
+        view = graph.select(
+            level=query.level,
+            min_degree=query.min_degree,
+            community=query.community,
+            max_nodes=query.max_nodes,
+            max_edges=query.max_edges,
+        )
+        body, media_type = self._encode_view(view, query.format, query.descriptions)
+
+        encoded = EncodedGraph(self.etag(query), media_type, body, gzip.compress(body, compresslevel=6))
+        with self._lock:
+            self._encoded[key] = encoded
+            while len(self._encoded) > self.cache_size:
+                self._encoded.popitem(last=False)
+        return encoded
+
+    # Traversal
+    def neighbors(self, node: str, limit: int = 10, level: int = 0) -> dict | None:
+        graph = self.graph
+        position = graph.resolve(node)
+        if position is None:
+            return None
+
+        neighbors, edges, weights = graph.top_neighbors(position, limit)
+        return {
+            "node": node_dict(graph, position, level),
+            "neighbors": [
+                {**node_dict(graph, int(n), level), "edge_id": graph.edge_ids[e], "weight": float(w)}
+                for n, e, w in zip(neighbors, edges, weights)
+            ],
+        }
+
+    def ego(
+        self,
+        node: str,
+        hops: int = 1,
+        max_nodes: int | None = None,
+        max_edges: int | None = None,
+        level: int = 0,
+        format: str = "json",
+        descriptions: bool = True,
+    ) -> tuple[bytes, str] | None:
+        graph = self.graph
+        position = graph.resolve(node)
+        if position is None:
+            return None
+
+        view = graph.subgraph(graph.ego(position, hops, max_nodes), level, max_edges)
+        return self._encode_view(view, format, descriptions)
+
+    def path(self, source: str, target: str, level: int = 0) -> dict | None:
+        graph = self.graph
+        a, b = graph.resolve(source), graph.resolve(target)
+        if a is None or b is None:
+            return None
+
+        path = graph.shortest_path(a, b)
+        if path is None:
+            return {"nodes": [], "edges": [], "cost": None}
+        return {
+            "nodes": [node_dict(graph, int(n), level) for n in path.nodes],
+            "edges": [edge_dict(graph, int(e)) for e in path.edges],
+            "cost": round(path.cost, 6),
+        }
+
+    # Lookup
+    def autocomplete(self, query: str, limit: int = 10) -> list[dict]:
+        return [
+            {"id": hit.id, "label": hit.title, "score": hit.score}
+            for hit in self.text.autocomplete(query, limit)
+        ]
+
+    def search(self, query: str, kinds: tuple[str, ...], limit: int = 10) -> list[dict]:
+        return [asdict(hit) for hit in self.text.search(query, kinds, limit)]
+
+    def _encode_view(self, view: GraphSlice, format: str, descriptions: bool) -> tuple[bytes, str]:
+        if format == "binary":
+            return to_binary(self.graph, view, descriptions), BINARY_MEDIA_TYPE
+        return to_json(self.graph, view, descriptions), JSON_MEDIA_TYPE
@@ -0,0 +1,24 @@
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+
+from ..knowledge.ingest import IngestPlan
+
+
+class INGEST_STATUS(str, Enum):
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class IngestRun:
+    plan: IngestPlan
+    documents: list[str] = field(default_factory=list)
+
+    status: INGEST_STATUS = INGEST_STATUS.RUNNING
+    version: str | None = None
+    error: str | None = None
+
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
@@ -0,0 +1,79 @@
+import secrets
+from dataclasses import asdict
+from fastapi import APIRouter, Request, status, Depends, HTTPException
+
+from .models import IngestRun
+from .schemas import IngestPlanResponse, IngestRequest, IngestRunResponse
+from .service import IngestInProgressError, IngestService
+from ..deps import Deps
+from ..knowledge.ingest import IngestError
+
+router = APIRouter(tags=["ingest"])
+
+
+def _to_response(run: IngestRun) -> IngestRunResponse:
+    return IngestRunResponse(
+        status=run.status.value,
+        plan=IngestPlanResponse(**asdict(run.plan)),
+        documents=run.documents,
+        version=run.version,
+        error=run.error,
+        runtime_seconds=round(run.finished_at - run.started_at, 3) if run.finished_at else None,
+    )
+
+
+def _require_ingest_allowed(request: Request) -> None:
+    settings = request.app.state.settings
+    if not settings.ingest_enabled:
+        raise HTTPException(status_code=403, detail="Ingestion is disabled (APP_BACK_INGEST_ENABLED)")
+    if settings.ingest_token:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.ingest_token.encode()):
+            raise HTTPException(status_code=401, detail="Invalid ingest token", headers={"WWW-Authenticate": "Bearer"})
+
+
+@router.get("/plan", response_model=IngestPlanResponse, status_code=status.HTTP_200_OK)
+async def get_plan(
+    request: Request,
+    service: IngestService = Depends(Deps.get_ingest_service),
+) -> IngestPlanResponse:
+    """Input documents that are new, changed or deleted relative to the served output."""
+    try:
+        plan = await service.plan()
+    except IngestError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return IngestPlanResponse(**asdict(plan))
+
+
+@router.post(
+    "",
+    response_model=IngestRunResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(_require_ingest_allowed)],
+)
+async def start_ingest(
+    request: Request,
+    payload: IngestRequest,
+    service: IngestService = Depends(Deps.get_ingest_service),
+) -> IngestRunResponse:
+    """Add `documents` (if any) to the input folder and index every new document in the background."""
+    try:
+        run = await service.start({d.name: d.text for d in payload.documents})
+    except (IngestInProgressError, IngestError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _to_response(run)
+
+
+@router.get("/status", response_model=IngestRunResponse, status_code=status.HTTP_200_OK)
+async def get_status(
+    request: Request,
+    service: IngestService = Depends(Deps.get_ingest_service),
+) -> IngestRunResponse:
+    if service.last is None:
+        raise HTTPException(status_code=404, detail="No ingestion has run yet")
+
+    return _to_response(service.last)
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+
+class IngestDocument(BaseModel):
+    name: str = Field(example="Retina_spaceflight_summary.txt")
+    text: str = Field(example="This study examined ...")
+
+
+class IngestRequest(BaseModel):
+    documents: list[IngestDocument] = Field(default_factory=list)
+
+
+class IngestPlanResponse(BaseModel):
+    new: list[str] = Field(example=["Retina_spaceflight_summary.txt"])
+    changed: list[str] = Field(example=[])
+    deleted: list[str] = Field(example=[])
+    unchanged: int = Field(example=20)
+
+
+class IngestRunResponse(BaseModel):
+    status: str = Field(example="running")
+    plan: IngestPlanResponse
+    documents: list[str] = Field(example=["Retina_spaceflight_summary.txt"])
+    version: str | None = Field(default=None, example=None)
+    error: str | None = Field(default=None, example=None)
+    runtime_seconds: float | None = Field(default=None, example=None)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from .models import INGEST_STATUS, IngestRun
+from ..chats.chatbot import ChatBot
+from ..knowledge import KnowledgeIndex
+from ..knowledge.ingest import IngestError, IngestPlan, Ingestor
+
+logger = logging.getLogger(__name__)
+
+
+class IngestInProgressError(RuntimeError):
+    pass
+
+
+class IngestService:
+    """
+    Adds documents to the served GraphRAG space while the API keeps answering
+    from the current version. One ingestion at a time; when it publishes a new
+    output version, the in-process index and the chatbot reload from it.
+
+    Other API processes (uvicorn workers, instances sharing the space) learn
+    of a new version by polling: `watch` checks every `watch_interval`
+    seconds whether the output moved and reloads the same way.
+    """
+
+    def __init__(self, ingestor: Ingestor, index: KnowledgeIndex, chatbot: ChatBot, watch_interval: float = 0) -> None:
+        self.ingestor = ingestor
+        self.index = index
+        self.chatbot = chatbot
+        self.watch_interval = watch_interval
+
+        self.last: IngestRun | None = None
+        self._task: asyncio.Task | None = None
+        self._watcher: asyncio.Task | None = None
+        # Held from the first check until the run's task exists: `start` awaits in between.
+        self._starting = asyncio.Lock()
+
+    def watch(self) -> None:
+        if self.watch_interval > 0 and self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+    async def plan(self) -> IngestPlan:
+        return await asyncio.to_thread(self.ingestor.plan)
+
+    async def start(self, documents: dict[str, str]) -> IngestRun:
+        """
+        Write `documents` (file name -> text) to the input folder and index what
+        is new. If the plan is refused, the documents written here are removed.
+        """
+        if self._starting.locked() or (self._task is not None and not self._task.done()):
+            raise IngestInProgressError("An ingestion is already running")
+
+        async with self._starting:
+            created = await asyncio.to_thread(self._write_documents, documents)
+            try:
+                plan = await self.plan()
+                if plan.changed or plan.deleted:
+                    raise IngestError(
+                        f"Changed documents {plan.changed} / deleted documents {plan.deleted} "
+                        "cannot be merged incrementally; run a full `graphrag index`."
+                    )
+            except BaseException:
+                await asyncio.to_thread(_remove, created)
+                raise
+
+            run = self.last = IngestRun(plan=plan, documents=[Path(name).name for name in documents])
+            self._task = asyncio.create_task(self._run(run))
+            return run
+
+    async def _run(self, run: IngestRun) -> None:
+        try:
+            result = await asyncio.to_thread(self.ingestor.run, run.plan)
+            run.version = result.version
+            if result.version is not None:
+                await asyncio.to_thread(self._reload)
+            run.status = INGEST_STATUS.DONE
+        except Exception as e:
+            logger.exception("Ingestion failed")
+            run.error = str(e) or type(e).__name__
+            run.status = INGEST_STATUS.FAILED
+        finally:
+            run.finished_at = time.time()
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                if self.index.output_moved():
+                    logger.info("GraphRAG output moved to a new version; reloading")
+                    await asyncio.to_thread(self._reload)
+            except Exception:
+                logger.exception("Could not reload the new output version")
+
+    def _reload(self) -> None:
+        if self.index.reload():
+            self.chatbot.reload()
+
+    def _write_documents(self, documents: dict[str, str]) -> list[Path]:
+        """Writes `documents`; returns the files it created (identical existing ones are left alone)."""
+        input_dir = self.ingestor.input_dir()
+
+        paths = {}
+        for name, text in documents.items():
+            path = input_dir / Path(name).name
+            if path.name != name or not path.suffix == ".txt":
+                raise ValueError(f"Invalid document name: {name!r} (expected a plain '<name>.txt')")
+            if path.exists() and path.read_text(encoding="utf-8") != text:
+                raise ValueError(f"A different document named {name!r} already exists")
+            paths[path] = text
+
+        created = []
+        try:
+            for path, text in paths.items():
+                if not path.exists():
+                    path.write_text(text, encoding="utf-8")
+                    created.append(path)
+        except BaseException:
+            _remove(created)
+            raise
+        return created
+
+
+def _remove(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,31 @@
+import bisect
+import threading
+
+# Seconds. Drift and global searches usually land between 10 s and 2 min.
+DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style) with sum and count."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets, self._counts):
+                running += count
+                cumulative[str(bound)] = running
+            running += self._counts[-1]
+            cumulative["+Inf"] = running
+
+            return {"buckets": cumulative, "count": running, "sum": round(self._sum, 3)}
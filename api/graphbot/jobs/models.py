@@ -0,0 +1,39 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from uuid import UUID
+
+from ..store import BaseModel
+
+
+class JOB_STATUS(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+@dataclass
+class Job(BaseModel):
+    chat_uuid: UUID | None = None
+    message: str = ""
+    method: str = "local"
+    space: str | None = None
+
+    status: JOB_STATUS = JOB_STATUS.QUEUED
+    answer: str | None = None
+    error: str | None = None
+
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    # Place in the job queue, and ticket in the chat's queue once running (see `JobService.positions`).
+    sequence: int = 0
+    chat_ticket: int | None = None
+
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False, compare=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_STATUS.DONE, JOB_STATUS.FAILED)
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from uuid import UUID
+from fastapi import APIRouter, Request, Response, status, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from .models import Job
+from .schemas import JobResponse
+from .service import JobService, JobQueueFullError
+from ..chats.schemas import MessageRequest
+from ..deps import Deps
+
+router = APIRouter(tags=["jobs"])
+
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _to_response(job: Job, service: JobService) -> JobResponse:
+    jobs_ahead, queue_position = service.positions(job)
+    return JobResponse(
+        job_uuid=job.uuid,
+        chat_uuid=job.chat_uuid,
+        status=job.status.value,
+        answer=job.answer,
+        error=job.error,
+        queued_seconds=round(job.started_at - job.created_at, 3) if job.started_at else None,
+        runtime_seconds=round(job.finished_at - job.started_at, 3) if job.finished_at and job.started_at else None,
+        jobs_ahead=jobs_ahead,
+        queue_position=queue_position,
+    )
+
+
+@router.post("/chats/{chat_uuid}/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    request: Request,
+    response: Response,
+    chat_uuid: UUID,
+    payload: MessageRequest,
+    service: JobService = Depends(Deps.get_job_service),
+) -> JobResponse:
+    try:
+        job = await service.submit(chat_uuid, payload.message, payload.metodo, payload.space)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    response.headers["Location"] = f"/api/v1/jobs/{job.uuid}"
+
+    return _to_response(job, service)
+
+
+@router.get("/jobs/metrics", status_code=status.HTTP_200_OK)
+def get_job_metrics(
+    request: Request,
+    service: JobService = Depends(Deps.get_job_service),
+) -> dict:
+    return service.metrics()
+
+
+@router.get("/jobs/{job_uuid}", response_model=JobResponse, status_code=status.HTTP_200_OK)
+async def get_job(
+    request: Request,
+    job_uuid: UUID,
+    wait: float = 0,
+    service: JobService = Depends(Deps.get_job_service),
+) -> JobResponse:
+    # `wait` > 0 turns polling into long-polling: return as soon as the job finishes.
+    job = service.require_job(job_uuid)
+    if wait > 0 and not job.finished:
+        try:
+            await service.wait(job_uuid, timeout=min(wait, 60))
+        except asyncio.TimeoutError:
+            pass
+
+    return _to_response(job, service)
+
+
+@router.get("/jobs/{job_uuid}/events")
+async def stream_job_events(
+    request: Request,
+    job_uuid: UUID,
+    service: JobService = Depends(Deps.get_job_service),
+) -> StreamingResponse:
+    job = service.require_job(job_uuid)
+
+    async def events():
+        if not job.finished:
+            yield _sse("status", _to_response(job, service))
+        # One waiter for the whole stream; keepalive ticks only time out on it.
+        finished = asyncio.create_task(job.done.wait())
+        try:
+            while not job.finished:
+                done, _ = await asyncio.wait({finished}, timeout=SSE_KEEPALIVE_SECONDS)
+                if not done:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+            yield _sse(job.status.value, _to_response(job, service))
+        finally:
+            finished.cancel()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _sse(event: str, payload: JobResponse) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload.model_dump(mode='json'))}\n\n"
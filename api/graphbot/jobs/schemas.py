@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from uuid import UUID, uuid4
+
+
+class JobResponse(BaseModel):
+    job_uuid: UUID = Field(example=str(uuid4()))
+    chat_uuid: UUID = Field(example=str(uuid4()))
+    status: str = Field(example="queued")
+    answer: str | None = Field(default=None, example=None)
+    error: str | None = Field(default=None, example=None)
+    queued_seconds: float | None = Field(default=None, example=0.2)
+    runtime_seconds: float | None = Field(default=None, example=None)
+    jobs_ahead: int | None = Field(
+        default=None, example=3, description="While queued: jobs that will start before this one",
+    )
+    queue_position: int | None = Field(
+        default=None, example=None,
+        description="While running: messages of the chat ahead of this one (0: being answered)",
+    )
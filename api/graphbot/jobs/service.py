@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from uuid import UUID
+
+from .metrics import Histogram
+from .models import JOB_STATUS, Job
+from ..chats.service import ChatService
+from ..store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(RuntimeError):
+    pass
+
+
+class JobService:
+    """
+    In-process queue of chat messages answered in the background, so long drift
+    and global searches outlive the HTTP request that submitted them.
+    """
+
+    def __init__(
+        self,
+        store: BaseStore[Job],
+        chat_service: ChatService,
+        workers: int = 2,
+        max_queued: int = 100,
+        max_finished: int = 1000,
+    ):
+        self.store = store
+        self.chat_service = chat_service
+        self.workers = workers
+        self.max_finished = max_finished
+
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue(maxsize=max_queued)
+        self._tasks: list[asyncio.Task] = []
+        self._finished: deque[UUID] = deque()
+        # Jobs put in / taken from the FIFO queue: a queued job has `sequence - _taken` ahead of it.
+        self._submitted = 0
+        self._taken = 0
+
+        self.queue_wait = Histogram()
+        self.runtime = Histogram()
+
+    # Lifecycle
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # "Repository"
+    async def submit(self, chat_uuid: UUID, message: str, method: str, space: str | None = None) -> Job:
+        await self.chat_service.require_chat(chat_uuid)
+
+        job = Job(chat_uuid=chat_uuid, message=message, method=method, space=space, sequence=self._submitted)
+        if not self.store.create(job):
+            raise Exception("Could not create a new job")
+
+        try:
+            self._queue.put_nowait(job.uuid)
+        except asyncio.QueueFull:
+            self.store.delete(job.uuid)
+            raise JobQueueFullError("Too many queued jobs, try again later.")
+
+        self._submitted += 1
+        return job
+
+    def require_job(self, job_uuid: UUID) -> Job:
+        return self.store.require(job_uuid)
+
+    async def wait(self, job_uuid: UUID, timeout: float | None = None) -> Job:
+        job = self.require_job(job_uuid)
+        await asyncio.wait_for(job.done.wait(), timeout)
+        return job
+
+    # Service
+    def positions(self, job: Job) -> tuple[int | None, int | None]:
+        """
+        `(jobs ahead in the job queue, messages ahead in the chat's queue)`:
+        the first while the job is queued, the second while it is running
+        (0 once its message is being answered).
+        """
+        if job.status == JOB_STATUS.QUEUED:
+            return max(job.sequence - self._taken, 0), None
+        if job.status == JOB_STATUS.RUNNING and job.chat_ticket is not None:
+            return None, self.chat_service.queue_position(job.chat_uuid, job.chat_ticket)
+        return None, None
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "workers": len(self._tasks),
+            "jobs": self.store.count(),
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "runtime_seconds": self.runtime.snapshot(),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job_uuid = await self._queue.get()
+            self._taken += 1
+            try:
+                await self._run(self.require_job(job_uuid))
+            except Exception:
+                logger.exception("Job %s crashed", job_uuid)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = JOB_STATUS.RUNNING
+        job.started_at = time.time()
+        self.queue_wait.observe(job.started_at - job.created_at)
+
+        try:
+            job.answer = await self.chat_service.reply_to_user(
+                job.chat_uuid, job.message, job.method, wait=True, space=job.space,
+                on_queued=lambda ticket, position: setattr(job, "chat_ticket", ticket),
+            )
+            job.status = JOB_STATUS.DONE
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.status = JOB_STATUS.FAILED
+        finally:
+            job.finished_at = time.time()
+            self.runtime.observe(job.finished_at - job.started_at)
+            job.done.set()
+            self._forget_old(job.uuid)
+
+    def _forget_old(self, job_uuid: UUID) -> None:
+        self._finished.append(job_uuid)
+        while len(self._finished) > self.max_finished:
+            self.store.delete(self._finished.popleft())
@@ -0,0 +1,9 @@
+from .vector_index import VectorIndex, InMemoryVectorStore
+from .embedding_cache import EmbeddingCache, CachedTextEmbedder
+from .index import KnowledgeIndex
+from .conversation import ConversationContext, ConversationContexts
+from .text_index import TextIndex, TextHit
+from .sources import SourceIndex
+from .communities import CommunityHierarchy
+
+from .search import GraphRAGSearch
\ No newline at end of file
@@ -0,0 +1,92 @@
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+_SOURCE_KEY = b"graphbot.source"
+
+
+class ArrowTableCache:
+    """
+    Uncompressed Arrow IPC copies of the GraphRAG parquet outputs, opened with
+    `mmap`: reading a table costs no decode and no private memory, and every
+    process that opens the same file (uvicorn workers, the search pool) shares
+    its pages through the OS page cache.
+
+    A copy is written once, the first time a parquet file is seen, and again
+    whenever the parquet file changes (its size and mtime are stored in the
+    IPC schema metadata). Writes go to a temp file and are renamed into place,
+    so concurrent processes never see a partial file.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def path(self, name: str) -> Path:
+        return self.directory / f"{name}.arrow"
+
+    def open(self, name: str, source: Path) -> pa.Table:
+        fingerprint = _fingerprint(source)
+        path = self.path(name)
+
+        table = _map(path)
+        if table is not None and (table.schema.metadata or {}).get(_SOURCE_KEY) == fingerprint:
+            return table
+
+        try:
+            self._write(path, pq.read_table(source), fingerprint)
+        except OSError as e:
+            logger.warning("Could not write Arrow copy of %s: %s", source.name, e)
+            return pq.read_table(source)
+
+        return _map(path)
+
+    def _write(self, path: Path, table: pa.Table, fingerprint: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE_KEY: fingerprint})
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def column_array(table: pa.Table, column: str, fill: object = None) -> np.ndarray:
+    """
+    `column` as NumPy: a zero-copy view of the mapped buffer for a primitive
+    column without nulls in a single chunk (read-only), a copy otherwise.
+    Nulls are replaced by `fill` when given (a copy only if there are any).
+    """
+    chunked = table.column(column)
+    if fill is not None and chunked.null_count:
+        chunked = pc.fill_null(chunked, pa.scalar(fill, type=chunked.type))
+    if chunked.num_chunks == 1:
+        return chunked.chunk(0).to_numpy(zero_copy_only=False)
+    return chunked.to_numpy()
+
+
+def _map(path: Path) -> pa.Table | None:
+    if not path.exists():
+        return None
+    try:
+        return pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    except (OSError, pa.ArrowInvalid) as e:
+        logger.warning("Ignoring unreadable Arrow file %s: %s", path, e)
+        return None
+
+
+def _fingerprint(source: Path) -> bytes:
+    stat = source.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
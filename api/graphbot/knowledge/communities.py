@@ -0,0 +1,204 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+
+from .arrow_cache import column_array
+from .index import KnowledgeIndex
+
+COMMUNITIES = "create_final_communities"
+COMMUNITY_REPORTS = "create_final_community_reports"
+
+SORTS = ("rating", "size")
+TOP_PER_LEVEL = 5
+
+
+@dataclass(frozen=True)
+class CommunitySummary:
+    community: int
+    parent: int | None
+    level: int
+    title: str
+    rating: float | None            # the report's impact rating (graphrag's `rank`), 0-10
+    size: int                       # entities
+    children: int
+    summary: str
+
+
+@dataclass(frozen=True)
+class Finding:
+    summary: str
+    explanation: str
+
+
+@dataclass(frozen=True)
+class CommunityDetail:
+    community: CommunitySummary
+    rating_explanation: str | None
+    findings: list[Finding]
+    path: list[CommunitySummary]            # ancestors, root first
+    children: list[CommunitySummary]        # highest rated first
+
+
+@dataclass(frozen=True)
+class LevelRollup:
+    level: int
+    communities: int
+    reports: int
+    entities: int
+    mean_rating: float | None
+    max_rating: float | None
+    top: list[CommunitySummary]
+
+
+class CommunityHierarchy:
+    """
+    The community tree of a `KnowledgeIndex` with its reports, built once:
+    one row per community (parent and children as positions), every ordering
+    the API serves (by rating and by size, per level and overall) and the
+    per-level rollups. Findings and rating explanations are read from the
+    report table only for the community asked for.
+    """
+
+    def __init__(self, index: KnowledgeIndex) -> None:
+        communities = index.arrow(COMMUNITIES)
+        if communities is None:
+            raise FileNotFoundError(f"Missing GraphRAG output table: {COMMUNITIES}.parquet")
+        reports = index.arrow(COMMUNITY_REPORTS)
+
+        self.ids: np.ndarray = column_array(communities, "community").astype(np.int64)
+        self.levels: np.ndarray = column_array(communities, "level").astype(np.int32)
+        self.sizes: np.ndarray = column_array(communities, "size").astype(np.int64)
+        self._position = {int(c): i for i, c in enumerate(self.ids)}
+
+        parent_ids = column_array(communities, "parent").astype(np.int64)
+        self.parents: np.ndarray = np.array([self._position.get(int(p), -1) for p in parent_ids], dtype=np.int64)
+
+        # Report of every community, where there is one.
+        count = len(self.ids)
+        self._report_rows = np.full(count, -1, dtype=np.int64)
+        self.ratings = np.full(count, np.nan)
+        self.titles: np.ndarray = column_array(communities, "title").astype(object)
+        self.summaries = np.full(count, "", dtype=object)
+        self._reports = reports
+        if reports is not None:
+            report_communities = column_array(reports, "community").astype(np.int64)
+            positions = np.array([self._position.get(int(c), -1) for c in report_communities], dtype=np.int64)
+            rows = np.flatnonzero(positions >= 0)
+            positions = positions[rows]
+            self._report_rows[positions] = rows
+            self.ratings[positions] = column_array(reports, "rank").astype(np.float64)[rows]
+            self.titles[positions] = column_array(reports, "title").astype(object)[rows]
+            self.summaries[positions] = column_array(reports, "summary").astype(object)[rows]
+
+        # Children as CSR over parent positions, highest rated first.
+        has_parent = np.flatnonzero(self.parents >= 0)
+        order = has_parent[np.lexsort((self._rating_key(has_parent), self.parents[has_parent]))]
+        self._children = order
+        self._children_indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.parents[has_parent], minlength=count), out=self._children_indptr[1:])
+
+        self.level_values: tuple[int, ...] = tuple(int(level) for level in np.unique(self.levels))
+        everything = np.arange(count)
+        self._orders: dict[tuple[int | None, str], np.ndarray] = {}
+        for level in (None, *self.level_values):
+            members = everything if level is None else np.flatnonzero(self.levels == level)
+            self._orders[(level, "rating")] = members[np.lexsort((-self.sizes[members], self._rating_key(members)))]
+            self._orders[(level, "size")] = members[np.lexsort((self._rating_key(members), -self.sizes[members]))]
+
+        self.rollups: list[LevelRollup] = [self._rollup(level) for level in self.level_values]
+
+    # Lookups
+    def position(self, community: int) -> int | None:
+        return self._position.get(community)
+
+    def summary(self, position: int) -> CommunitySummary:
+        parent = self.parents[position]
+        rating = self.ratings[position]
+        return CommunitySummary(
+            community=int(self.ids[position]),
+            parent=int(self.ids[parent]) if parent >= 0 else None,
+            level=int(self.levels[position]),
+            title=self.titles[position] or "",
+            rating=None if np.isnan(rating) else float(rating),
+            size=int(self.sizes[position]),
+            children=int(self._children_indptr[position + 1] - self._children_indptr[position]),
+            summary=self.summaries[position] or "",
+        )
+
+    def children(self, position: int) -> np.ndarray:
+        return self._children[self._children_indptr[position]:self._children_indptr[position + 1]]
+
+    def ancestors(self, position: int) -> list[int]:
+        path = []
+        parent = self.parents[position]
+        while parent >= 0 and len(path) < len(self.ids):
+            path.append(int(parent))
+            parent = self.parents[parent]
+        return path[::-1]
+
+    def communities(
+        self,
+        level: int | None = None,
+        sort: str = "rating",
+        min_rating: float | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[int, list[CommunitySummary]]:
+        """Communities of `level` (all if None) in a precomputed order; returns the total and one page."""
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort: {sort!r} (expected one of {SORTS})")
+        order = self._orders.get((level, sort))
+        if order is None:
+            return 0, []
+        if min_rating is not None:
+            order = order[self.ratings[order] >= min_rating]
+        return len(order), [self.summary(int(p)) for p in order[offset:offset + limit]]
+
+    def detail(self, community: int) -> CommunityDetail | None:
+        position = self.position(community)
+        if position is None:
+            return None
+
+        rating_explanation, findings = None, []
+        row = self._report_rows[position]
+        if row >= 0:
+            rating_explanation = self._report_value("rank_explanation", row)
+            findings = [
+                Finding(summary=f.get("summary") or "", explanation=f.get("explanation") or "")
+                for f in self._report_value("findings", row) or []
+            ]
+
+        return CommunityDetail(
+            community=self.summary(position),
+            rating_explanation=rating_explanation,
+            findings=findings,
+            path=[self.summary(p) for p in self.ancestors(position)],
+            children=[self.summary(int(p)) for p in self.children(position)],
+        )
+
+    # Building
+    def _rating_key(self, positions: np.ndarray) -> np.ndarray:
+        # Ascending sort key: highest rating first, communities without a report last.
+        ratings = self.ratings[positions]
+        return np.where(np.isnan(ratings), np.inf, -ratings)
+
+    def _rollup(self, level: int) -> LevelRollup:
+        members = np.flatnonzero(self.levels == level)
+        ratings = self.ratings[members]
+        rated = ratings[~np.isnan(ratings)]
+        return LevelRollup(
+            level=level,
+            communities=len(members),
+            reports=len(rated),
+            entities=int(self.sizes[members].sum()),
+            mean_rating=round(float(rated.mean()), 2) if len(rated) else None,
+            max_rating=float(rated.max()) if len(rated) else None,
+            top=[self.summary(int(p)) for p in self._orders[(level, "rating")][:TOP_PER_LEVEL]],
+        )
+
+    def _report_value(self, column: str, row: int):
+        table: pa.Table | None = self._reports
+        if table is None or column not in table.column_names:
+            return None
+        return table.column(column)[int(row)].as_py()
@@ -0,0 +1,168 @@
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Hashable
+
+import numpy as np
+from graphrag.query.context_builder.builders import ContextBuilderResult, LocalContextBuilder
+from graphrag.query.context_builder.conversation_history import ConversationHistory
+
+from .vector_index import VectorIndex
+
+
+class ConversationContext:
+    """
+    Local-search working set of one chat, carried from turn to turn.
+
+    Each turn's query embedding is blended with the previous ones, so a short
+    follow-up ("¿y sus efectos secundarios?") still points at the same topic.
+    The entities selected before are re-ranked against it together with fresh
+    nearest neighbours, with a small bonus so the conversation keeps its focus
+    until the topic really changes. When the selection comes out identical,
+    the previous graphrag context (relationships, text units, reports) is
+    reused as is.
+    """
+
+    def __init__(self, max_turns: int = 3, history_weight: float = 0.5, carry_bonus: float = 0.05) -> None:
+        self.history_weight = history_weight
+        self.carry_bonus = carry_bonus
+
+        self.query_embeddings: deque[np.ndarray] = deque(maxlen=max_turns)
+        self.entity_ids: tuple[str, ...] = ()
+        self.entity_names: tuple[str, ...] = ()
+        self.context: ContextBuilderResult | None = None
+
+        self.turns = 0
+        self.reused_entities = 0
+        self.reused_contexts = 0
+        self.lock = threading.Lock()
+
+    def query_vector(self, embedding: np.ndarray) -> np.ndarray:
+        q = _unit(embedding)
+        weight = self.history_weight
+        for previous in reversed(self.query_embeddings):
+            q = q + weight * previous
+            weight *= self.history_weight
+        return _unit(q)
+
+    def select(self, vectors: VectorIndex, embedding: np.ndarray, k: int) -> tuple[str, ...]:
+        """Top `k` entity ids for this turn: fresh neighbours and the previous working set, re-ranked together."""
+        q = self.query_vector(embedding)
+
+        scores: dict[str, float] = {}
+        for pos, score in vectors.search(q, k):
+            scores[vectors.ids[pos]] = score
+        for pos, score in vectors.search(q, len(self.entity_ids), include_ids=self.entity_ids):
+            doc_id = vectors.ids[pos]
+            scores[doc_id] = max(scores.get(doc_id, -1.0), score + self.carry_bonus)
+
+        selected = tuple(sorted(scores, key=scores.__getitem__, reverse=True)[:k])
+
+        self.turns += 1
+        self.reused_entities += len(set(selected) & set(self.entity_ids))
+        self.query_embeddings.append(_unit(embedding))
+        return selected
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.turns,
+            "working_set": len(self.entity_ids),
+            "reused_entities": self.reused_entities,
+            "reused_contexts": self.reused_contexts,
+        }
+
+
+class ConversationContextBuilder(LocalContextBuilder):
+    """
+    Wraps graphrag's `LocalSearchMixedContext`: entity selection comes from the
+    chat's `ConversationContext` (passed as `include_entity_names`), the rest of
+    the context is built by graphrag itself.
+    """
+
+    def __init__(self, inner: Any, conversation: ConversationContext, vectors: VectorIndex) -> None:
+        self.inner = inner
+        self.conversation = conversation
+        self.vectors = vectors
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    def build_context(
+        self,
+        query: str,
+        conversation_history: ConversationHistory | None = None,
+        **kwargs,
+    ) -> ContextBuilderResult:
+        k = kwargs.get("top_k_mapped_entities", 10)
+        mentioned = kwargs.get("include_entity_names") or []
+        conversation = self.conversation
+        if k <= 0:
+            # Every slot taken by entities named in the query: nothing to select, no query embedding.
+            return self.inner.build_context(query, conversation_history, **kwargs)
+
+        with conversation.lock:
+            embedding = np.asarray(self.inner.text_embedder.embed(query), dtype=np.float32)
+            entity_ids = tuple(
+                i for i in conversation.select(self.vectors, embedding, k) if i in self.inner.entities
+            )
+            if not entity_ids:
+                return self.inner.build_context(query, conversation_history, **kwargs)
+
+            # Entities named in the query (see `GraphRAGSearch.local_search`) go first.
+            titles = [self.inner.entities[i].title for i in entity_ids]
+            names = tuple(mentioned) + tuple(t for t in titles if t not in mentioned)
+
+            if names == conversation.entity_names and conversation.context is not None:
+                conversation.entity_ids = entity_ids
+                conversation.reused_contexts += 1
+                return conversation.context
+
+            # `top_k_mapped_entities=0`: graphrag adds only the entities we include by name.
+            result = self.inner.build_context(query, conversation_history, **{
+                **kwargs,
+                "include_entity_names": list(names),
+                "top_k_mapped_entities": 0,
+            })
+            conversation.entity_ids = entity_ids
+            conversation.entity_names = names
+            conversation.context = result
+            return result
+
+
+class ConversationContexts:
+    """LRU of `ConversationContext` by chat."""
+
+    def __init__(self, max_chats: int = 1024) -> None:
+        self.max_chats = max_chats
+
+        self._contexts: OrderedDict[Hashable, ConversationContext] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> ConversationContext:
+        with self._lock:
+            context = self._contexts.get(key)
+            if context is None:
+                context = self._contexts[key] = ConversationContext()
+                while len(self._contexts) > self.max_chats:
+                    self._contexts.popitem(last=False)
+            else:
+                self._contexts.move_to_end(key)
+            return context
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._contexts.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            contexts = list(self._contexts.values())
+        return {
+            "chats": len(contexts),
+            "turns": sum(c.turns for c in contexts),
+            "reused_entities": sum(c.reused_entities for c in contexts),
+            "reused_contexts": sum(c.reused_contexts for c in contexts),
+        }
+
+
+def _unit(v: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm > 0 else v
@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from graphrag.query.llm.base import BaseTextEmbedding
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip().rstrip("?!.¿¡ ")
+
+
+class EmbeddingCache:
+    """
+    Query embeddings keyed by `(model, normalized text)`: a bounded in-memory LRU
+    in front of an optional on-disk tier (one `.npy` file per key).
+    """
+
+    def __init__(self, directory: Path | None = None, max_entries: int = 1024) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\n{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> list[float] | None:
+        key = self.key(model, text)
+
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        vector = self._read(key)
+        with self._lock:
+            if vector is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, vector)
+        return vector
+
+    def put(self, model: str, text: str, vector: list[float]) -> None:
+        key = self.key(model, text)
+        with self._lock:
+            self._remember(key, vector)
+        self._write(key, vector)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"query_{key}.npy"
+
+    def _read(self, key: str) -> list[float] | None:
+        if self.directory is None:
+            return None
+        try:
+            return np.load(self._path(key)).tolist()
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, vector: list[float]) -> None:
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(vector, dtype=np.float32))
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning("Could not persist query embedding: %s", e)
+
+
+class CachedTextEmbedder(BaseTextEmbedding):
+    """Wraps a graphrag text embedder so repeated queries skip the embeddings API."""
+
+    def __init__(self, embedder: BaseTextEmbedding, cache: EmbeddingCache) -> None:
+        self.embedder = embedder
+        self.cache = cache
+        self.model = getattr(embedder, "model", type(embedder).__name__)
+
+    def embed(self, text: str, **kwargs: Any) -> list[float]:
+        vector = self.cache.get(self.model, text)
+        if vector is None:
+            vector = self.embedder.embed(text, **kwargs)
+            if vector:
+                self.cache.put(self.model, text, vector)
+        return vector
+
+    async def aembed(self, text: str, **kwargs: Any) -> list[float]:
+        vector = self.cache.get(self.model, text)
+        if vector is None:
+            vector = await self.embedder.aembed(text, **kwargs)
+            if vector:
+                self.cache.put(self.model, text, vector)
+        return vector
@@ -0,0 +1,260 @@
+import heapq
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .index import KnowledgeIndex
+
+
+@dataclass(frozen=True)
+class GraphSlice:
+    """A filtered view of a `KnowledgeGraph`: node positions plus the edges between them."""
+    level: int
+    nodes: np.ndarray          # int64 positions into the graph's node arrays
+    community: np.ndarray      # int32, community of each selected node at `level` (-1: none)
+    edges: np.ndarray          # int64 positions into the graph's edge arrays
+    source: np.ndarray         # uint32, index into `nodes` (not the graph)
+    target: np.ndarray         # uint32, index into `nodes`
+
+
+@dataclass(frozen=True)
+class GraphPath:
+    nodes: np.ndarray          # node positions, source first
+    edges: np.ndarray          # edge positions, len(nodes) - 1
+    cost: float
+
+
+class CSRAdjacency:
+    """
+    Undirected adjacency in compressed sparse row form: the neighbours of node
+    `n` are `neighbors[indptr[n]:indptr[n + 1]]`, reached through `edges[...]`
+    with `weights[...]`. Each row is sorted by weight, heaviest first.
+    """
+
+    def __init__(self, node_count: int, source: np.ndarray, target: np.ndarray, weight: np.ndarray) -> None:
+        edge = np.arange(len(source), dtype=np.int64)
+        src = np.concatenate([source, target])
+        dst = np.concatenate([target, source])
+        edge = np.concatenate([edge, edge])
+        w = np.concatenate([weight, weight]).astype(np.float32)
+
+        order = np.lexsort((-w, src))
+        self.neighbors: np.ndarray = dst[order].astype(np.int32)
+        self.edges: np.ndarray = edge[order].astype(np.int32)
+        self.weights: np.ndarray = w[order]
+        # Traversal cost: strong relationships are short.
+        self.costs: np.ndarray = 1.0 / np.maximum(self.weights.astype(np.float64), 1e-6)
+        self.indptr: np.ndarray = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=node_count), out=self.indptr[1:])
+
+    def row(self, node: int) -> slice:
+        return slice(self.indptr[node], self.indptr[node + 1])
+
+    def expand(self, frontier: np.ndarray) -> np.ndarray:
+        """All neighbours of `frontier`, with repetitions."""
+        starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        # Gather every [start, end) range without a Python loop.
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return self.neighbors[offsets].astype(np.int64)
+
+
+class KnowledgeGraph:
+    """
+    Entities and relationships of a `KnowledgeIndex` as flat NumPy arrays, built
+    once: one row per entity (`create_final_nodes` has one per community level)
+    and one per relationship, with endpoints resolved to node positions.
+    """
+
+    def __init__(self, index: KnowledgeIndex) -> None:
+        # Straight from the Arrow tables: no DataFrame copy of nodes or relationships.
+        def nodes(column: str, fill: object = None) -> np.ndarray:
+            return index.column("create_final_nodes", column, fill)
+
+        def relationships(column: str, fill: object = None) -> np.ndarray:
+            return index.column("create_final_relationships", column, fill)
+
+        node_ids = nodes("id").astype(object)
+        node_levels = nodes("level").astype(np.int64)
+        order = np.lexsort((node_levels, nodes("human_readable_id")))
+        _, first = np.unique(node_ids[order], return_index=True)
+        unique = order[np.sort(first)]              # first row of each node, by (human_readable_id, level)
+
+        self.ids: np.ndarray = node_ids[unique]
+        self.titles: np.ndarray = nodes("title", fill="").astype(object)[unique]
+        self.degree: np.ndarray = nodes("degree", fill=0).astype(np.int32)[unique]
+
+        self._position = {node_id: i for i, node_id in enumerate(self.ids)}
+        self._by_title = {title: i for i, title in enumerate(self.titles)}
+
+        # Community of every node per level; -1 where the node has none.
+        positions = np.fromiter((self._position[node_id] for node_id in node_ids), dtype=np.int64, count=len(node_ids))
+        node_communities = nodes("community", fill=-1).astype(np.int32)
+        self.levels: tuple[int, ...] = tuple(int(level) for level in np.unique(node_levels))
+        self.communities: dict[int, np.ndarray] = {}
+        for level in self.levels:
+            rows = np.flatnonzero(node_levels == level)
+            community = np.full(len(self.ids), -1, dtype=np.int32)
+            community[positions[rows]] = node_communities[rows]
+            self.communities[level] = community
+
+        source = np.array([self._by_title.get(t, -1) for t in relationships("source")], dtype=np.int64)
+        target = np.array([self._by_title.get(t, -1) for t in relationships("target")], dtype=np.int64)
+        valid = np.flatnonzero((source >= 0) & (target >= 0))
+
+        self.edge_ids: np.ndarray = relationships("id").astype(object)[valid]
+        self.edge_source: np.ndarray = source[valid]
+        self.edge_target: np.ndarray = target[valid]
+        self.edge_weight: np.ndarray = relationships("weight", fill=0).astype(np.float32)[valid]
+        self.edge_descriptions: np.ndarray = relationships("description", fill="").astype(object)[valid]
+
+        self._adjacency: CSRAdjacency | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_ids)
+
+    def position(self, node_id: str) -> int | None:
+        return self._position.get(node_id)
+
+    def position_by_title(self, title: str) -> int | None:
+        return self._by_title.get(title)
+
+    def resolve(self, node: str) -> int | None:
+        """Position of a node given its id or its exact title."""
+        position = self.position(node)
+        return position if position is not None else self.position_by_title(node)
+
+    @property
+    def adjacency(self) -> CSRAdjacency:
+        if self._adjacency is None:
+            with self._lock:
+                if self._adjacency is None:
+                    self._adjacency = CSRAdjacency(
+                        self.node_count, self.edge_source, self.edge_target, self.edge_weight,
+                    )
+        return self._adjacency
+
+    def select(
+        self,
+        level: int = 0,
+        min_degree: int = 0,
+        community: int | None = None,
+        max_nodes: int | None = None,
+        max_edges: int | None = None,
+    ) -> GraphSlice:
+        """
+        Nodes with `degree >= min_degree` (and in `community` at `level`), the
+        `max_nodes` highest-degree of them, and the `max_edges` heaviest edges
+        among those nodes.
+        """
+        if level not in self.communities:
+            raise ValueError(f"Unknown community level {level}; available: {list(self.levels)}")
+        communities = self.communities[level]
+
+        mask = self.degree >= min_degree
+        if community is not None:
+            mask &= communities == community
+        nodes = np.flatnonzero(mask)
+
+        if max_nodes is not None and len(nodes) > max_nodes:
+            # Stable, so ties keep the table order.
+            nodes = np.sort(nodes[np.argsort(-self.degree[nodes], kind="stable")[:max_nodes]])
+
+        return self.subgraph(nodes, level, max_edges)
+
+    def subgraph(self, nodes: np.ndarray, level: int = 0, max_edges: int | None = None) -> GraphSlice:
+        """`nodes` (sorted positions) and the heaviest `max_edges` edges between them."""
+        local = np.full(self.node_count, -1, dtype=np.int64)
+        local[nodes] = np.arange(len(nodes))
+
+        edges = np.flatnonzero((local[self.edge_source] >= 0) & (local[self.edge_target] >= 0))
+        if max_edges is not None and len(edges) > max_edges:
+            edges = np.sort(edges[np.argsort(-self.edge_weight[edges], kind="stable")[:max_edges]])
+
+        return GraphSlice(
+            level=level,
+            nodes=nodes,
+            community=self.communities.get(level, np.full(self.node_count, -1, dtype=np.int32))[nodes],
+            edges=edges,
+            source=local[self.edge_source[edges]].astype(np.uint32),
+            target=local[self.edge_target[edges]].astype(np.uint32),
+        )
+
+    # Traversal
+    def top_neighbors(self, node: int, limit: int = 10) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """`(neighbours, edges, weights)` of `node`, heaviest first."""
+        adjacency = self.adjacency
+        row = adjacency.row(node)
+        end = min(row.stop, row.start + limit)
+        return adjacency.neighbors[row.start:end], adjacency.edges[row.start:end], adjacency.weights[row.start:end]
+
+    def ego(self, node: int, hops: int = 1, max_nodes: int | None = None) -> np.ndarray:
+        """
+        Sorted positions of the nodes within `hops` of `node`. With `max_nodes`,
+        expansion stops at the hop that would exceed it and that hop keeps its
+        highest-degree nodes.
+        """
+        visited = np.zeros(self.node_count, dtype=bool)
+        visited[node] = True
+        frontier = np.array([node], dtype=np.int64)
+
+        for _ in range(hops):
+            reached = np.unique(self.adjacency.expand(frontier))
+            frontier = reached[~visited[reached]]
+            if not len(frontier):
+                break
+            if max_nodes is not None:
+                room = max_nodes - int(visited.sum())
+                if room <= 0:
+                    break
+                if len(frontier) > room:
+                    frontier = frontier[np.argsort(-self.degree[frontier], kind="stable")[:room]]
+            visited[frontier] = True
+
+        return np.flatnonzero(visited)
+
+    def shortest_path(self, source: int, target: int) -> GraphPath | None:
+        """
+        Dijkstra over the relationships with cost `1 / weight`, so the path
+        prefers strong relationships. None if the nodes are not connected.
+        """
+        adjacency = self.adjacency
+
+        distance = {source: 0.0}
+        previous: dict[int, tuple[int, int]] = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node == target:
+                break
+            if d > distance.get(node, np.inf):
+                continue
+            row = adjacency.row(node)
+            for neighbor, edge, c in zip(
+                adjacency.neighbors[row].tolist(), adjacency.edges[row].tolist(), adjacency.costs[row].tolist(),
+            ):
+                nd = d + c
+                if nd < distance.get(neighbor, np.inf):
+                    distance[neighbor] = nd
+                    previous[neighbor] = (node, edge)
+                    heapq.heappush(heap, (nd, neighbor))
+
+        if target not in distance:
+            return None
+
+        nodes, edges = [target], []
+        while nodes[-1] != source:
+            node, edge = previous[nodes[-1]]
+            nodes.append(node)
+            edges.append(edge)
+        return GraphPath(np.array(nodes[::-1], dtype=np.int64), np.array(edges[::-1], dtype=np.int64), distance[target])
+
@@ -0,0 +1,275 @@
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from graphrag.config.load_config import load_config
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.config.resolve_path import resolve_paths
+from graphrag.index.config.embeddings import required_embeddings
+from graphrag.utils.embeddings import create_collection_name
+
+from .arrow_cache import ArrowTableCache, column_array
+from .vector_index import InMemoryVectorStore, VectorIndex
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+OUTPUT_TABLES = (
+    "create_final_nodes",
+    "create_final_entities",
+    "create_final_relationships",
+    "create_final_communities",
+    "create_final_community_reports",
+    "create_final_text_units",
+    "create_final_documents",
+    "create_final_covariates",
+)
+
+VECTOR_INDEX_DIR = "vector_index"
+ARROW_DIR = "arrow"
+
+
+class KnowledgeIndex:
+    """
+    A GraphRAG output folder loaded once and kept in memory: the parquet tables,
+    and every embedding table as a `VectorIndex` on first use of that embedding
+    (graph, sources and autocomplete never need the vectors, so a missing or
+    unreadable LanceDB table only fails the searches that use it).
+
+    With `arrow_cache` the tables are memory-mapped Arrow copies of the parquet
+    files (see `ArrowTableCache`) and the embedding matrices memory-mapped
+    `.npy` files, shared between processes. `arrow` / `column` give zero-copy
+    access; the pandas DataFrames graphrag needs are only built by `table`,
+    on first use of each table.
+    """
+
+    def __init__(self, root: Path, config_filepath: Path | None = None, arrow_cache: bool = True) -> None:
+        self.root = root
+        self.config_filepath = config_filepath
+        self.arrow_cache = arrow_cache
+
+        self._config: GraphRagConfig | None = None
+        self._output_link: Path | None = None
+        self._version = ""
+        self._arrow: dict[str, pa.Table] = {}
+        self._tables: dict[str, pd.DataFrame] = {}
+        self._vectors: dict[str, VectorIndex] = {}
+        self._derived: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # DataFrames and derived structures; reentrant, a derived structure reads tables.
+        self._lazy_lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._config is not None
+
+    @property
+    def config(self) -> GraphRagConfig:
+        return self.load()._config
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the loaded output tables (names, sizes, mtimes), e.g. for ETags."""
+        return self.load()._version
+
+    def approx_bytes(self) -> int:
+        """
+        Rough memory held by the loaded output: Arrow tables (memory-mapped or
+        not), the DataFrames built from them and the vector indexes loaded so far. Structures
+        from `derived` are not counted.
+        """
+        if self._config is None:
+            return 0
+        # A snapshot, without `_lazy_lock`: that is held for seconds while a vector index or DataFrame loads.
+        arrow, converted, vectors = dict(self._arrow), list(self._tables), list(self._vectors.values())
+        # A DataFrame holds about as much again as its Arrow table: strings become Python objects.
+        return (
+            sum(t.nbytes for t in arrow.values())
+            + sum(arrow[name].nbytes for name in converted if name in arrow)
+            + sum(v.approx_bytes() for v in vectors)
+        )
+
+    def load(self) -> "KnowledgeIndex":
+        if self._config is not None:
+            return self
+
+        with self._lock:
+            if self._config is None:
+                config, output_link = _load_config(self.root, self.config_filepath)
+
+                self._arrow = self._load_tables(Path(config.storage.base_dir))
+                self._version = _tables_version(Path(config.storage.base_dir))
+                self._output_link = output_link
+                self._config = config
+
+        return self
+
+    def reload(self) -> bool:
+        """
+        Load the output again if it changed on disk (e.g. a new version published
+        by `Ingestor`). DataFrames and derived structures are rebuilt on next use.
+        Returns whether anything changed.
+        """
+        if self._config is None:
+            return False
+
+        with self._lock:
+            config, output_link = _load_config(self.root, self.config_filepath)
+            output_dir = Path(config.storage.base_dir)
+            version = _tables_version(output_dir)
+            if version == self._version and output_dir == Path(self._config.storage.base_dir):
+                return False
+
+            arrow = self._load_tables(output_dir)
+            with self._lazy_lock:
+                self._arrow, self._version, self._config = arrow, version, config
+                self._output_link = output_link
+                self._tables = {}
+                self._vectors = {}
+                self._derived = {}
+
+        logger.info("Reloaded GraphRAG output %s (version %s)", output_dir, version)
+        return True
+
+    def output_moved(self) -> bool:
+        """
+        Whether the output folder now resolves to another directory than the one
+        loaded, i.e. `Ingestor` published a new version (possibly from another
+        process). A single path resolution; call `reload` when it is True.
+        """
+        if self._config is None:
+            return False
+        return self._output_link.resolve() != Path(self._config.storage.base_dir)
+
+    def arrow(self, name: str) -> pa.Table | None:
+        return self.load()._arrow.get(name)
+
+    def column(self, name: str, column: str, fill: object = None) -> np.ndarray:
+        """A column of a table as NumPy, zero-copy for primitive columns without nulls (see `column_array`)."""
+        table = self.arrow(name)
+        if table is None:
+            raise FileNotFoundError(f"Missing GraphRAG output table: {name}.parquet")
+        return column_array(table, column, fill)
+
+    def table(self, name: str) -> pd.DataFrame | None:
+        df = self._tables.get(name)
+        if df is not None:
+            return df
+
+        table = self.arrow(name)
+        if table is None:
+            return None
+        with self._lazy_lock:
+            df = self._tables.get(name)
+            if df is None:
+                df = self._tables[name] = table.to_pandas()
+        return df
+
+    def require_table(self, name: str) -> pd.DataFrame:
+        df = self.table(name)
+        if df is None:
+            raise FileNotFoundError(f"Missing GraphRAG output table: {name}.parquet")
+        return df
+
+    def vectors(self, embedding_name: str) -> VectorIndex:
+        index = self._vectors.get(embedding_name)
+        if index is not None:
+            return index
+
+        self.load()
+        with self._lazy_lock:
+            # `reload` swaps config and vectors under this lock: load for the current version only.
+            index = self._vectors.get(embedding_name)
+            if index is None:
+                index = self._vectors[embedding_name] = self._load_vectors(self._config, embedding_name)
+        return index
+
+    def vector_store(self, embedding_name: str) -> InMemoryVectorStore:
+        # A fresh store per caller: graphrag keeps per-query filters on the store object.
+        return InMemoryVectorStore(self.vectors(embedding_name), collection_name=embedding_name)
+
+    def derived(self, name: str, build: Callable[["KnowledgeIndex"], R]) -> R:
+        """
+        A structure built once from this index (text index, lookup tables...)
+        and shared by every caller, so it lives exactly as long as the index.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            self.load()
+            with self._lazy_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = self._derived[name] = build(self)
+        return value
+
+    # Loading
+    def _load_tables(self, output_dir: Path) -> dict[str, pa.Table]:
+        cache = ArrowTableCache(output_dir / ARROW_DIR) if self.arrow_cache else None
+
+        tables = {}
+        for name in OUTPUT_TABLES:
+            path = output_dir / f"{name}.parquet"
+            if path.exists():
+                tables[name] = cache.open(name, path) if cache is not None else pq.read_table(path)
+        return tables
+
+    @staticmethod
+    def _load_vectors(config: GraphRagConfig, embedding_name: str) -> VectorIndex:
+        if embedding_name not in required_embeddings:
+            raise KeyError(f"Unknown embedding: {embedding_name}")
+
+        store_args = config.embeddings.vector_store or {}
+        db_uri = store_args.get("db_uri", str(Path(config.storage.base_dir) / "lancedb"))
+        cache_dir = Path(config.storage.base_dir) / VECTOR_INDEX_DIR
+
+        collection_name = create_collection_name(store_args.get("container_name", "default"), embedding_name)
+        source_mtime = _dir_mtime(Path(db_uri) / f"{collection_name}.lance")
+
+        if source_mtime is not None and VectorIndex.saved_mtime(cache_dir, collection_name) == source_mtime:
+            return VectorIndex.load(cache_dir, collection_name)
+
+        index = VectorIndex.from_lancedb(db_uri, collection_name)
+        try:
+            index.save(cache_dir, collection_name, source_mtime)
+        except OSError as e:
+            logger.warning("Could not persist vector index %s: %s", collection_name, e)
+        return index
+
+
+def _load_config(root: Path, config_filepath: Path | None) -> tuple[GraphRagConfig, Path]:
+    """The resolved config and the output folder as configured (a link to the current version once ingested)."""
+    config = load_config(root.resolve(), config_filepath)
+    output_link = Path(config.root_dir) / config.storage.base_dir
+    resolve_paths(config)
+
+    # graphrag joins `db_uri` to the root without following links: pin it to the
+    # version loaded, as `storage.base_dir`, or a newer version's vectors would
+    # be read next to this version's tables.
+    store_args = config.embeddings.vector_store
+    if store_args and store_args.get("db_uri"):
+        store_args["db_uri"] = str(Path(store_args["db_uri"]).resolve())
+    return config, output_link
+
+
+def _dir_mtime(path: Path) -> float | None:
+    if not path.exists():
+        return None
+    return max((p.stat().st_mtime for p in path.rglob("*")), default=path.stat().st_mtime)
+
+
+def _tables_version(output_dir: Path) -> str:
+    digest = hashlib.sha1()
+    for name in OUTPUT_TABLES:
+        path = output_dir / f"{name}.parquet"
+        if path.exists():
+            stat = path.stat()
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
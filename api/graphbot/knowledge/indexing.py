@@ -0,0 +1,536 @@
+"""
+Indexing of a GraphRAG root, instrumented and resumable.
+
+    python -m api.graphbot.knowledge.indexing --root api/graphbot/biology_space [--resume]
+
+Runs graphrag's default pipeline and reports, live and per workflow, the LLM
+requests, rate-limited responses, tokens, cache hits and documents per
+second. The index is built into a staging version next to the ingested ones
+(`output_versions/.<version>.tmp`, see `ingest`) and published when complete,
+so a running API keeps serving the current output meanwhile. Completed
+workflows are recorded in the staging `indexing_state.json` after each one,
+so `--resume` continues after the last completed workflow of a crashed run.
+`parallelization.num_threads` is tuned between workflows: halved when the API
+answers with 429s, grown by a quarter when it doesn't.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import aclosing
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import pandas as pd
+from datashaper import NoopWorkflowCallbacks, Progress, WorkflowCallbacks
+
+from graphrag.cache.factory import CacheFactory
+from graphrag.cache.pipeline_cache import PipelineCache
+from graphrag.callbacks.factory import create_pipeline_reporter
+from graphrag.config.enums import StorageType
+from graphrag.config.load_config import load_config
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.config.resolve_path import resolve_paths
+from graphrag.index.create_pipeline_config import create_pipeline_config
+from graphrag.index.input.factory import create_input
+from graphrag.index.run import run_pipeline_with_config
+from graphrag.index.typing import PipelineRunResult
+from graphrag.logger.base import ProgressLogger
+
+from .ingest import LOCK_FILE, VERSIONS_DIR, Ingestor, _check_output, _exclusive, _new_version, _stage_vector_store
+from .llm_cache import SQLitePipelineCache, open_llm_cache
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "indexing_state.json"
+
+
+async def iter_index(
+    config: GraphRagConfig,
+    cache: PipelineCache | None = None,
+    is_resume_run: bool = False,
+    callbacks: list[WorkflowCallbacks] | None = None,
+    progress_logger: ProgressLogger | None = None,
+    dataset: pd.DataFrame | None = None,
+) -> AsyncIterator[PipelineRunResult]:
+    """
+    `graphrag.api.build_index` with the cache as a parameter: by default the
+    packed SQLite cache of the root (see `llm_cache`) if it was imported,
+    graphrag's own cache from the config otherwise. An update run when
+    `config.update_index_storage` is set, like graphrag's. Yields the result of
+    each workflow as it completes, and logs the cache hits and misses at the end.
+    """
+    is_update_run = bool(config.update_index_storage)
+    if is_resume_run and is_update_run:
+        raise ValueError("Cannot resume and update a run at the same time.")
+
+    cache = cache or open_llm_cache(config)
+    callbacks = [*(callbacks or []), create_pipeline_reporter(config.reporting, None)]
+
+    async with aclosing(run_pipeline_with_config(
+        create_pipeline_config(config),
+        cache=cache,
+        callbacks=callbacks,
+        logger=progress_logger,
+        is_resume_run=is_resume_run,
+        is_update_run=is_update_run,
+        dataset=dataset,
+    )) as outputs:
+        async for output in outputs:
+            yield output
+
+    if isinstance(cache, SQLitePipelineCache):
+        for namespace, counts in sorted(cache.stats.snapshot().items()):
+            logger.info(
+                "LLM cache %s: %d hits, %d misses, %d writes",
+                namespace, counts["hits"], counts["misses"], counts["writes"],
+            )
+
+
+async def build_index(
+    config: GraphRagConfig,
+    cache: PipelineCache | None = None,
+    is_resume_run: bool = False,
+    callbacks: list[WorkflowCallbacks] | None = None,
+    progress_logger: ProgressLogger | None = None,
+) -> list[PipelineRunResult]:
+    """`iter_index` run to the end."""
+    return [
+        output
+        async for output in iter_index(config, cache, is_resume_run, callbacks, progress_logger)
+    ]
+
+
+class IndexingError(RuntimeError):
+    pass
+
+
+# Metering
+@dataclass
+class WorkflowMetrics:
+    workflow: str
+    num_threads: int
+    documents: int = 0
+    seconds: float = 0.0
+    llm_requests: int = 0          # HTTP requests to the LLM API, retries included
+    rate_limited: int = 0          # of which answered 429
+    cache_hits: int = 0
+    cache_misses: int = 0
+    prompt_tokens: int = 0         # of the responses written to the cache
+    completion_tokens: int = 0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    @property
+    def hit_rate(self) -> float | None:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else None
+
+    def line(self) -> str:
+        hit_rate = f"{self.hit_rate:.0%}" if self.hit_rate is not None else "-"
+        return (
+            f"{self.workflow:<32} {self.seconds:>8.1f}s {self.docs_per_second:>8.2f} docs/s "
+            f"{self.llm_requests:>6} req {self.rate_limited:>4} 429 "
+            f"{self.prompt_tokens + self.completion_tokens:>9} tok  hits {hit_rate:>4}  threads {self.num_threads}"
+        )
+
+
+class IndexingMeter:
+    """
+    Counters of the running workflow. graphrag runs workflows one after
+    another, so everything observed while one runs is attributed to it; the
+    counters themselves are bumped from the LLM threads, hence the lock.
+    """
+
+    def __init__(self, documents: int, report_every: float = 10.0) -> None:
+        self.documents = documents
+        self.report_every = report_every
+        self.current: WorkflowMetrics | None = None
+
+        self._started = 0.0
+        self._reported = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, workflow: str, num_threads: int) -> None:
+        with self._lock:
+            self.current = WorkflowMetrics(workflow, num_threads, self.documents)
+            self._started = self._reported = time.perf_counter()
+
+    def finish(self) -> WorkflowMetrics | None:
+        with self._lock:
+            metrics, self.current = self.current, None
+            if metrics is not None:
+                metrics.seconds = time.perf_counter() - self._started
+            return metrics
+
+    def count(self, **counts: int) -> None:
+        with self._lock:
+            if self.current is None:
+                return
+            for name, n in counts.items():
+                setattr(self.current, name, getattr(self.current, name) + n)
+
+    def progress(self, completed: int, total: int) -> None:
+        """Logs the running counters at most every `report_every` seconds."""
+        now = time.perf_counter()
+        with self._lock:
+            if self.current is None or now - self._reported < self.report_every:
+                return
+            self._reported = now
+            m, elapsed = self.current, now - self._started
+
+        rate = self.documents * completed / total / elapsed if total and elapsed else 0.0
+        logger.info(
+            "%s %d/%d (%.0fs, %.2f docs/s) %d requests, %d rate limited, %d tokens, %d/%d cache hits",
+            m.workflow, completed, total, elapsed, rate, m.llm_requests, m.rate_limited,
+            m.prompt_tokens + m.completion_tokens, m.cache_hits, m.cache_hits + m.cache_misses,
+        )
+
+
+class MeteredPipelineCache(PipelineCache):
+    """Any `PipelineCache`, counting lookups and the token usage of what the LLM returned."""
+
+    def __init__(self, cache: PipelineCache, meter: IndexingMeter) -> None:
+        self.cache = cache
+        self.meter = meter
+
+    async def get(self, key: str) -> Any:
+        value = await self.cache.get(key)
+        self.meter.count(**{"cache_hits" if value is not None else "cache_misses": 1})
+        return value
+
+    async def set(self, key: str, value: Any, debug_data: dict | None = None) -> None:
+        usage = value.get("usage") if isinstance(value, dict) else None
+        if isinstance(usage, dict):
+            self.meter.count(
+                prompt_tokens=usage.get("prompt_tokens") or 0,
+                completion_tokens=usage.get("completion_tokens") or 0,
+            )
+        await self.cache.set(key, value, debug_data)
+
+    async def has(self, key: str) -> bool:
+        return await self.cache.has(key)
+
+    async def delete(self, key: str) -> None:
+        await self.cache.delete(key)
+
+    async def clear(self) -> None:
+        await self.cache.clear()
+
+    def child(self, name: str) -> "MeteredPipelineCache":
+        return MeteredPipelineCache(self.cache.child(name), self.meter)
+
+
+class MeteringCallbacks(NoopWorkflowCallbacks):
+    def __init__(self, meter: IndexingMeter, num_threads: int) -> None:
+        self.meter = meter
+        self.num_threads = num_threads
+
+    def on_workflow_start(self, name: str, instance: object) -> None:
+        self.meter.start(name, self.num_threads)
+
+    def on_step_progress(self, node: object, progress: Progress) -> None:
+        if progress.total_items:
+            self.meter.progress(progress.completed_items or 0, progress.total_items)
+
+
+class _HttpRequestFilter(logging.Filter):
+    """
+    Counts the requests httpx logs (the OpenAI client fnllm uses logs every
+    response, retries included) and lets only the unsuccessful ones through,
+    so a run at INFO level shows the 429s without one line per LLM call.
+    """
+
+    def __init__(self, meter: IndexingMeter) -> None:
+        super().__init__()
+        self.meter = meter
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not str(record.msg).startswith("HTTP Request") or not isinstance(record.args, tuple) or len(record.args) < 4:
+            return True
+        status = record.args[3]
+        self.meter.count(llm_requests=1, rate_limited=int(status == 429))
+        return not (isinstance(status, int) and status < 400)
+
+
+# Concurrency
+@dataclass
+class ThreadTuner:
+    """Multiplicative decrease on rate limits, gentler increase while the API keeps up."""
+    min_threads: int = 1
+    max_threads: int = 64
+    tolerance: float = 0.02             # fraction of requests that may be rate limited
+
+    def clamp(self, threads: int) -> int:
+        return max(self.min_threads, min(self.max_threads, threads))
+
+    def update(self, threads: int, metrics: WorkflowMetrics) -> int:
+        if not metrics.llm_requests:
+            return threads
+        if metrics.rate_limited > self.tolerance * metrics.llm_requests:
+            return self.clamp(threads // 2)
+        # Only grow when the workflow had enough calls to keep every thread busy.
+        if not metrics.rate_limited and metrics.llm_requests >= threads:
+            return self.clamp(threads + max(threads // 4, 1))
+        return threads
+
+
+# Driver
+@dataclass
+class IndexRunState:
+    run_id: str
+    num_threads: int
+    completed: list[str] = field(default_factory=list)
+    metrics: list[dict] = field(default_factory=list)
+    stats: dict[str, dict] = field(default_factory=dict)        # graphrag's stats.json workflows
+
+    @classmethod
+    def load(cls, path: Path) -> "IndexRunState | None":
+        if not path.exists():
+            return None
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+class IndexingDriver:
+    """
+    graphrag's pipeline, one segment at a time. A segment is a resume run of the
+    pipeline (graphrag skips the workflows whose table is in the output) that
+    stops when `num_threads` should change, or when a workflow fails on rate
+    limits and may be retried with fewer threads.
+
+    graphrag's resume only looks at which tables exist, which after an earlier
+    complete index is all of them, so tables of workflows this run has not
+    completed are deleted before every segment; completed workflows with an
+    empty output (graphrag exports no table for them) are skipped explicitly.
+
+    The whole run holds the ingestion lock of the root, and the finished index
+    is published like an ingested version (`Ingestor._publish`). A failed run
+    leaves its staging version for `--resume`; a new run drops it.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        config_filepath: Path | None = None,
+        resume: bool = False,
+        tuner: ThreadTuner | None = None,
+        max_restarts: int = 3,
+        report_every: float = 10.0,
+        keep_versions: int = 3,
+    ) -> None:
+        self.root = root
+        self.config_filepath = config_filepath
+        self.resume = resume
+        self.tuner = tuner or ThreadTuner()
+        self.max_restarts = max_restarts
+        self.report_every = report_every
+        self.keep_versions = keep_versions
+
+    def run(self) -> IndexRunState:
+        return asyncio.run(self._run())
+
+    async def _run(self) -> IndexRunState:
+        config = load_config(self.root.resolve(), self.config_filepath)
+        if config.storage.type != StorageType.file or config.update_index_storage:
+            raise IndexingError("The indexing driver runs full indexes to file storage")
+
+        # The link itself; `resolve_paths` follows it to the version being served.
+        output = Path(config.root_dir) / config.storage.base_dir
+        resolve_paths(config)
+        versions = output.parent / VERSIONS_DIR
+        versions.mkdir(parents=True, exist_ok=True)
+
+        with _exclusive(versions / LOCK_FILE):
+            staging, state = self._staging(versions, self.tuner.clamp(config.parallelization.num_threads))
+            try:
+                await self._build(config, staging, state)
+            except BaseException:
+                logger.warning("Run %s left in %s; continue it with --resume", state.run_id, staging)
+                raise
+
+            os.replace(staging, versions / state.run_id)
+            ingestor = Ingestor(self.root, self.config_filepath, self.keep_versions)
+            ingestor._publish(output, versions, state.run_id)
+            ingestor._prune(output, versions)
+
+        logger.info("Published %s as version %s", output, state.run_id)
+        return state
+
+    def _staging(self, versions: Path, num_threads: int) -> tuple[Path, IndexRunState]:
+        """The staging version and state of the run to resume, or of a new one."""
+        # Version names start with the time they were created at.
+        runs = sorted(path.parent for path in versions.glob(f".*.tmp/{STATE_FILENAME}"))
+        if self.resume and runs:
+            staging = runs[-1]
+            return staging, IndexRunState.load(staging / STATE_FILENAME)
+        if self.resume:
+            logger.warning("No run to resume in %s; starting a new one", versions)
+
+        # Under the lock nobody else uses them: earlier runs are not resumable anymore.
+        for path in runs:
+            shutil.rmtree(path, ignore_errors=True)
+        version = _new_version()
+        staging = versions / f".{version}.tmp"
+        staging.mkdir()
+        return staging, IndexRunState(run_id=version, num_threads=num_threads)
+
+    async def _build(self, config: GraphRagConfig, output: Path, state: IndexRunState) -> None:
+        start = time.perf_counter()
+        config = config.model_copy(deep=True)
+        config.storage.base_dir = str(output)
+        _stage_vector_store(config, output)
+
+        state_path = output / STATE_FILENAME
+        workflows = [w.name for w in create_pipeline_config(config).workflows]
+        state.save(state_path)
+
+        dataset = await create_input(config.input, root_dir=config.root_dir)
+        meter = IndexingMeter(len(dataset), self.report_every)
+        cache = open_llm_cache(config) or CacheFactory().create_cache(
+            config.cache.type, config.root_dir, config.cache.model_dump()
+        )
+        cache = MeteredPipelineCache(cache, meter)
+
+        http_filter = _HttpRequestFilter(meter)
+        http_logger = logging.getLogger("httpx")
+        http_level = http_logger.level
+        http_logger.addFilter(http_filter)
+        http_logger.setLevel(logging.INFO)
+        try:
+            restarts = 0
+            while pending := [w for w in workflows if w not in state.completed]:
+                logger.info("Segment from %s with %d threads", pending[0], state.num_threads)
+                done = len(state.completed)
+                failed = await self._segment(config, workflows, output, dataset, cache, meter, state, state_path)
+                if failed is None:
+                    if len(state.completed) == done:
+                        raise IndexingError(f"The pipeline ended without running {pending}")
+                    continue
+
+                workflow, errors, metrics = failed
+                if metrics and metrics.rate_limited and restarts < self.max_restarts:
+                    restarts += 1
+                    state.num_threads = self.tuner.clamp(state.num_threads // 2)
+                    state.save(state_path)
+                    logger.warning("%s failed on rate limits; retrying with %d threads", workflow, state.num_threads)
+                    continue
+                raise IndexingError(f"{workflow} failed: " + "; ".join(map(str, errors)))
+        finally:
+            http_logger.removeFilter(http_filter)
+            http_logger.setLevel(http_level)
+
+        _write_stats(output, state, len(dataset), time.perf_counter() - start)
+        _check_output(output)
+
+    async def _segment(
+        self,
+        config: GraphRagConfig,
+        workflows: list[str],
+        output: Path,
+        dataset: pd.DataFrame,
+        cache: PipelineCache,
+        meter: IndexingMeter,
+        state: IndexRunState,
+        state_path: Path,
+    ) -> tuple[str, list, WorkflowMetrics | None] | None:
+        """Runs until the thread count changes or the pipeline ends. Returns the failure, if any."""
+        config = config.model_copy(deep=True)
+        config.skip_workflows = [*config.skip_workflows, *(
+            w for w in state.completed if not (output / f"{w}.parquet").exists()
+        )]
+        for section in (
+            config, config.entity_extraction, config.summarize_descriptions,
+            config.community_reports, config.claim_extraction, config.embeddings,
+        ):
+            section.parallelization.num_threads = state.num_threads
+
+        for table in output.glob("*.parquet"):
+            if table.stem in workflows and table.stem not in state.completed:
+                table.unlink()
+
+        callbacks = [MeteringCallbacks(meter, state.num_threads)]
+        try:
+            async with aclosing(iter_index(
+                config, cache, is_resume_run=True, callbacks=callbacks, dataset=dataset,
+            )) as results:
+                async for result in results:
+                    metrics = meter.finish()
+                    if result.errors:
+                        return result.workflow, result.errors, metrics
+
+                    state.completed.append(result.workflow)
+                    if metrics is not None:
+                        state.metrics.append({**asdict(metrics), "docs_per_second": metrics.docs_per_second})
+                        logger.info(metrics.line())
+                        threads = self.tuner.update(state.num_threads, metrics)
+                    else:
+                        threads = state.num_threads
+                    _merge_stats(output, state)
+                    state.save(state_path)
+
+                    if threads != state.num_threads:
+                        logger.info("num_threads %d -> %d", state.num_threads, threads)
+                        state.num_threads = threads
+                        state.save(state_path)
+                        return None
+        finally:
+            meter.finish()
+        return None
+
+
+def _merge_stats(output: Path, state: IndexRunState) -> None:
+    # Every segment is a new graphrag run that rewrites stats.json with its own workflows only.
+    path = output / "stats.json"
+    if path.exists():
+        state.stats.update(json.loads(path.read_text(encoding="utf-8")).get("workflows", {}))
+
+
+def _write_stats(output: Path, state: IndexRunState, documents: int, seconds: float) -> None:
+    _merge_stats(output, state)
+    stats = {"total_runtime": seconds, "num_documents": documents, "input_load_time": 0, "workflows": state.stats}
+    (output / "stats.json").write_text(json.dumps(stats, indent=4), encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, required=True, help="GraphRAG root (with settings.yaml)")
+    parser.add_argument("--config", type=Path, default=None)
+    parser.add_argument("--resume", action="store_true", help="continue the last unpublished run")
+    parser.add_argument("--min-threads", type=int, default=1)
+    parser.add_argument("--max-threads", type=int, default=64)
+    parser.add_argument("--max-restarts", type=int, default=3, help="retries of a workflow failing on rate limits")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between progress lines")
+    parser.add_argument("--keep-versions", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    driver = IndexingDriver(
+        args.root,
+        args.config,
+        resume=args.resume,
+        tuner=ThreadTuner(args.min_threads, args.max_threads),
+        max_restarts=args.max_restarts,
+        report_every=args.report_every,
+        keep_versions=args.keep_versions,
+    )
+    state = driver.run()
+
+    print(f"run {state.run_id}: {len(state.completed)} workflows")
+    for metrics in state.metrics:
+        print(WorkflowMetrics(**{k: v for k, v in metrics.items() if k != "docs_per_second"}).line())
+
+
+if __name__ == "__main__":
+    main()
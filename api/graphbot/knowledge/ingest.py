@@ -0,0 +1,271 @@
+"""
+Incremental ingestion of new input documents into a GraphRAG space.
+
+    python -m api.graphbot.knowledge.ingest --root api/graphbot/biology_space [--dry-run]
+
+Only documents whose content hash is not in the current output are indexed;
+graphrag's update pipeline extracts them and merges the result (entities,
+relationships, text units, communities, reports, embeddings) into a new
+output version, which then replaces the current one atomically.
+"""
+import argparse
+import asyncio
+import fcntl
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from graphrag.config.enums import StorageType
+from graphrag.config.load_config import load_config
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.config.models.storage_config import StorageConfig
+from graphrag.config.resolve_path import resolve_paths
+from graphrag.index.input.factory import create_input
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = "output_versions"
+LOCK_FILE = ".ingest.lock"
+REQUIRED_TABLES = ("create_final_documents", "create_final_entities", "create_final_nodes")
+
+
+class IngestError(RuntimeError):
+    pass
+
+
+@dataclass
+class IngestPlan:
+    new: list[str] = field(default_factory=list)          # input titles
+    changed: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return not self.new and not self.changed
+
+
+@dataclass
+class IngestResult:
+    plan: IngestPlan
+    version: str | None = None
+    seconds: float = 0.0
+
+
+class Ingestor:
+    """
+    Versioned output for a GraphRAG root: `<storage.base_dir>` (usually
+    `output`) becomes a symlink to `output_versions/<version>`, and publishing a
+    new version is a single `os.replace` of that link, so a reader never sees
+    a half-written output. The first run moves the existing output directory
+    to `output_versions/initial`.
+
+    Old versions are pruned down to `keep_versions`, but never one that was
+    current in the last `prune_after` seconds: API processes that have not
+    noticed the new version yet (`KnowledgeIndex.output_moved`) still read it.
+
+    Documents are compared by graphrag's document id, a hash of their content.
+    Documents that changed or disappeared cannot be taken out of an index by
+    graphrag 1.0, so they are reported and need a full `graphrag index`.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        config_filepath: Path | None = None,
+        keep_versions: int = 3,
+        prune_after: float = 600,
+    ) -> None:
+        self.root = root
+        self.config_filepath = config_filepath
+        self.keep_versions = keep_versions
+        self.prune_after = prune_after
+
+    def input_dir(self) -> Path:
+        config, _ = self._config()
+        return Path(config.root_dir) / (config.input.base_dir or "")
+
+    def plan(self) -> IngestPlan:
+        config, output = self._config()
+        return asyncio.run(self._plan(config, output))
+
+    def run(self, plan: IngestPlan | None = None) -> IngestResult:
+        start = time.perf_counter()
+        config, output = self._config()
+
+        plan = plan or asyncio.run(self._plan(config, output))
+        if plan.changed or plan.deleted:
+            raise IngestError(
+                f"Changed documents {plan.changed} / deleted documents {plan.deleted} "
+                "cannot be merged incrementally; run a full `graphrag index`."
+            )
+        if plan.empty:
+            return IngestResult(plan, seconds=time.perf_counter() - start)
+
+        versions = output.parent / VERSIONS_DIR
+        versions.mkdir(parents=True, exist_ok=True)
+        version = _new_version()
+        staging = versions / f".{version}.tmp"
+
+        with _exclusive(versions / LOCK_FILE):
+            try:
+                asyncio.run(self._build(config, staging))
+                _check_output(staging)
+                shutil.rmtree(staging / "delta", ignore_errors=True)
+                os.replace(staging, versions / version)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+            self._publish(output, versions, version)
+            self._prune(output, versions)
+
+        logger.info("Ingested %d documents into %s as version %s", len(plan.new), output, version)
+        return IngestResult(plan, version, time.perf_counter() - start)
+
+    # Steps
+    def _config(self) -> tuple[GraphRagConfig, Path]:
+        config = load_config(self.root.resolve(), self.config_filepath)
+        if config.storage.type != StorageType.file:
+            raise IngestError("Incremental ingestion needs file storage for the output")
+
+        # The link itself; `resolve_paths` follows it to the current version.
+        output = Path(config.root_dir) / config.storage.base_dir
+        resolve_paths(config)
+        return config, output
+
+    @staticmethod
+    async def _plan(config: GraphRagConfig, output: Path) -> IngestPlan:
+        dataset = await create_input(config.input, root_dir=config.root_dir)
+        documents_path = Path(config.storage.base_dir) / "create_final_documents.parquet"
+        if not documents_path.exists():
+            raise IngestError(f"No indexed output at {output}; run `graphrag index` first")
+        indexed = pd.read_parquet(documents_path, columns=["id", "title"])
+
+        indexed_ids = set(indexed["id"])
+        indexed_titles = set(indexed["title"])
+        fresh = dataset[~dataset["id"].isin(indexed_ids)]
+
+        return IngestPlan(
+            new=sorted(fresh.loc[~fresh["title"].isin(indexed_titles), "title"]),
+            changed=sorted(fresh.loc[fresh["title"].isin(indexed_titles), "title"]),
+            deleted=sorted(set(indexed["title"]) - set(dataset["title"])),
+            unchanged=int(dataset["id"].isin(indexed_ids).sum()),
+        )
+
+    @staticmethod
+    async def _build(config: GraphRagConfig, staging: Path) -> None:
+        # Imported here: the indexing driver publishes its versions through this module.
+        from .indexing import build_index
+
+        # graphrag's update run: the pipeline on the new documents only (the LLM
+        # cache is shared), merged with the current output into `staging`.
+        config = config.model_copy(deep=True)
+        config.update_index_storage = StorageConfig(type=StorageType.file, base_dir=str(staging))
+        _stage_vector_store(config, staging)
+
+        results = await build_index(config)
+        errors = [f"{r.workflow}: {e}" for r in results for e in (r.errors or [])]
+        if errors:
+            raise IngestError("Indexing failed: " + "; ".join(map(str, errors)))
+
+    def _publish(self, output: Path, versions: Path, version: str) -> None:
+        if output.exists() and not output.is_symlink():
+            # First ingest: the original output becomes a version too. Readers see
+            # no output between these two steps, only this once.
+            os.replace(output, versions / "initial")
+            output.symlink_to(Path(VERSIONS_DIR) / "initial", target_is_directory=True)
+
+        previous = output.resolve() if output.exists() else None
+        link = output.with_name(f".{output.name}.{version}.link")
+        link.unlink(missing_ok=True)
+        link.symlink_to(Path(VERSIONS_DIR) / version, target_is_directory=True)
+        os.replace(link, output)
+
+        # A version's mtime is the last time it was current (see `_prune`).
+        os.utime(versions / version)
+        if previous is not None:
+            os.utime(previous)
+
+    def _prune(self, output: Path, versions: Path) -> None:
+        current = output.resolve().name
+        old = sorted(
+            (p for p in versions.iterdir() if p.is_dir() and not p.name.startswith(".") and p.name != current),
+            key=lambda p: p.stat().st_mtime,
+        )
+        recent = time.time() - self.prune_after
+        for path in old[:max(len(old) - (self.keep_versions - 1), 0)]:
+            if path.stat().st_mtime < recent:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def _new_version() -> str:
+    # Unique even for runs started within the same second (or by other processes).
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+
+
+def _stage_vector_store(config: GraphRagConfig, staging: Path) -> None:
+    """Points the embeddings at `staging`, so the version being served keeps its own."""
+    config.embeddings.vector_store = {
+        **(config.embeddings.vector_store or {}),
+        "db_uri": str(staging / "lancedb"),
+        "overwrite": True,
+    }
+
+
+@contextmanager
+def _exclusive(path: Path) -> Iterator[None]:
+    """One ingestion per GraphRAG root across processes (API workers, the CLI)."""
+    with open(path, "a+") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise IngestError(f"Another ingestion is running on {path.parent.parent}")
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _check_output(directory: Path) -> None:
+    missing = [name for name in REQUIRED_TABLES if not (directory / f"{name}.parquet").exists()]
+    if missing:
+        raise IngestError(f"Incomplete output in {directory}: missing {missing}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, required=True, help="GraphRAG root (with settings.yaml)")
+    parser.add_argument("--config", type=Path, default=None)
+    parser.add_argument("--keep-versions", type=int, default=3)
+    parser.add_argument("--dry-run", action="store_true", help="only show what would be indexed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    ingestor = Ingestor(args.root, args.config, args.keep_versions)
+
+    plan = ingestor.plan()
+    print(f"new: {len(plan.new)}  changed: {len(plan.changed)}  deleted: {len(plan.deleted)}  unchanged: {plan.unchanged}")
+    for title in plan.new:
+        print(f"  + {title}")
+    for title in plan.changed:
+        print(f"  ~ {title}")
+    for title in plan.deleted:
+        print(f"  - {title}")
+    if args.dry_run or plan.empty:
+        return
+
+    result = ingestor.run(plan)
+    print(f"version {result.version} published in {result.seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+graphrag's LLM cache in a single SQLite file instead of one JSON file per call.
+
+    python -m api.graphbot.knowledge.llm_cache import --root api/graphbot/biology_space
+    python -m api.graphbot.knowledge.llm_cache stats --root api/graphbot/biology_space
+
+`import` copies the `<cache>/<workflow>/chat_*_v2` / `embeddings_*_v2` files
+into `<cache>/llm_cache.sqlite3`; from then on the indexing runs of this repo
+(`Ingestor`, the indexing driver) read and write the packed file. `stats`
+shows the entries of each namespace and the hits and misses of every run
+since the import.
+"""
+import argparse
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from graphrag.cache.pipeline_cache import PipelineCache
+from graphrag.config.enums import CacheType
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+
+CACHE_FILENAME = "llm_cache.sqlite3"
+
+
+EVENTS = ("hits", "misses", "writes")
+
+
+class CacheStats:
+    """Hits / misses / writes per namespace (graphrag uses one per workflow step)."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "writes": 0})
+        self._lock = threading.Lock()
+
+    def count(self, namespace: str, event: str) -> None:
+        with self._lock:
+            self._counts[namespace or "/"][event] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            counts = {ns: dict(c) for ns, c in self._counts.items()}
+        for c in counts.values():
+            _add_hit_rate(c)
+        return counts
+
+
+def _add_hit_rate(counts: dict) -> None:
+    lookups = counts["hits"] + counts["misses"]
+    counts["hit_rate"] = round(counts["hits"] / lookups, 3) if lookups else None
+
+
+class SQLitePipelineCache(PipelineCache):
+    """
+    `PipelineCache` on one SQLite table keyed by `(namespace, key)`; `child`
+    extends the namespace the way `JsonPipelineCache` extends the directory.
+    Values are stored exactly as the JSON cache files (`{"result": ..., ...}`),
+    so importing and exporting is a byte copy.
+
+    Hits, misses and writes are counted in `stats` for this process and added
+    to the `stats` table of the file, so they add up across indexing runs.
+
+    All children share one connection (WAL, one writer at a time), guarded by
+    a lock since graphrag calls the cache from several threads.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        namespace: str = "",
+        stats: CacheStats | None = None,
+        _shared: tuple[sqlite3.Connection, threading.Lock] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.namespace = namespace
+        self.stats = stats or CacheStats()
+
+        if _shared is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                " namespace TEXT PRIMARY KEY,"
+                " hits INTEGER NOT NULL DEFAULT 0, misses INTEGER NOT NULL DEFAULT 0, writes INTEGER NOT NULL DEFAULT 0)"
+            )
+            _shared = (conn, threading.Lock())
+        self._conn, self._lock = _shared
+
+    async def get(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+
+        if row is None:
+            self._count("misses")
+            return None
+        try:
+            value = json.loads(row[0]).get("result")
+        except json.JSONDecodeError:
+            await self.delete(key)
+            value = None
+
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    async def set(self, key: str, value: Any, debug_data: dict | None = None) -> None:
+        if value is None:
+            return
+        data = json.dumps({"result": value, **(debug_data or {})}, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value) VALUES (?, ?, ?)",
+                (self.namespace, key, data),
+            )
+        self._count("writes")
+
+    async def has(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone() is not None
+
+    async def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    async def clear(self) -> None:
+        with self._lock:
+            if self.namespace:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? OR namespace LIKE ? ESCAPE '\\'",
+                    (self.namespace, _escape_like(self.namespace) + "/%"),
+                )
+            else:
+                self._conn.execute("DELETE FROM entries")
+
+    def child(self, name: str) -> "SQLitePipelineCache":
+        namespace = f"{self.namespace}/{name}" if self.namespace else name
+        return SQLitePipelineCache(self.path, namespace, self.stats, (self._conn, self._lock))
+
+    def _count(self, event: str) -> None:
+        self.stats.count(self.namespace, event)
+        with self._lock:
+            # `event` is one of EVENTS, never user input.
+            self._conn.execute(
+                f"INSERT INTO stats (namespace, {event}) VALUES (?, 1)"
+                f" ON CONFLICT (namespace) DO UPDATE SET {event} = {event} + 1",
+                (self.namespace,),
+            )
+
+    # Maintenance
+    def summary(self) -> dict[str, dict]:
+        """Stored entries and bytes, and hits / misses / writes recorded so far, per namespace."""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT namespace, COUNT(*), SUM(LENGTH(CAST(value AS BLOB))) FROM entries GROUP BY namespace"
+            ).fetchall()
+            stats = self._conn.execute("SELECT namespace, hits, misses, writes FROM stats").fetchall()
+
+        summary: dict[str, dict] = defaultdict(lambda: {"entries": 0, "bytes": 0, **dict.fromkeys(EVENTS, 0)})
+        for ns, n, size in entries:
+            summary[ns or "/"].update(entries=n, bytes=size or 0)
+        for ns, *counts in stats:
+            summary[ns or "/"].update(zip(EVENTS, counts))
+        for counts in summary.values():
+            _add_hit_rate(counts)
+        return dict(summary)
+
+    def import_json_cache(self, directory: Path) -> int:
+        """Copy the files of a `JsonPipelineCache` directory; existing keys are kept. Returns entries added."""
+        rows = []
+        for path in sorted(directory.rglob("*")):
+            # Skips this database (and its -wal / -shm files) and anything that is not a JSON entry.
+            if not path.is_file() or path.name.startswith(self.path.name):
+                continue
+            try:
+                value = path.read_text(encoding="utf-8")
+                json.loads(value)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            relative = path.parent.relative_to(directory).as_posix()
+            namespace = "/".join(p for p in (self.namespace, relative if relative != "." else "") if p)
+            rows.append((namespace, path.name, value))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR IGNORE INTO entries (namespace, key, value) VALUES (?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cache_path(config: GraphRagConfig) -> Path | None:
+    if config.cache.type != CacheType.file:
+        return None
+    return Path(config.root_dir) / config.cache.base_dir / CACHE_FILENAME
+
+
+def open_llm_cache(config: GraphRagConfig) -> SQLitePipelineCache | None:
+    """The packed cache of this root if it was imported, else None (graphrag's JSON files)."""
+    path = cache_path(config)
+    if path is None or not path.exists():
+        return None
+    return SQLitePipelineCache(path)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def main() -> None:
+    from graphrag.config.load_config import load_config
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("import", "stats"))
+    parser.add_argument("--root", type=Path, required=True, help="GraphRAG root (with settings.yaml)")
+    parser.add_argument("--config", type=Path, default=None)
+    args = parser.parse_args()
+
+    config = load_config(args.root.resolve(), args.config)
+    path = cache_path(config)
+    if path is None:
+        parser.error("only the file cache type can be packed")
+
+    if args.command == "stats" and not path.exists():
+        parser.error(f"{path} does not exist; run `import` first")
+
+    cache = SQLitePipelineCache(path)
+    if args.command == "import":
+        added = cache.import_json_cache(path.parent)
+        print(f"imported {added} entries into {path}")
+
+    for namespace, summary in sorted(cache.summary().items()):
+        hit_rate = f"{summary['hit_rate']:.0%}" if summary["hit_rate"] is not None else "-"
+        print(
+            f"{namespace:<28} {summary['entries']:>7} entries {summary['bytes'] / 1e6:>9.1f} MB "
+            f"{summary['hits']:>8} hits {summary['misses']:>8} misses  hit rate {hit_rate:>4}"
+        )
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+
+from .index import KnowledgeIndex
+from .text_index import TextIndex, tokenize
+
+AUTO_METHOD = "auto"
+
+# Cues (English and Spanish) that a question is about the corpus as a whole.
+GLOBAL_CUES = (
+    "overall", "overview", "summary", "summarize", "summarise", "main themes", "main topics",
+    "key themes", "trend", "trends", "in general", "all studies", "all the studies", "across the",
+    "resumen", "resume", "resumir", "panorama", "temas principales", "tendencias",
+    "en general", "todos los estudios", "en conjunto",
+)
+
+# Cues that the answer needs connecting several entities (multi-hop).
+RELATIONAL_CUES = (
+    "relationship between", "relation between", "related to", "connect", "connects", "connected",
+    "connection", "connections", "compare", "compared", "comparison", "difference between",
+    "how does", "why does", "mechanism", "mechanisms", "interact", "interacts", "interaction",
+    "relación entre", "relaciona", "relacionan", "compara", "comparar", "diferencia entre",
+    "cómo afecta", "por qué", "mecanismo", "mecanismos", "interactúa",
+)
+
+
+def _phrases(cues: tuple[str, ...]) -> frozenset[str]:
+    # Cues in the form queries are matched in: "Relación entre" -> " relacion entre ".
+    return frozenset(f" {' '.join(tokenize(cue))} " for cue in cues)
+
+
+_GLOBAL = _phrases(GLOBAL_CUES)
+_RELATIONAL = _phrases(RELATIONAL_CUES)
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    method: str
+    reason: str
+    entity_hits: tuple[str, ...] = field(default_factory=tuple)
+
+
+class SearchMethodRouter:
+    """
+    Picks the cheapest adequate graphrag search method for a query, using only
+    local features: the entities it names (`TextIndex.mentions`, the same
+    matcher local search uses) and keyword cues, matched as whole words.
+
+    Cost order is local < drift < global (global maps over every community report).
+    """
+
+    def __init__(self, index: KnowledgeIndex, min_title_chars: int = 3) -> None:
+        self.index = index
+        self.min_title_chars = min_title_chars
+
+    def route(self, query: str) -> RouteDecision:
+        hits = self.entity_hits(query)
+
+        words = f" {' '.join(tokenize(query))} "
+        relational = any(cue in words for cue in _RELATIONAL)
+        broad = any(cue in words for cue in _GLOBAL)
+
+        if len(hits) >= 2 and relational:
+            return RouteDecision("drift", "several entities with a relational cue", hits)
+        if hits:
+            return RouteDecision("local", "entity match", hits)
+        if broad:
+            return RouteDecision("global", "corpus-wide cue without entity match")
+        return RouteDecision("local", "default")
+
+    def entity_hits(self, text: str) -> tuple[str, ...]:
+        # Per index version: the text index is rebuilt when a new output is loaded.
+        mentions = self.index.derived("text_index", TextIndex).mentions(text)
+        return tuple(title for title in mentions if len(title) >= self.min_title_chars)
@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from graphrag.cli.main import SearchType
+from graphrag.index.config.embeddings import (
+    community_full_content_embedding,
+    entity_description_embedding,
+)
+from graphrag.query.factory import (
+    get_drift_search_engine,
+    get_global_search_engine,
+    get_local_search_engine,
+)
+from graphrag.query.indexer_adapters import (
+    read_indexer_communities,
+    read_indexer_covariates,
+    read_indexer_entities,
+    read_indexer_relationships,
+    read_indexer_report_embeddings,
+    read_indexer_reports,
+    read_indexer_text_units,
+)
+from graphrag.query.llm.base import BaseTextEmbedding
+from graphrag.query.llm.get_client import get_text_embedder
+
+from .conversation import ConversationContext, ConversationContextBuilder
+from .embedding_cache import CachedTextEmbedder, EmbeddingCache
+from .index import KnowledgeIndex
+from .text_index import TextIndex
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+INVALID_METHOD_ERROR = "Invalid method"
+
+DEFAULT_COMMUNITY_LEVEL = 2
+DEFAULT_RESPONSE_TYPE = "Multiple Paragraphs"
+
+
+class GraphRAGSearch:
+    """
+    graphrag's query API (local / global / drift) running over a `KnowledgeIndex`.
+
+    Unlike `graphrag.cli.query`, nothing is read from disk per query: the tables,
+    the vector indexes and the graphrag model objects built from them are reused.
+    """
+
+    def __init__(self, index: KnowledgeIndex, embedding_cache: EmbeddingCache | None = None) -> None:
+        self.index = index
+        self.embedding_cache = embedding_cache or EmbeddingCache()
+
+        self._models: dict[tuple, Any] = {}
+        self._models_version = ""
+        self._lock = threading.RLock()
+
+    def run(self, method: str, query: str, conversation: ConversationContext | None = None) -> Any:
+        """Blocking entry point: runs one search on its own event loop and returns the response."""
+        match method:
+            case SearchType.LOCAL.value:
+                response, _context_data = asyncio.run(self.local_search(query, conversation=conversation))
+            case SearchType.GLOBAL.value:
+                response, _context_data = asyncio.run(self.global_search(query))
+            case SearchType.DRIFT.value:
+                response, _context_data = asyncio.run(self.drift_search(query))
+            case _:
+                raise ValueError(INVALID_METHOD_ERROR)
+
+        return response
+
+    async def local_search(
+        self,
+        query: str,
+        community_level: int = DEFAULT_COMMUNITY_LEVEL,
+        response_type: str = DEFAULT_RESPONSE_TYPE,
+        conversation: ConversationContext | None = None,
+    ) -> tuple[Any, dict]:
+        config = self.index.config
+        covariates = self._cached(("covariates",), lambda: self._read_covariates())
+
+        engine = get_local_search_engine(
+            config=config,
+            reports=self._reports(community_level),
+            text_units=self._text_units(),
+            entities=self._entities(community_level),
+            relationships=self._relationships(),
+            covariates={"claims": covariates},
+            description_embedding_store=self.index.vector_store(entity_description_embedding),
+            response_type=response_type,
+            system_prompt=self._prompt(config.local_search.prompt),
+        )
+        engine.context_builder.text_embedder = self._text_embedder()
+
+        # Entities named verbatim in the query are matched lexically and take
+        # the first slots; only the rest come from the embedding search, which
+        # must not bring them again (graphrag returns included + matched as is)
+        # and is skipped, with its embedding call, when they fill every slot.
+        params = engine.context_builder_params
+        top_k = params.get("top_k_mapped_entities", 10)
+        mentions = self.index.derived("text_index", TextIndex).mentions(query)[:top_k]
+        if mentions:
+            params["include_entity_names"] = mentions
+            params["exclude_entity_names"] = [*(params.get("exclude_entity_names") or []), *mentions]
+            params["top_k_mapped_entities"] = top_k - len(mentions)
+
+        if conversation is not None:
+            engine.context_builder = ConversationContextBuilder(
+                engine.context_builder,
+                conversation,
+                self.index.vectors(entity_description_embedding),
+            )
+
+        result = await engine.asearch(query=query)
+        return result.response, result.context_data
+
+    async def global_search(
+        self,
+        query: str,
+        community_level: int | None = DEFAULT_COMMUNITY_LEVEL,
+        dynamic_community_selection: bool = False,
+        response_type: str = DEFAULT_RESPONSE_TYPE,
+    ) -> tuple[Any, dict]:
+        config = self.index.config
+
+        engine = get_global_search_engine(
+            config=config,
+            reports=self._reports(community_level, dynamic_community_selection),
+            entities=self._entities(community_level),
+            communities=self._communities(),
+            response_type=response_type,
+            dynamic_community_selection=dynamic_community_selection,
+            map_system_prompt=self._prompt(config.global_search.map_prompt),
+            reduce_system_prompt=self._prompt(config.global_search.reduce_prompt),
+            general_knowledge_inclusion_prompt=self._prompt(config.global_search.knowledge_prompt),
+        )
+
+        result = await engine.asearch(query=query)
+        return result.response, result.context_data
+
+    async def drift_search(
+        self,
+        query: str,
+        community_level: int = DEFAULT_COMMUNITY_LEVEL,
+    ) -> tuple[Any, dict]:
+        config = self.index.config
+
+        engine = get_drift_search_engine(
+            config=config,
+            reports=self._embedded_reports(community_level),
+            text_units=self._text_units(),
+            entities=self._entities(community_level),
+            relationships=self._relationships(),
+            description_embedding_store=self.index.vector_store(entity_description_embedding),
+            local_system_prompt=self._prompt(config.drift_search.prompt),
+        )
+        text_embedder = self._text_embedder()
+        engine.context_builder.text_embedder = text_embedder
+        engine.context_builder.local_mixed_context.text_embedder = text_embedder
+
+        result = await engine.asearch(query=query)
+
+        # Same reduction as graphrag.api.drift_search: keep the best scoring answer.
+        response = result.response
+        if isinstance(response, dict):
+            response = response["nodes"][0]["answer"]
+        return response, result.context_data
+
+    def warm(self, community_level: int = DEFAULT_COMMUNITY_LEVEL) -> None:
+        """
+        Build everything a first query at `community_level` would: the graphrag
+        model objects, the text index, the query embedder and the vector indexes
+        of local and drift search. Whatever cannot be built now (a missing table
+        or embedding) is left to fail the searches that need it.
+        """
+        steps = {
+            "entities": lambda: self._entities(community_level),
+            "relationships": self._relationships,
+            "reports": lambda: self._reports(community_level),
+            "embedded_reports": lambda: self._embedded_reports(community_level),
+            "communities": self._communities,
+            "text_units": self._text_units,
+            "covariates": lambda: self._cached(("covariates",), lambda: self._read_covariates()),
+            "text_index": lambda: self.index.derived("text_index", TextIndex),
+            "text_embedder": self._text_embedder,
+            "entity_vectors": lambda: self.index.vectors(entity_description_embedding),
+        }
+        for name, build in steps.items():
+            try:
+                build()
+            except Exception as e:
+                logger.warning("Could not warm %s: %s", name, e)
+
+    def _text_embedder(self) -> BaseTextEmbedding:
+        return self._cached(("text_embedder",), lambda: CachedTextEmbedder(
+            get_text_embedder(self.index.config),
+            self.embedding_cache,
+        ))
+
+    # graphrag model objects, built once per community level
+    def _entities(self, community_level: int | None):
+        return self._cached(("entities", community_level), lambda: read_indexer_entities(
+            self.index.require_table("create_final_nodes"),
+            self.index.require_table("create_final_entities"),
+            community_level,
+        ))
+
+    def _reports(self, community_level: int | None, dynamic_community_selection: bool = False):
+        return self._cached(("reports", community_level, dynamic_community_selection), lambda: read_indexer_reports(
+            self.index.require_table("create_final_community_reports"),
+            self.index.require_table("create_final_nodes"),
+            community_level,
+            dynamic_community_selection=dynamic_community_selection,
+        ))
+
+    def _embedded_reports(self, community_level: int):
+        def build():
+            reports = read_indexer_reports(
+                self.index.require_table("create_final_community_reports"),
+                self.index.require_table("create_final_nodes"),
+                community_level,
+            )
+            read_indexer_report_embeddings(reports, self.index.vector_store(community_full_content_embedding))
+            return reports
+
+        return self._cached(("embedded_reports", community_level), build)
+
+    def _text_units(self):
+        return self._cached(("text_units",), lambda: read_indexer_text_units(
+            self.index.require_table("create_final_text_units"),
+        ))
+
+    def _relationships(self):
+        return self._cached(("relationships",), lambda: read_indexer_relationships(
+            self.index.require_table("create_final_relationships"),
+        ))
+
+    def _communities(self):
+        return self._cached(("communities",), lambda: read_indexer_communities(
+            self.index.require_table("create_final_communities"),
+            self.index.require_table("create_final_nodes"),
+            self.index.require_table("create_final_community_reports"),
+        ))
+
+    def _read_covariates(self):
+        covariates = self.index.table("create_final_covariates")
+        return read_indexer_covariates(covariates.copy()) if covariates is not None else []
+
+    def _prompt(self, prompt_config: str | None) -> str | None:
+        if not prompt_config:
+            return None
+        return self._cached(("prompt", prompt_config), lambda: _read_prompt(self.index.config.root_dir, prompt_config))
+
+    def _cached(self, key: tuple, build: Callable[[], R]) -> R:
+        if self._models_version != self.index.version:
+            # A new output was loaded (`KnowledgeIndex.reload`): start over.
+            with self._lock:
+                if self._models_version != self.index.version:
+                    self._models = {}
+                    self._models_version = self.index.version
+
+        value = self._models.get(key)
+        if value is None:
+            with self._lock:
+                value = self._models.get(key)
+                if value is None:
+                    value = self._models[key] = build()
+        return value
+
+
+def _read_prompt(root_dir: str, prompt_config: str) -> str | None:
+    prompt_file = Path(root_dir) / prompt_config
+    if prompt_file.exists():
+        return prompt_file.read_bytes().decode(encoding="utf-8")
+    return None
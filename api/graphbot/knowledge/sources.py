@@ -0,0 +1,274 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .arrow_cache import column_array
+from .index import KnowledgeIndex
+
+TEXT_UNITS = "create_final_text_units"
+DOCUMENTS = "create_final_documents"
+ENTITIES = "create_final_entities"
+RELATIONSHIPS = "create_final_relationships"
+
+
+@dataclass(frozen=True)
+class DocumentRef:
+    id: str
+    human_readable_id: str
+    title: str
+
+
+@dataclass(frozen=True)
+class TextUnitSource:
+    id: str
+    short_id: str                   # cited as `Sources (n)`
+    human_readable_id: str
+    text: str
+    truncated: bool
+    n_tokens: int | None
+    documents: list[DocumentRef]
+
+
+@dataclass(frozen=True)
+class DocumentSource:
+    id: str
+    human_readable_id: str
+    title: str
+    text: str
+    truncated: bool
+    text_unit_ids: list[str]
+
+
+@dataclass
+class Citation:
+    """The text units behind one `[Data: ...]` citation, or the keys it could not resolve."""
+    text_units: list[TextUnitSource] = field(default_factory=list)
+    cited_by: dict[str, list[str]] = field(default_factory=dict)     # text unit id -> "entities:12", ...
+    missing: list[str] = field(default_factory=list)
+
+
+class _Rows:
+    """
+    Row offsets of one table by `id` and by short id, the number answers cite:
+    `human_readable_id` for entities and relationships, the row offset for text
+    units (graphrag's `read_text_units` numbers them by DataFrame row, not by
+    their 1-based `human_readable_id`).
+    """
+
+    def __init__(self, table: pa.Table | None, short_ids_by_row: bool = False) -> None:
+        self.table = table
+        if table is None:
+            self.count = 0
+            self.ids = np.empty(0, dtype=object)
+            self.human_ids = np.empty(0, dtype=object)
+        else:
+            self.count = table.num_rows
+            self.ids = column_array(table, "id").astype(object)
+            self.human_ids = (
+                column_array(table, "human_readable_id").astype(str).astype(object)
+                if "human_readable_id" in table.column_names else self.ids
+            )
+        self.short_ids = np.arange(self.count).astype(str).astype(object) if short_ids_by_row else self.human_ids
+        self.by_id = {key: row for row, key in enumerate(self.ids)}
+        self.by_short_id = {key: row for row, key in enumerate(self.short_ids)}
+        self._columns: dict[str, pa.ChunkedArray] = {}
+
+    def row(self, key: str) -> int | None:
+        row = self.by_id.get(key)
+        return row if row is not None else self.by_short_id.get(key.strip())
+
+    def value(self, column: str, row: int):
+        chunked = self._columns.get(column)
+        if chunked is None:
+            if self.table is None or column not in self.table.column_names:
+                return None
+            chunked = self._columns[column] = self.table.column(column)
+        return chunked[row].as_py()
+
+
+class _Lists:
+    """
+    A list-of-ids column resolved to row offsets of another table, as CSR:
+    the rows of entry `i` are `rows[indptr[i]:indptr[i + 1]]`. Ids that are not
+    in the target table are dropped.
+    """
+
+    def __init__(self, table: pa.Table | None, column: str, target: _Rows) -> None:
+        count = table.num_rows if table is not None else 0
+        self.indptr = np.zeros(count + 1, dtype=np.int64)
+        self.rows = np.empty(0, dtype=np.int32)
+        if table is None or column not in table.column_names:
+            return
+
+        chunked = table.column(column)
+        lists = chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()
+        lengths = lists.value_lengths().fill_null(0).to_numpy(zero_copy_only=False)
+        mapped = pd.Series(lists.flatten().to_numpy(zero_copy_only=False)).map(target.by_id)
+
+        keep = mapped.notna().to_numpy()
+        owners = np.repeat(np.arange(count), lengths)[keep]
+        self.rows = mapped.to_numpy()[keep].astype(np.int32)
+        np.cumsum(np.bincount(owners, minlength=count), out=self.indptr[1:])
+
+    def __getitem__(self, row: int) -> np.ndarray:
+        return self.rows[self.indptr[row]:self.indptr[row + 1]]
+
+
+class SourceIndex:
+    """
+    Lookup tables for citation expansion over a `KnowledgeIndex`, built once
+    from the Arrow tables: id / short id -> row of text units, documents,
+    entities and relationships, and the text units of every entity,
+    relationship and document as row lists. Texts are read from the loaded
+    (usually memory-mapped) tables one row at a time, never copied as a whole.
+    """
+
+    def __init__(self, index: KnowledgeIndex) -> None:
+        self.text_units = _Rows(index.arrow(TEXT_UNITS), short_ids_by_row=True)
+        self.documents = _Rows(index.arrow(DOCUMENTS))
+        self.entities = _Rows(index.arrow(ENTITIES))
+        self.relationships = _Rows(index.arrow(RELATIONSHIPS))
+
+        entities = self.entities.table
+        titles = column_array(entities, "title").astype(object) if entities is not None else []
+        self._entity_by_title = {title: row for row, title in enumerate(titles)}
+
+        self.unit_documents = _Lists(self.text_units.table, "document_ids", self.documents)
+        self.document_units = _Lists(self.documents.table, "text_unit_ids", self.text_units)
+        self.entity_units = _Lists(entities, "text_unit_ids", self.text_units)
+        self.relationship_units = _Lists(self.relationships.table, "text_unit_ids", self.text_units)
+
+    # Lookups
+    def entity_row(self, key: str) -> int | None:
+        """An entity by id, short id or exact title."""
+        row = self.entities.row(key)
+        return row if row is not None else self._entity_by_title.get(key)
+
+    def text_unit(self, key: str, width: int | None = None, terms: Iterable[str] = ()) -> TextUnitSource | None:
+        row = self.text_units.row(key)
+        return self._text_unit(row, width, tuple(terms)) if row is not None else None
+
+    def document(self, key: str, max_chars: int | None = None) -> DocumentSource | None:
+        row = self.documents.row(key)
+        if row is None:
+            return None
+        text, truncated = snippet(self.documents.value("text", row) or "", (), max_chars)
+        return DocumentSource(
+            id=self.documents.ids[row],
+            human_readable_id=self.documents.human_ids[row],
+            title=self.documents.value("title", row) or "",
+            text=text,
+            truncated=truncated,
+            text_unit_ids=[self.text_units.ids[r] for r in self.document_units[row]],
+        )
+
+    def entity_sources(self, key: str, limit: int | None = None, width: int | None = None) -> tuple[int, list[TextUnitSource]] | None:
+        """Total text units mentioning the entity and the first `limit`, snippets centred on its title."""
+        row = self.entity_row(key)
+        if row is None:
+            return None
+        rows = self.entity_units[row]
+        title = self.entities.value("title", row) or ""
+        return len(rows), [self._text_unit(r, width, (title,)) for r in rows[:limit]]
+
+    def relationship_sources(self, key: str, limit: int | None = None, width: int | None = None) -> tuple[int, list[TextUnitSource]] | None:
+        row = self.relationships.row(key)
+        if row is None:
+            return None
+        rows = self.relationship_units[row]
+        terms = (self.relationships.value("source", row) or "", self.relationships.value("target", row) or "")
+        return len(rows), [self._text_unit(r, width, terms) for r in rows[:limit]]
+
+    def expand(
+        self,
+        sources: Iterable[str] = (),
+        entities: Iterable[str] = (),
+        relationships: Iterable[str] = (),
+        limit: int | None = None,
+        width: int | None = None,
+    ) -> Citation:
+        """
+        The text units of a citation such as `[Data: Sources (3); Entities (12, 5)]`,
+        each once, in citation order; `limit` caps the text units per entity or
+        relationship.
+        """
+        citation = Citation()
+        picked: dict[int, list[str]] = {}
+        terms: dict[int, list[str]] = {}
+
+        def add(rows: Iterable[int], label: str, row_terms: tuple[str, ...] = ()) -> None:
+            for r in rows:
+                picked.setdefault(int(r), []).append(label)
+                terms.setdefault(int(r), []).extend(t for t in row_terms if t)
+
+        for key in sources:
+            row = self.text_units.row(key)
+            if row is None:
+                citation.missing.append(f"sources:{key}")
+                continue
+            add([row], f"sources:{key}")
+        for key in entities:
+            row = self.entity_row(key)
+            if row is None:
+                citation.missing.append(f"entities:{key}")
+                continue
+            add(self.entity_units[row][:limit], f"entities:{key}", (self.entities.value("title", row) or "",))
+        for key in relationships:
+            row = self.relationships.row(key)
+            if row is None:
+                citation.missing.append(f"relationships:{key}")
+                continue
+            endpoints = (self.relationships.value("source", row) or "", self.relationships.value("target", row) or "")
+            add(self.relationship_units[row][:limit], f"relationships:{key}", endpoints)
+
+        for row, labels in picked.items():
+            unit = self._text_unit(row, width, tuple(terms[row]))
+            citation.text_units.append(unit)
+            citation.cited_by[unit.id] = labels
+        return citation
+
+    def _text_unit(self, row: int, width: int | None, terms: tuple[str, ...]) -> TextUnitSource:
+        text, truncated = snippet(self.text_units.value("text", row) or "", terms, width)
+        n_tokens = self.text_units.value("n_tokens", row)
+        return TextUnitSource(
+            id=self.text_units.ids[row],
+            short_id=self.text_units.short_ids[row],
+            human_readable_id=self.text_units.human_ids[row],
+            text=text,
+            truncated=truncated,
+            n_tokens=int(n_tokens) if n_tokens is not None else None,
+            documents=[
+                DocumentRef(
+                    id=self.documents.ids[d],
+                    human_readable_id=self.documents.human_ids[d],
+                    title=self.documents.value("title", d) or "",
+                )
+                for d in self.unit_documents[row]
+            ],
+        )
+
+
+def snippet(text: str, terms: Iterable[str], width: int | None) -> tuple[str, bool]:
+    """
+    At most `width` characters of `text` around the first mention of any of
+    `terms` (the start if none is mentioned), cut at spaces. Returns the
+    snippet and whether it was cut.
+    """
+    if width is None or len(text) <= width:
+        return text, False
+
+    lowered = text.lower()
+    mentions = [i for i in (lowered.find(t.lower()) for t in terms if t) if i >= 0]
+    start = max(0, min(min(mentions, default=0) - width // 4, len(text) - width))
+    end = start + width
+    if start > 0:
+        space = text.find(" ", start, start + 40)
+        start = space + 1 if space >= 0 else start
+    if end < len(text):
+        space = text.rfind(" ", end - 40, end)
+        end = space if space > start else end
+
+    return ("…" if start > 0 else "") + text[start:end].strip() + ("…" if end < len(text) else ""), True
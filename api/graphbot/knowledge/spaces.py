@@ -0,0 +1,201 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Generic, Iterable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SETTINGS_FILES = ("settings.yaml", "settings.yml", "settings.json")
+
+
+class SpaceNotFoundError(LookupError):
+    pass
+
+
+def discover_spaces(directory: Path | None, default_root: Path) -> dict[str, Path]:
+    """`default_root` and every subdirectory of `directory` holding a graphrag settings file, by folder name."""
+    roots = {default_root.name: default_root}
+    if directory is not None and directory.is_dir():
+        for path in sorted(directory.iterdir()):
+            if path.is_dir() and any((path / name).exists() for name in SETTINGS_FILES):
+                roots.setdefault(path.name, path)
+    return roots
+
+
+@dataclass
+class _Space(Generic[T]):
+    value: T
+    pinned: bool = False
+    loaded: bool = False
+    size: int = 0
+
+
+class KnowledgeSpaces(Generic[T]):
+    """
+    One object per GraphRAG space (usually a chatbot over its `KnowledgeIndex`),
+    built and loaded on first use and kept while the loaded spaces fit in
+    `memory_budget` bytes. Past it, the least recently used unpinned spaces are
+    closed and dropped; a caller still holding one keeps a working object until
+    it lets go of it.
+
+    - `build(name, root)`: a new, cheap object for the space.
+    - `load(value)`: reads what it needs (blocking; run it off the event loop).
+    - `weigh(value)`: approximate bytes it holds, re-read on every `get` since
+      indexes grow as their DataFrames are built.
+    - `close(value)`: called once it is evicted.
+    - `is_loaded(value)`: whether something else already loaded it (the default
+      space's index is shared with the graph and source endpoints), so it is
+      reported and weighed like the spaces loaded here.
+
+    Pinned spaces (the default one, preloaded ones) count towards the budget
+    but are never evicted. 0 disables the budget.
+
+    The registry lock only guards the dictionary: `build`, `load` and `weigh`
+    (which may wait on an index that is building something) run outside it,
+    so `touch` never waits on them and can be called from the event loop.
+    """
+
+    def __init__(
+        self,
+        roots: dict[str, Path],
+        build: Callable[[str, Path], T],
+        load: Callable[[T], object],
+        weigh: Callable[[T], int],
+        close: Callable[[T], None] | None = None,
+        memory_budget: int = 0,
+        is_loaded: Callable[[T], bool] | None = None,
+    ) -> None:
+        self.roots = dict(roots)
+        self.build = build
+        self.load = load
+        self.weigh = weigh
+        self.close_value = close
+        self.memory_budget = memory_budget
+        self.is_loaded = is_loaded
+
+        self._spaces: OrderedDict[str, _Space[T]] = OrderedDict()
+        self._lock = threading.Lock()
+        # One loader per space; different spaces load concurrently.
+        self._load_locks: dict[str, threading.Lock] = {name: threading.Lock() for name in self.roots}
+        self._evicted = 0
+
+    def names(self) -> list[str]:
+        return list(self.roots)
+
+    def add(self, name: str, value: T, pinned: bool = False) -> None:
+        """Registers an already built object for `name` (e.g. the default space's)."""
+        if name not in self.roots:
+            raise SpaceNotFoundError(f"Unknown space: {name}")
+        with self._lock:
+            self._spaces[name] = _Space(value, pinned)
+
+    def touch(self, name: str) -> T | None:
+        """The object of `name` if it is already loaded, marked as just used; never loads."""
+        with self._lock:
+            space = self._spaces.get(name)
+            if space is None or not space.loaded:
+                return None
+            self._spaces.move_to_end(name)
+            return space.value
+
+    def get(self, name: str) -> T:
+        if name not in self.roots:
+            raise SpaceNotFoundError(f"Unknown space: {name}")
+
+        value = self.touch(name)
+        if value is not None:
+            return value
+
+        with self._load_locks[name]:
+            with self._lock:
+                space = self._spaces.get(name)
+            if space is None:
+                space = _Space(self.build(name, self.roots[name]))
+            if not space.loaded:
+                self.load(space.value)
+                space.loaded = True
+                logger.info("Loaded GraphRAG space %s from %s", name, self.roots[name])
+
+            with self._lock:
+                self._spaces[name] = space
+                self._spaces.move_to_end(name)
+            self._weigh()
+            with self._lock:
+                evicted = self._evict(keep=name)
+
+        for value in evicted:
+            if self.close_value is not None:
+                self.close_value(value)
+        return space.value
+
+    def preload(self, names: Iterable[str]) -> None:
+        """Loads `names` now and pins them."""
+        for name in names:
+            self.get(name)
+            with self._lock:
+                self._spaces[name].pinned = True
+
+    def stats(self) -> list[dict]:
+        """Blocking: weighs every loaded space (run it off the event loop)."""
+        spaces = self._weigh()
+        return [
+            {
+                "name": name,
+                "loaded": name in spaces and spaces[name].loaded,
+                "pinned": name in spaces and spaces[name].pinned,
+                "approx_mb": round(spaces[name].size / 1e6, 1) if name in spaces else 0.0,
+            }
+            for name in self.roots
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            values = [space.value for space in self._spaces.values()]
+            self._spaces.clear()
+        for value in values:
+            if self.close_value is not None:
+                self.close_value(value)
+
+    def _weigh(self) -> dict[str, _Space[T]]:
+        """Re-reads the size of every loaded space, outside the lock; returns the spaces weighed."""
+        with self._lock:
+            spaces = dict(self._spaces)
+        for space in spaces.values():
+            if self._loaded(space):
+                space.size = self.weigh(space.value)
+        return spaces
+
+    def _evict(self, keep: str) -> list[T]:
+        # Called with the lock held, on the sizes from the last `_weigh`.
+        loaded = [(name, space) for name, space in self._spaces.items() if self._loaded(space)]
+        if not self.memory_budget:
+            return []
+
+        total = sum(space.size for _, space in loaded)
+        evicted = []
+        for name, space in loaded:                  # least recently used first
+            if total <= self.memory_budget:
+                break
+            if space.pinned or name == keep:
+                continue
+            del self._spaces[name]
+            total -= space.size
+            evicted.append(space.value)
+            self._evicted += 1
+            logger.info("Evicted GraphRAG space %s (~%.0f MB)", name, space.size / 1e6)
+
+        if total > self.memory_budget:
+            logger.warning(
+                "Loaded GraphRAG spaces take ~%.0f MB, over the %.0f MB budget",
+                total / 1e6, self.memory_budget / 1e6,
+            )
+        return evicted
+
+    def _loaded(self, space: _Space[T]) -> bool:
+        if not space.loaded and self.is_loaded is not None and self.is_loaded(space.value):
+            space.loaded = True
+        return space.loaded
@@ -0,0 +1,222 @@
+import bisect
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+
+from .arrow_cache import column_array
+from .index import KnowledgeIndex
+
+_TOKEN = re.compile(r"\w+")
+
+# BM25
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 3
+
+# How much the prior (entity degree, report rating) scales the text score.
+PRIOR_WEIGHT = 0.15
+
+
+def normalize(text: str) -> str:
+    """Lowercase without accents: "Osteoclastogénesis" and "osteoclastogenesis" match."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(normalize(text))
+
+
+@dataclass(frozen=True)
+class TextHit:
+    kind: str                  # "entity" | "report"
+    id: str
+    title: str
+    score: float
+    snippet: str
+
+
+class _Corpus:
+    """
+    One document collection (entities or community reports).
+
+    - Prefix index: every (title token, doc) pair in one array sorted by
+      token. A prefix is a contiguous range found by bisection, i.e. a trie
+      flattened into an array.
+    - Inverted index: term -> (docs, BM25 weights) over title (boosted) and
+      body, so a query only sums the postings of its terms.
+    """
+
+    def __init__(self, kind: str, ids: list[str], titles: list[str], bodies: list[str], prior: np.ndarray) -> None:
+        self.kind = kind
+        self.ids = ids
+        self.titles = titles
+        self.bodies = bodies
+        self.prior = 1.0 + PRIOR_WEIGHT * np.log1p(np.maximum(prior.astype(np.float64), 0))
+        self.positions = {doc_id: i for i, doc_id in enumerate(ids)}
+
+        # Titles as normalised token strings: "RICHARD A. BRITTEN" -> "richard a britten".
+        self.joined: list[str] = [" ".join(tokenize(title)) for title in titles]
+
+        pairs = set()
+        for doc, joined in enumerate(self.joined):
+            pairs.update((token, doc) for token in joined.split())
+        pairs = sorted(pairs)
+        self.keys: list[str] = [key for key, _ in pairs]
+        self.key_docs = np.fromiter((doc for _, doc in pairs), dtype=np.int32, count=len(pairs))
+
+        self.postings = self._build_postings(titles, bodies)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _build_postings(titles: list[str], bodies: list[str]) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        counts = [
+            Counter(tokenize(title) * TITLE_BOOST + tokenize(body))
+            for title, body in zip(titles, bodies)
+        ]
+        lengths = np.array([sum(c.values()) for c in counts], dtype=np.float64)
+        avg_length = lengths.mean() if len(lengths) else 0.0
+
+        docs_by_term: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for doc, c in enumerate(counts):
+            for term, tf in c.items():
+                docs_by_term[term].append((doc, tf))
+
+        postings = {}
+        n = len(counts)
+        for term, entries in docs_by_term.items():
+            docs = np.array([doc for doc, _ in entries], dtype=np.int32)
+            tf = np.array([tf for _, tf in entries], dtype=np.float64)
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = K1 * (1 - B + B * lengths[docs] / max(avg_length, 1e-9))
+            postings[term] = (docs, (idf * tf * (K1 + 1) / (tf + norm)).astype(np.float32))
+        return postings
+
+    def prefix(self, prefix: str) -> np.ndarray:
+        """Docs with a title token starting with `prefix` (with repetitions)."""
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\uffff", lo)
+        return self.key_docs[lo:hi]
+
+    def complete(self, query: str, limit: int) -> list[tuple[int, float]]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # Every token must prefix-match some title token; titles that start
+        # with what was typed rank first.
+        candidates = np.unique(self.prefix(tokens[0]))
+        for token in tokens[1:]:
+            candidates = np.intersect1d(candidates, self.prefix(token))
+        if not len(candidates):
+            return []
+
+        score = self.prior[candidates].copy()
+        typed = " ".join(tokens)
+        score[[self.joined[d].startswith(typed) for d in candidates]] += 10.0
+        return self._top(candidates, score, limit)
+
+    def search(self, query: str, limit: int) -> list[tuple[int, float]]:
+        scores = np.zeros(len(self.ids), dtype=np.float64)
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                np.add.at(scores, posting[0], posting[1])
+
+        candidates = np.flatnonzero(scores)
+        return self._top(candidates, scores[candidates] * self.prior[candidates], limit)
+
+    @staticmethod
+    def _top(candidates: np.ndarray, score: np.ndarray, limit: int) -> list[tuple[int, float]]:
+        if len(candidates) > limit:
+            keep = np.argpartition(-score, limit - 1)[:limit]
+            candidates, score = candidates[keep], score[keep]
+        order = np.argsort(-score, kind="stable")
+        return [(int(candidates[i]), float(score[i])) for i in order]
+
+
+class TextIndex:
+    """
+    Lexical lookup over a `KnowledgeIndex`: autocomplete on entity titles and
+    BM25 full-text search over entities (title + description) and community
+    reports (title + summary), ranked with entity degree / report rating as a
+    prior. Built once from the loaded tables, no embedding calls.
+    """
+
+    def __init__(self, index: KnowledgeIndex) -> None:
+        # Straight from the Arrow tables: no DataFrame copy of entities, nodes or reports.
+        entity_ids = index.column("create_final_entities", "id").astype(str)
+        degree = _entity_degree(index.arrow("create_final_nodes"))
+        self.entities = _Corpus(
+            "entity",
+            ids=entity_ids.tolist(),
+            titles=index.column("create_final_entities", "title", fill="").tolist(),
+            bodies=index.column("create_final_entities", "description", fill="").tolist(),
+            prior=np.array([degree.get(i, 0) for i in entity_ids], dtype=np.float64),
+        )
+
+        reports = index.arrow("create_final_community_reports")
+        if reports is None:
+            reports = pa.table({"community": [], "title": [], "summary": [], "rank": []})
+        self.reports = _Corpus(
+            "report",
+            ids=column_array(reports, "community").astype(str).tolist(),
+            titles=column_array(reports, "title", fill="").astype(object).tolist(),
+            bodies=column_array(reports, "summary", fill="").astype(object).tolist(),
+            prior=np.nan_to_num(column_array(reports, "rank").astype(np.float64)),
+        )
+
+        # First title token -> (title tokens, entity), for `mentions`.
+        self._titles_by_first: dict[str, list[tuple[tuple[str, ...], int]]] = defaultdict(list)
+        for doc, title in enumerate(self.entities.titles):
+            tokens = tuple(tokenize(title))
+            if tokens:
+                self._titles_by_first[tokens[0]].append((tokens, doc))
+
+    def autocomplete(self, query: str, limit: int = 10) -> list[TextHit]:
+        corpus = self.entities
+        return [self._hit(corpus, doc, score, "") for doc, score in corpus.complete(query, limit)]
+
+    def search(self, query: str, kinds: tuple[str, ...] = ("entity", "report"), limit: int = 10) -> list[TextHit]:
+        hits = []
+        for corpus in (self.entities, self.reports):
+            if corpus.kind in kinds:
+                hits.extend(self._hit(corpus, doc, score, corpus.bodies[doc]) for doc, score in corpus.search(query, limit))
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits[:limit]
+
+    def mentions(self, text: str) -> list[str]:
+        """Titles of the entities named verbatim in `text`, longest match first at each position."""
+        tokens = tokenize(text)
+        found: dict[int, None] = {}
+        for i, token in enumerate(tokens):
+            for title, doc in sorted(self._titles_by_first.get(token, ()), key=lambda t: -len(t[0])):
+                if tuple(tokens[i:i + len(title)]) == title:
+                    found[doc] = None
+                    break
+        return [self.entities.titles[doc] for doc in found]
+
+    @staticmethod
+    def _hit(corpus: _Corpus, doc: int, score: float, body: str) -> TextHit:
+        return TextHit(corpus.kind, corpus.ids[doc], corpus.titles[doc], round(score, 4), _snippet(body))
+
+
+def _entity_degree(nodes: pa.Table | None) -> dict[str, int]:
+    if nodes is None:
+        return {}
+    # `create_final_nodes` has a row per node and level: the first one wins.
+    degree = {}
+    for node_id, d in zip(column_array(nodes, "id"), column_array(nodes, "degree", fill=0)):
+        degree.setdefault(node_id, int(d))
+    return degree
+
+
+def _snippet(text: str, size: int = 200) -> str:
+    return text if len(text) <= size else text[:size].rsplit(" ", 1)[0] + "…"
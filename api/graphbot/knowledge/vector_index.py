@@ -0,0 +1,282 @@
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Collection, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from graphrag.model.types import TextEmbedder
+from graphrag.vector_stores.base import (
+    BaseVectorStore,
+    VectorStoreDocument,
+    VectorStoreSearchResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows a brute-force matmul beats any approximate structure.
+DEFAULT_ANN_THRESHOLD = 20_000
+
+
+class VectorIndex:
+    """Contiguous, L2-normalised float32 matrix with exact (or IVF) top-k search."""
+
+    def __init__(
+        self,
+        ids: list[str],
+        texts: list[str | None],
+        attributes: list[dict[str, Any]],
+        vectors: np.ndarray,
+        ann_threshold: int = DEFAULT_ANN_THRESHOLD,
+    ) -> None:
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+
+        self.ids = ids
+        self.texts = texts
+        self.attributes = attributes
+        self.vectors = _normalize(vectors)
+
+        self._positions = {doc_id: pos for pos, doc_id in enumerate(ids)}
+        self._ivf = _IVF(self.vectors) if len(ids) >= ann_threshold else None
+        self._approx_bytes: int | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1] if self.vectors.ndim == 2 else 0
+
+    def approx_bytes(self) -> int:
+        # Matrix (resident or memory-mapped) plus texts and a rough per-row overhead for ids and attributes.
+        if self._approx_bytes is None:
+            self._approx_bytes = self.vectors.nbytes + sum(len(t or "") for t in self.texts) + 200 * len(self.ids)
+        return self._approx_bytes
+
+    # Construction / persistence
+    @classmethod
+    def from_documents(cls, documents: Sequence[VectorStoreDocument], **kwargs: Any) -> "VectorIndex":
+        docs = [d for d in documents if d.vector is not None]
+        vectors = np.asarray([d.vector for d in docs], dtype=np.float32).reshape(len(docs), -1 if docs else 0)
+        return cls(
+            ids=[str(d.id) for d in docs],
+            texts=[d.text for d in docs],
+            attributes=[d.attributes for d in docs],
+            vectors=vectors,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_lancedb(cls, db_uri: str, collection_name: str, **kwargs: Any) -> "VectorIndex":
+        import lancedb
+
+        table = lancedb.connect(db_uri).open_table(collection_name).to_arrow()
+        if table.num_rows == 0:
+            # Nothing embedded yet: an empty index of the declared dimension.
+            dim = getattr(table.schema.field("vector").type, "list_size", 0)
+            vectors = np.empty((0, max(dim, 0)), dtype=np.float32)
+        else:
+            vectors = np.asarray(table["vector"].to_pylist(), dtype=np.float32).reshape(table.num_rows, -1)
+        return cls(
+            ids=[str(i) for i in table["id"].to_pylist()],
+            texts=table["text"].to_pylist(),
+            attributes=[json.loads(a) if a else {} for a in table["attributes"].to_pylist()],
+            vectors=vectors,
+            **kwargs,
+        )
+
+    @classmethod
+    def load(cls, directory: Path, name: str, **kwargs: Any) -> "VectorIndex":
+        """Load a saved index; the matrix is memory-mapped, not copied."""
+        meta = json.loads((directory / f"{name}.json").read_text(encoding="utf-8"))
+        vectors = np.load(directory / f"{name}.npy", mmap_mode="r")
+        return cls(ids=meta["ids"], texts=meta["texts"], attributes=meta["attributes"], vectors=vectors, **kwargs)
+
+    def save(self, directory: Path, name: str, source_mtime: float | None = None) -> None:
+        """
+        Write the matrix and its metadata. Other processes may have the `.npy`
+        memory-mapped: both files are written aside and renamed into place, the
+        `.json` (which `saved_mtime` checks) last.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        meta = {"ids": self.ids, "texts": self.texts, "attributes": self.attributes, "source_mtime": source_mtime}
+        _write_replace(directory / f"{name}.npy", lambda f: np.save(f, np.ascontiguousarray(self.vectors)))
+        _write_replace(directory / f"{name}.json", lambda f: f.write(json.dumps(meta).encode("utf-8")))
+
+    @staticmethod
+    def saved_mtime(directory: Path, name: str) -> float | None:
+        meta_path = directory / f"{name}.json"
+        if not meta_path.exists() or not (directory / f"{name}.npy").exists():
+            return None
+        return json.loads(meta_path.read_text(encoding="utf-8")).get("source_mtime")
+
+    # Queries
+    def position(self, doc_id: str) -> int | None:
+        return self._positions.get(str(doc_id))
+
+    def document(self, pos: int) -> VectorStoreDocument:
+        return VectorStoreDocument(
+            id=self.ids[pos],
+            text=self.texts[pos],
+            vector=self.vectors[pos].tolist(),
+            attributes=self.attributes[pos],
+        )
+
+    def search(
+        self,
+        query: Sequence[float] | np.ndarray,
+        k: int = 10,
+        include_ids: Collection[str] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Return up to `k` `(position, cosine similarity)` pairs, best first."""
+        if len(self) == 0 or k <= 0:
+            return []
+
+        q = _normalize(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+
+        if include_ids is not None:
+            candidates = np.fromiter(
+                (p for p in (self._positions.get(str(i)) for i in include_ids) if p is not None),
+                dtype=np.int64,
+            )
+        elif self._ivf is not None:
+            candidates = self._ivf.candidates(q)
+        else:
+            candidates = None
+
+        if candidates is None:
+            scores = self.vectors @ q
+            top = _top_k(scores, k)
+            return [(int(p), float(scores[p])) for p in top]
+
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ q
+        top = _top_k(scores, k)
+        return [(int(candidates[p]), float(scores[p])) for p in top]
+
+    def search_batch(self, queries: np.ndarray, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """Exact top-k for a batch of queries: one `(n_queries, n_docs)` matmul."""
+        q = _normalize(np.asarray(queries, dtype=np.float32).reshape(len(queries), -1))
+        k = min(k, len(self))
+        if k <= 0:
+            empty = np.empty((len(q), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        scores = q @ self.vectors.T
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+class InMemoryVectorStore(BaseVectorStore):
+    """graphrag `BaseVectorStore` served from a preloaded `VectorIndex` (no file I/O per query)."""
+
+    def __init__(self, index: VectorIndex, collection_name: str = "", **kwargs: Any) -> None:
+        super().__init__(collection_name=collection_name, document_collection=index, **kwargs)
+
+    @property
+    def index(self) -> VectorIndex:
+        return self.document_collection
+
+    def connect(self, **kwargs: Any) -> None:
+        pass
+
+    def load_documents(self, documents: list[VectorStoreDocument], overwrite: bool = True) -> None:
+        if not overwrite:
+            documents = [self.index.document(p) for p in range(len(self.index))] + list(documents)
+        self.document_collection = VectorIndex.from_documents(documents)
+
+    def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
+        self.query_filter = {str(i) for i in include_ids} if include_ids else None
+        return self.query_filter
+
+    def similarity_search_by_vector(
+        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        return [
+            VectorStoreSearchResult(document=self.index.document(pos), score=score)
+            for pos, score in self.index.search(query_embedding, k, self.query_filter)
+        ]
+
+    def similarity_search_by_text(
+        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        if k <= 0:
+            # Nothing to fill (e.g. every slot taken by entities named in the query): skip the embedding call.
+            return []
+        query_embedding = text_embedder(text)
+        if query_embedding:
+            return self.similarity_search_by_vector(query_embedding, k)
+        return []
+
+    def search_by_id(self, id: str) -> VectorStoreDocument:
+        pos = self.index.position(id)
+        if pos is None:
+            return VectorStoreDocument(id=id, text=None, vector=None)
+        return self.index.document(pos)
+
+
+class _IVF:
+    """Inverted-file coarse quantiser (spherical k-means) for large tables."""
+
+    def __init__(self, vectors: np.ndarray, n_probe: int = 8, n_iter: int = 10, seed: int = 0) -> None:
+        n = len(vectors)
+        n_lists = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+
+        centroids = np.array(vectors[rng.choice(n, size=n_lists, replace=False)], dtype=np.float32)
+        for _ in range(n_iter):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = vectors[assign == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = _normalize(centroids)
+
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        self.centroids = centroids
+        self.lists = [np.flatnonzero(assign == c) for c in range(n_lists)]
+        self.n_probe = min(n_probe, n_lists)
+        logger.info("Built IVF index: %d rows, %d lists", n, n_lists)
+
+    def candidates(self, q: np.ndarray) -> np.ndarray:
+        probes = _top_k(self.centroids @ q, self.n_probe)
+        return np.concatenate([self.lists[c] for c in probes])
+
+
+def _write_replace(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    if isinstance(vectors, np.memmap) or not vectors.flags.writeable:
+        # Saved indexes are written normalised: check it and keep the memory map intact.
+        norms = np.linalg.norm(vectors, axis=-1)
+        if np.all((np.abs(norms - 1.0) < 1e-3) | (norms == 0)):
+            return vectors
+        logger.warning("Memory-mapped vectors are not normalised; normalising an in-memory copy")
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
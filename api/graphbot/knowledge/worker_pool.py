@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .embedding_cache import EmbeddingCache
+from .index import KnowledgeIndex
+from .search import GraphRAGSearch
+
+logger = logging.getLogger(__name__)
+
+# Per-process state, set by `_init_worker` in every pool process.
+_search: GraphRAGSearch | None = None
+
+
+def _init_worker(root: Path, cache_dir: Path | None, cache_size: int, arrow_cache: bool = True) -> None:
+    global _search
+
+    index = KnowledgeIndex(root, arrow_cache=arrow_cache).load()
+    _search = GraphRAGSearch(index, EmbeddingCache(cache_dir, cache_size))
+    # `load` only maps the tables: build the DataFrames, models and vectors
+    # here, also in workers that replace recycled ones, not on their first query.
+    _search.warm()
+    logger.info("GraphRAG worker %d ready", os.getpid())
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run(method: str, query: str) -> Any:
+    return _search.run(method, query)
+
+
+class SearchProcessPool:
+    """
+    Runs `GraphRAGSearch` in warm worker processes so CPU-bound context building
+    is not serialized on the parent's GIL.
+
+    Every worker loads the index and builds what searches use
+    (`GraphRAGSearch.warm`) in its initializer, so it answers its first query
+    warm; it is replaced after `max_tasks_per_worker` queries to cap memory
+    growth, and its replacement warms up the same way. At most `max_pending`
+    queries are in flight, further callers wait for a slot.
+
+    `start` submits one ping per worker so the pool is spawned and loading
+    before the first query. That does not guarantee one ping per process (a
+    fast worker may answer several while another is still loading), and every
+    ping counts towards that worker's `max_tasks_per_worker`.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        workers: int,
+        max_tasks_per_worker: int | None = None,
+        max_pending: int | None = None,
+        embedding_cache_dir: Path | None = None,
+        embedding_cache_size: int = 1024,
+        arrow_cache: bool = True,
+    ) -> None:
+        self.root = root
+        self.workers = workers
+        self.max_tasks_per_worker = max_tasks_per_worker or None
+        self.max_pending = max_pending or 2 * workers
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_size = embedding_cache_size
+        self.arrow_cache = arrow_cache
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        # Serialises start / restart / shutdown; queries never take it.
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._warm_executor()
+
+    def restart(self) -> None:
+        """
+        Replace every worker (e.g. after a new index version). The new pool is
+        warmed up before it is swapped in, so queries keep going to the old
+        one meanwhile; those in flight finish on it.
+        """
+        with self._lock:
+            executor = self._warm_executor()
+            old, self._executor = self._executor, executor
+        if old is not None:
+            old.shutdown(wait=True)
+
+    async def run(self, method: str, query: str) -> Any:
+        if self._executor is None:
+            # Spawning the pool loads the index in every worker: never on the event loop.
+            await asyncio.to_thread(self.start)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        async with self._slots:
+            return await asyncio.wrap_future(self._submit(method, query))
+
+    def _submit(self, method: str, query: str) -> Future:
+        while True:
+            executor = self._executor
+            if executor is None:
+                raise RuntimeError("Search process pool is shut down")
+            try:
+                return executor.submit(_run, method, query)
+            except RuntimeError:
+                # `restart` shut this executor down after it swapped in a new one: use that.
+                if self._executor is executor:
+                    raise
+
+    def _warm_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.root, self.embedding_cache_dir, self.embedding_cache_size, self.arrow_cache),
+            max_tasks_per_child=self.max_tasks_per_worker,
+        )
+        warmups = [executor.submit(_ping) for _ in range(self.workers)]
+        pids = {f.result() for f in warmups}
+        logger.info("GraphRAG process pool started: %d/%d workers answered warm-up", len(pids), self.workers)
+        return executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -12,8 +12,47 @@ class AppSettings(BaseSettings):
 
     store: str = Field("memory")
     store_path: str = Field("data/chats.json")
+    store_shards: int = Field(16)
+    # Bounds for the memory store; redis applies the message cap and TTL (0 = unbounded)
+    store_max_chats: int = Field(10_000)
+    store_idle_ttl: float = Field(24 * 3600)
+    store_max_messages: int = Field(500)
+    sqlite_path: str = Field("data/chats.sqlite3")
+    redis_url: str = Field("redis://localhost:6379/0")
+    redis_prefix: str = Field("graphbot:")
+    redis_max_connections: int = Field(32)
     chatbot: str = Field("graphrag")
 
     graphrag_root: Path = Field(default=Path(""), env="GRAPHRAG_ROOT")
+    # Other spaces: every folder with a graphrag settings file in this directory (default: the
+    # parent of graphrag_root), chosen per message with `space` and loaded on first use.
+    graphrag_spaces_dir: Path | None = Field(None)
+    # Loaded spaces past this are evicted, least recently used first (0 = unbounded)
+    graphrag_spaces_memory_mb: int = Field(4096)
+    # Loaded at startup and never evicted
+    graphrag_preload_spaces: list[str] = Field(default_factory=list)
+    embedding_cache_size: int = Field(1024)
+    # Memory-mapped Arrow copies of the output tables, shared by every process
+    graphrag_arrow_cache: bool = Field(True)
+
+    # 0 = run graphrag in a thread of the API process; N > 0 = pool of N warm processes
+    # (for graphrag_root only; other spaces always answer in threads).
+    graphrag_workers: int = Field(0)
+    graphrag_worker_max_tasks: int = Field(200)
+    graphrag_max_pending: int = Field(0)
+
+    # Messages waiting behind the one being answered, per chat
+    chat_queue_depth: int = Field(4)
+    chat_queue_deadline: float = Field(300)
+
+    # POST /ingest writes input documents and starts (paid) LLM indexing: off unless enabled,
+    # and with a token set it also needs `Authorization: Bearer <token>`.
+    ingest_enabled: bool = Field(False)
+    ingest_token: str = Field("")
+    # Seconds between checks, in every API process, for an output version published by another one.
+    ingest_watch_interval: float = Field(5)
+
+    job_workers: int = Field(2)
+    job_queue_size: int = Field(100)
 
 settings = AppSettings()
\ No newline at end of file
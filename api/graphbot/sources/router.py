@@ -0,0 +1,81 @@
+import asyncio
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from .schemas import CitationResponse, DocumentResponse, TextUnitListResponse, TextUnitResponse
+from .service import SourceService
+from ..deps import Deps
+
+router = APIRouter(tags=["sources"])
+
+WIDTH = Query(None, ge=40, le=20_000, description="Snippet of at most this many characters; whole text if omitted")
+
+
+@router.get("/text-units/{key}", response_model=TextUnitResponse, status_code=status.HTTP_200_OK)
+async def get_text_unit(
+    key: str,
+    width: int | None = WIDTH,
+    service: SourceService = Depends(Deps.get_source_service),
+) -> TextUnitResponse:
+    """`key` is a text unit id or the number cited as `Sources (n)`."""
+    unit = await asyncio.to_thread(service.text_unit, key, width)
+    if unit is None:
+        raise HTTPException(status_code=404, detail=f"Text unit not found: {key}")
+    return TextUnitResponse(**asdict(unit))
+
+
+@router.get("/documents/{key}", response_model=DocumentResponse, status_code=status.HTTP_200_OK)
+async def get_document(
+    key: str,
+    max_chars: int | None = Query(None, ge=40, description="Cut the document text at this many characters"),
+    service: SourceService = Depends(Deps.get_source_service),
+) -> DocumentResponse:
+    document = await asyncio.to_thread(service.document, key, max_chars)
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Document not found: {key}")
+    return DocumentResponse(**asdict(document))
+
+
+@router.get("/entities/{key}/text-units", response_model=TextUnitListResponse, status_code=status.HTTP_200_OK)
+async def get_entity_text_units(
+    key: str,
+    limit: int = Query(10, ge=1, le=200),
+    width: int | None = WIDTH,
+    service: SourceService = Depends(Deps.get_source_service),
+) -> TextUnitListResponse:
+    """Text units the entity was extracted from; `key` is its id, cited number or exact title."""
+    result = await asyncio.to_thread(service.entity_text_units, key, limit, width)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Entity not found: {key}")
+
+    total, units = result
+    return TextUnitListResponse(total=total, text_units=[TextUnitResponse(**asdict(u)) for u in units])
+
+
+@router.get("/relationships/{key}/text-units", response_model=TextUnitListResponse, status_code=status.HTTP_200_OK)
+async def get_relationship_text_units(
+    key: str,
+    limit: int = Query(10, ge=1, le=200),
+    width: int | None = WIDTH,
+    service: SourceService = Depends(Deps.get_source_service),
+) -> TextUnitListResponse:
+    result = await asyncio.to_thread(service.relationship_text_units, key, limit, width)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Relationship not found: {key}")
+
+    total, units = result
+    return TextUnitListResponse(total=total, text_units=[TextUnitResponse(**asdict(u)) for u in units])
+
+
+@router.get("/citations", response_model=CitationResponse, status_code=status.HTTP_200_OK)
+async def expand_citation(
+    sources: list[str] = Query([], description="Cited text units, e.g. `3` or `3,7`"),
+    entities: list[str] = Query([], description="Cited entities, e.g. `12,5,+more`"),
+    relationships: list[str] = Query([]),
+    limit: int = Query(3, ge=1, le=50, description="Text units per entity or relationship"),
+    width: int | None = Query(600, ge=40, le=20_000),
+    service: SourceService = Depends(Deps.get_source_service),
+) -> CitationResponse:
+    """The supporting text of a `[Data: Sources (...); Entities (...); Relationships (...)]` citation."""
+    citation = await asyncio.to_thread(service.citation, sources, entities, relationships, limit, width)
+    return CitationResponse(**asdict(citation))
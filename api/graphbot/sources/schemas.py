@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+
+
+class DocumentRefResponse(BaseModel):
+    id: str = Field(example="444af53f742d70de67409b1f5055e9eb...")
+    human_readable_id: str = Field(example="1")
+    title: str = Field(example="murine_shoulder_spaceflight_summary.txt")
+
+
+class TextUnitResponse(BaseModel):
+    id: str = Field(example="7ef9feb1129724ac6bcf40833e6fa488...")
+    short_id: str = Field(example="3", description="The number answers cite as `Sources (3)`: the text unit's row")
+    human_readable_id: str = Field(example="4")
+    text: str = Field(example="…mice flown on the ISS showed thinning of the retina…")
+    truncated: bool = Field(example=True, description="`text` is a snippet of the text unit")
+    n_tokens: int | None = Field(default=None, example=1200)
+    documents: list[DocumentRefResponse] = Field(default_factory=list)
+
+
+class TextUnitListResponse(BaseModel):
+    total: int = Field(example=4, description="Text units of the entity or relationship, before `limit`")
+    text_units: list[TextUnitResponse] = Field(default_factory=list)
+
+
+class DocumentResponse(BaseModel):
+    id: str = Field(example="444af53f742d70de67409b1f5055e9eb...")
+    human_readable_id: str = Field(example="1")
+    title: str = Field(example="murine_shoulder_spaceflight_summary.txt")
+    text: str = Field(example="Effects of Spaceflight on the Muscles of the Murine Shoulder…")
+    truncated: bool = Field(example=False)
+    text_unit_ids: list[str] = Field(default_factory=list)
+
+
+class CitationResponse(BaseModel):
+    text_units: list[TextUnitResponse] = Field(default_factory=list)
+    cited_by: dict[str, list[str]] = Field(
+        default_factory=dict, example={"7ef9feb1...": ["entities:12", "sources:3"]},
+        description="Text unit id -> the citation keys that led to it",
+    )
+    missing: list[str] = Field(default_factory=list, example=["entities:999"])
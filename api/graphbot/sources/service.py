@@ -0,0 +1,47 @@
+from typing import Iterable
+
+from ..knowledge import KnowledgeIndex, SourceIndex
+from ..knowledge.sources import Citation, DocumentSource, TextUnitSource
+
+
+class SourceService:
+    """
+    The text behind chat citations. Lookups go through `SourceIndex`, built
+    once per index version, so expanding a citation is a few dictionary and
+    array reads on the loaded tables.
+    """
+
+    def __init__(self, index: KnowledgeIndex) -> None:
+        self.index = index
+
+    @property
+    def sources(self) -> SourceIndex:
+        return self.index.derived("sources", SourceIndex)
+
+    def text_unit(self, key: str, width: int | None = None) -> TextUnitSource | None:
+        return self.sources.text_unit(key, width)
+
+    def document(self, key: str, max_chars: int | None = None) -> DocumentSource | None:
+        return self.sources.document(key, max_chars)
+
+    def entity_text_units(self, key: str, limit: int, width: int | None) -> tuple[int, list[TextUnitSource]] | None:
+        return self.sources.entity_sources(key, limit, width)
+
+    def relationship_text_units(self, key: str, limit: int, width: int | None) -> tuple[int, list[TextUnitSource]] | None:
+        return self.sources.relationship_sources(key, limit, width)
+
+    def citation(
+        self,
+        sources: Iterable[str],
+        entities: Iterable[str],
+        relationships: Iterable[str],
+        limit: int,
+        width: int | None,
+    ) -> Citation:
+        return self.sources.expand(_keys(sources), _keys(entities), _keys(relationships), limit, width)
+
+
+def _keys(values: Iterable[str]) -> list[str]:
+    # Accepts repeated parameters and the comma lists of a citation ("12, 5, +more").
+    keys = (key.strip() for value in values for key in value.split(","))
+    return [key for key in keys if key and not key.startswith("+")]
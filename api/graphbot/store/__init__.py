@@ -1,4 +1,9 @@
 from .base_model import BaseModel
 from .base_store import BaseStore, ObjectNotFoundError
+from .async_store import AsyncBaseStore, AsyncStoreAdapter
+from .mutation import Mutation
 
-from .memory_store import MemoryStore
\ No newline at end of file
+from .memory_store import MemoryStore
+from .sharded_memory_store import ShardedMemoryStore
+from .bounded_memory_store import BoundedMemoryStore
+from .file_store import FileStore
\ No newline at end of file
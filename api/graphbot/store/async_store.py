@@ -0,0 +1,101 @@
+import asyncio
+
+from abc import ABC, abstractmethod
+from typing import Generic, Callable
+from uuid import UUID
+
+from .base_store import BaseStore, R, T
+
+
+class AsyncBaseStore(ABC, Generic[T]):
+
+    @abstractmethod
+    async def create(self, obj: T) -> bool:
+        pass
+
+    @abstractmethod
+    async def get(self, uuid: UUID) -> T | None:
+        pass
+
+    @abstractmethod
+    async def require(self, uuid: UUID) -> T:
+        pass
+
+    @abstractmethod
+    async def update(self, uuid: UUID, obj: T) -> bool:
+        pass
+
+    @abstractmethod
+    async def mutate(self, uuid: UUID, fn: Callable[[T], None]) -> T:
+        pass
+
+    async def apply(self, uuid: UUID, mutation: Callable[[T], None]) -> None:
+        await self.mutate(uuid, mutation)
+
+    async def read(self, uuid: UUID, query: Callable[[T], R]) -> R:
+        return query(await self.require(uuid))
+
+    @abstractmethod
+    async def delete(self, uuid: UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def count(self) -> int:
+        pass
+
+    async def stats(self) -> dict:
+        return {"objects": await self.count()}
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncStoreAdapter(AsyncBaseStore[T], Generic[T]):
+    """
+    Exposes a synchronous `BaseStore` as an `AsyncBaseStore`.
+
+    With `offload=True` every call runs in a worker thread so disk or network
+    I/O never blocks the event loop; in-memory stores are called inline.
+    """
+
+    def __init__(self, store: BaseStore[T], offload: bool = False) -> None:
+        self.store = store
+        self.offload = offload
+
+    async def _call(self, fn, *args):
+        if self.offload:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def create(self, obj: T) -> bool:
+        return await self._call(self.store.create, obj)
+
+    async def get(self, uuid: UUID) -> T | None:
+        return await self._call(self.store.get, uuid)
+
+    async def require(self, uuid: UUID) -> T:
+        return await self._call(self.store.require, uuid)
+
+    async def update(self, uuid: UUID, obj: T) -> bool:
+        return await self._call(self.store.update, uuid, obj)
+
+    async def mutate(self, uuid: UUID, fn: Callable[[T], None]) -> T:
+        return await self._call(self.store.mutate, uuid, fn)
+
+    async def apply(self, uuid: UUID, mutation: Callable[[T], None]) -> None:
+        return await self._call(self.store.apply, uuid, mutation)
+
+    async def read(self, uuid: UUID, query: Callable[[T], R]) -> R:
+        return await self._call(self.store.read, uuid, query)
+
+    async def delete(self, uuid: UUID) -> bool:
+        return await self._call(self.store.delete, uuid)
+
+    async def count(self) -> int:
+        return await self._call(self.store.count)
+
+    async def stats(self) -> dict:
+        return await self._call(self.store.stats)
+
+    async def close(self) -> None:
+        await self._call(self.store.close)
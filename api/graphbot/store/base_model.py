@@ -1,7 +1,14 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from uuid import UUID, uuid4
 
 
 @dataclass
 class BaseModel:
-    uuid: UUID = field(default_factory=uuid4)
\ No newline at end of file
+    uuid: UUID = field(default_factory=uuid4)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BaseModel":
+        return cls(**{**data, "uuid": UUID(str(data["uuid"]))})
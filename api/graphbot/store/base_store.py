@@ -5,6 +5,7 @@ from uuid import UUID
 from .base_model import BaseModel
 
 T = TypeVar('T', bound=BaseModel)
+R = TypeVar('R')
 
 class ObjectNotFoundError(ValueError):
     pass
@@ -32,10 +33,30 @@ class BaseStore(ABC, Generic[T]):
     def mutate(self, uuid: UUID, fn: Callable[[T], None]) -> T:
         pass
 
+    def apply(self, uuid: UUID, mutation: Callable[[T], None]) -> None:
+        """
+        Like `mutate` but without returning the object, so stores that understand
+        a given `Mutation` can apply it natively instead of loading the object.
+        """
+        self.mutate(uuid, mutation)
+
+    def read(self, uuid: UUID, query: Callable[[T], R]) -> R:
+        """
+        `query(obj)` for the object `uuid`. Stores that understand a given query
+        type can answer it natively (e.g. a range of rows) without loading the object.
+        """
+        return query(self.require(uuid))
+
     @abstractmethod
     def delete(self, uuid: UUID) -> bool:
         pass
 
     @abstractmethod
     def count(self) -> int:
+        pass
+
+    def stats(self) -> dict:
+        return {"objects": self.count()}
+
+    def close(self) -> None:
         pass
\ No newline at end of file
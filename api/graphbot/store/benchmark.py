@@ -0,0 +1,65 @@
+"""
+Lock-contention micro-benchmark: MemoryStore vs ShardedMemoryStore.
+
+    python -m api.graphbot.store.benchmark [--ops 200000] [--threads 1 2 4 8]
+
+Each thread runs a chat-like mix (80 % get, 20 % mutate) over a shared pool
+of objects. Numbers are total operations per second across all threads.
+"""
+import argparse
+import random
+import threading
+import time
+
+from .base_model import BaseModel
+from .memory_store import MemoryStore
+from .sharded_memory_store import ShardedMemoryStore
+
+
+def _run(store, uuids, ops: int, threads: int, hold: float) -> float:
+    def append(obj):
+        # Simulate a little work inside the critical section.
+        if hold:
+            time.sleep(hold)
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        for _ in range(ops // threads):
+            uuid = rnd.choice(uuids)
+            if rnd.random() < 0.8:
+                store.get(uuid)
+            else:
+                store.mutate(uuid, append)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return ops / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--objects", type=int, default=1_000)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--hold-us", type=float, default=0.0, help="time spent inside each mutate (µs)")
+    args = parser.parse_args()
+
+    print(f"{'threads':>7} {'MemoryStore':>14} {'Sharded':>14} {'speedup':>8}")
+    for threads in args.threads:
+        results = []
+        for store in (MemoryStore(), ShardedMemoryStore(args.shards)):
+            objs = [BaseModel() for _ in range(args.objects)]
+            for obj in objs:
+                store.create(obj)
+            results.append(_run(store, [o.uuid for o in objs], args.ops, threads, args.hold_us / 1e6))
+
+        print(f"{threads:>7} {results[0]:>12,.0f}/s {results[1]:>12,.0f}/s {results[1] / results[0]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import math
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Generic, Callable
+from uuid import UUID
+
+from .base_store import ObjectNotFoundError, R, T
+from .sharded_memory_store import ShardedMemoryStore
+
+
+class _BoundedShard(Generic[T]):
+    __slots__ = ("objs", "touched", "lock")
+
+    def __init__(self) -> None:
+        # Least recently used first, so both LRU and TTL eviction pop from the head.
+        self.objs: OrderedDict[UUID, T] = OrderedDict()
+        self.touched: dict[UUID, float] = {}
+        self.lock = threading.Lock()
+
+
+class BoundedMemoryStore(ShardedMemoryStore[T], Generic[T]):
+    """
+    `ShardedMemoryStore` with eviction, for processes that must not grow forever.
+
+    - `max_objects`: least recently used objects are dropped past this count
+      (enforced per shard, so the bound is `ceil(max_objects / shards)` each).
+    - `idle_ttl`: objects not read or written for this many seconds are dropped.
+    - `trim`: called after every write, returns how many items it removed from
+      the object (e.g. the oldest messages of a chat past a cap).
+    - `weigh`: approximate size in bytes of an object, only used by `stats()`.
+
+    0 / None disables a bound. Unlike the parent class, reads take the shard
+    lock because they update the LRU order.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        max_objects: int = 0,
+        idle_ttl: float = 0,
+        trim: Callable[[T], int] | None = None,
+        weigh: Callable[[T], int] | None = None,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+
+        self._shards: tuple[_BoundedShard[T], ...] = tuple(_BoundedShard() for _ in range(shards))
+        self.max_objects = max_objects
+        self.idle_ttl = idle_ttl
+        self.trim = trim
+        self.weigh = weigh
+
+        self._shard_capacity = math.ceil(max_objects / shards) if max_objects > 0 else 0
+        self._counters_lock = threading.Lock()
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+        self._trimmed = 0
+
+    # BaseStore
+    def create(self, obj: T) -> bool:
+        shard = self._shard(obj.uuid)
+        with shard.lock:
+            now = time.monotonic()
+            self._expire(shard, now)
+            if obj.uuid in shard.objs:
+                return False
+
+            self._put(shard, obj, now)
+            self._evict_lru(shard)
+            return True
+
+    def get(self, uuid: UUID) -> T | None:
+        shard = self._shard(uuid)
+        with shard.lock:
+            return self._touch(shard, uuid, time.monotonic())
+
+    def update(self, uuid: UUID, obj: T) -> bool:
+        if obj.uuid != uuid:
+            raise ValueError(f"Object's UUID ({obj.uuid}) does not match the UUID argument ({uuid})")
+
+        shard = self._shard(uuid)
+        with shard.lock:
+            now = time.monotonic()
+            if self._touch(shard, uuid, now) is None:
+                return False
+
+            self._put(shard, obj, now)
+            return True
+
+    def mutate(self, uuid: UUID, fn: Callable[[T], None]) -> T:
+        shard = self._shard(uuid)
+        with shard.lock:
+            obj = self._touch(shard, uuid, time.monotonic())
+            if obj is None:
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+            fn(obj)
+            self._trim(obj)
+            return obj
+
+    def read(self, uuid: UUID, query: Callable[[T], R]) -> R:
+        shard = self._shard(uuid)
+        with shard.lock:
+            obj = self._touch(shard, uuid, time.monotonic())
+            if obj is None:
+                raise ObjectNotFoundError(f"UUID not found: {uuid}")
+
+            return query(obj)
+
+    def delete(self, uuid: UUID) -> bool:
+        shard = self._shard(uuid)
+        with shard.lock:
+            shard.touched.pop(uuid, None)
+            return shard.objs.pop(uuid, None) is not None
+
+    # Eviction
+    def sweep(self) -> int:
+        """Drop every expired object now instead of waiting for the next write to its shard."""
+        before = self._evicted_ttl
+        now = time.monotonic()
+        for shard in self._shards:
+            with shard.lock:
+                self._expire(shard, now)
+        return self._evicted_ttl - before
+
+    def stats(self) -> dict:
+        self.sweep()
+
+        approx_bytes = None
+        if self.weigh is not None:
+            approx_bytes = 0
+            for shard in self._shards:
+                with shard.lock:
+                    approx_bytes += sum(self.weigh(obj) for obj in shard.objs.values())
+
+        return {
+            "objects": self.count(),
+            "max_objects": self.max_objects or None,
+            "idle_ttl_seconds": self.idle_ttl or None,
+            "evicted_lru": self._evicted_lru,
+            "evicted_ttl": self._evicted_ttl,
+            "trimmed_items": self._trimmed,
+            "approx_bytes": approx_bytes,
+        }
+
+    def _put(self, shard: _BoundedShard[T], obj: T, now: float) -> None:
+        self._trim(obj)
+        shard.objs[obj.uuid] = obj
+        shard.objs.move_to_end(obj.uuid)
+        shard.touched[obj.uuid] = now
+
+    def _touch(self, shard: _BoundedShard[T], uuid: UUID, now: float) -> T | None:
+        obj = shard.objs.get(uuid)
+        if obj is None:
+            return None
+
+        if self.idle_ttl and now - shard.touched[uuid] > self.idle_ttl:
+            self._expire(shard, now)
+            return None
+
+        shard.objs.move_to_end(uuid)
+        shard.touched[uuid] = now
+        return obj
+
+    def _expire(self, shard: _BoundedShard[T], now: float) -> None:
+        if not self.idle_ttl:
+            return
+
+        expired = 0
+        while shard.objs:
+            uuid = next(iter(shard.objs))
+            if now - shard.touched[uuid] <= self.idle_ttl:
+                break
+            shard.objs.popitem(last=False)
+            del shard.touched[uuid]
+            expired += 1
+
+        if expired:
+            with self._counters_lock:
+                self._evicted_ttl += expired
+
+    def _evict_lru(self, shard: _BoundedShard[T]) -> None:
+        evicted = 0
+        while self._shard_capacity and len(shard.objs) > self._shard_capacity:
+            uuid, _ = shard.objs.popitem(last=False)
+            del shard.touched[uuid]
+            evicted += 1
+
+        if evicted:
+            with self._counters_lock:
+                self._evicted_lru += evicted
+
+    def _trim(self, obj: T) -> None:
+        if self.trim is None:
+            return
+
+        trimmed = self.trim(obj)
+        if trimmed:
+            with self._counters_lock:
+                self._trimmed += trimmed
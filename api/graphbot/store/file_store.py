@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from enum import Enum
+from pathlib import Path
+from typing import Generic, Callable
+from uuid import UUID
+
+from .base_store import T
+from .memory_store import MemoryStore
+from .mutation import Mutation
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FileStore(MemoryStore[T], Generic[T]):
+    """
+    `MemoryStore` made durable with an append-only write-ahead log.
+
+    Every `create` / `update` / `mutate` / `delete` appends one JSON line to
+    `<path>.wal`; `mutate` with a `Mutation` logs just the mutation, so adding a
+    message to a chat costs one small record. The log is fsynced in batches
+    (every `fsync_every` records or `fsync_interval` seconds) and compacted into
+    the snapshot at `path` every `compact_every` records. Startup loads the
+    snapshot and replays the log records newer than it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        model: type[T],
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+        compact_every: int = 10_000,
+    ) -> None:
+        super().__init__()
+
+        self.path = path
+        self.wal_path = path.with_name(path.name + ".wal")
+        self.model = model
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+
+        self._seq = 0
+        self._wal_records = 0
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._recover()
+        self._wal = open(self.wal_path, "a", encoding="utf-8")
+
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_loop, name="file-store-fsync", daemon=True)
+        self._syncer.start()
+
+    # BaseStore
+    def create(self, obj: T) -> bool:
+        with self._lock:
+            created = super().create(obj)
+            if created:
+                self._append({"op": "create", "obj": obj.to_dict()})
+            return created
+
+    def update(self, uuid: UUID, obj: T) -> bool:
+        with self._lock:
+            updated = super().update(uuid, obj)
+            if updated:
+                self._append({"op": "update", "obj": obj.to_dict()})
+            return updated
+
+    def mutate(self, uuid: UUID, fn: Callable[[T], None]) -> T:
+        with self._lock:
+            obj = super().mutate(uuid, fn)
+            if isinstance(fn, Mutation):
+                self._append({"op": "mutate", "uuid": uuid, "mutation": type(fn).__name__, "args": fn.to_dict()})
+            else:
+                # Arbitrary callables cannot be replayed: log the resulting object.
+                self._append({"op": "update", "obj": obj.to_dict()})
+            return obj
+
+    def delete(self, uuid: UUID) -> bool:
+        with self._lock:
+            deleted = super().delete(uuid)
+            if deleted:
+                self._append({"op": "delete", "uuid": uuid})
+            return deleted
+
+    # Durability
+    def flush(self) -> None:
+        with self._lock:
+            self._fsync()
+
+    def compact(self) -> None:
+        """Write every object to a fresh snapshot and start an empty log."""
+        with self._lock:
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"seq": self._seq, "objects": [o.to_dict() for o in self._objs.values()]},
+                    f,
+                    default=_json_default,
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+            self._wal.close()
+            self._wal = open(self.wal_path, "w", encoding="utf-8")
+            self._wal_records = 0
+            self._unsynced = 0
+
+    def close(self) -> None:
+        self._closed.set()
+        with self._lock:
+            self._fsync()
+            self._wal.close()
+
+    def _append(self, record: dict) -> None:
+        self._seq += 1
+        record["seq"] = self._seq
+        self._wal.write(json.dumps(record, default=_json_default, separators=(",", ":")) + "\n")
+        self._wal.flush()
+
+        self._wal_records += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._fsync()
+        if self._wal_records >= self.compact_every:
+            self.compact()
+
+    def _fsync(self) -> None:
+        if self._unsynced and not self._wal.closed:
+            os.fsync(self._wal.fileno())
+            self._unsynced = 0
+        self._last_fsync = time.monotonic()
+
+    def _sync_loop(self) -> None:
+        while not self._closed.wait(self.fsync_interval):
+            with self._lock:
+                if self._unsynced:
+                    self._fsync()
+
+    # Recovery
+    def _recover(self) -> None:
+        if self.path.exists():
+            snapshot = json.loads(self.path.read_text(encoding="utf-8") or "{}")
+            self._seq = snapshot.get("seq", 0)
+            for data in snapshot.get("objects", []):
+                obj = self.model.from_dict(data)
+                self._objs[obj.uuid] = obj
+
+        if not self.wal_path.exists():
+            return
+
+        replayed = 0
+        valid_bytes = 0
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn write at the tail after a crash: everything before it is valid.
+                    logger.warning("Truncating torn record in %s", self.wal_path)
+                    break
+                valid_bytes += len(line)
+                if record["seq"] <= self._seq:
+                    continue
+                self._apply(record)
+                self._seq = record["seq"]
+                replayed += 1
+
+        if valid_bytes < self.wal_path.stat().st_size:
+            os.truncate(self.wal_path, valid_bytes)
+
+        self._wal_records = replayed
+        logger.info("FileStore %s: %d objects, %d log records replayed", self.path, len(self._objs), replayed)
+
+    def _apply(self, record: dict) -> None:
+        match record["op"]:
+            case "create" | "update":
+                obj = self.model.from_dict(record["obj"])
+                self._objs[obj.uuid] = obj
+            case "mutate":
+                obj = self._objs.get(UUID(record["uuid"]))
+                if obj is not None:
+                    Mutation.decode(record["mutation"], record["args"])(obj)
+            case "delete":
+                self._objs.pop(UUID(record["uuid"]), None)
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, asdict
+from typing import ClassVar, Generic
+
+from .base_store import T
+
+
+@dataclass(frozen=True)
+class Mutation(Generic[T]):
+    """
+    A serializable `fn` for `BaseStore.mutate`.
+
+    Persistent stores log the mutation itself (name + fields) instead of the
+    whole mutated object. Subclasses are registered by class name.
+    """
+
+    registry: ClassVar[dict[str, type["Mutation"]]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        Mutation.registry[cls.__name__] = cls
+
+    def __call__(self, obj: T) -> None:
+        raise NotImplementedError
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Mutation":
+        return cls(**data)
+
+    @classmethod
+    def decode(cls, name: str, data: dict) -> "Mutation":
+        return cls.registry[name].from_dict(data)
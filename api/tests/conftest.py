@@ -0,0 +1,139 @@
+import asyncio
+from pathlib import Path
+from typing import Sequence
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from api.graphbot.chats.chatbot import ChatBot
+from api.graphbot.chats.chatbot.chatbot_message import ChatBotMessage
+from api.graphbot.chats.models import Chat
+from api.graphbot.store import AsyncStoreAdapter, MemoryStore
+
+
+class GatedBot(ChatBot):
+    """Answers `user_input` back once the test releases it; records the order it was asked in."""
+
+    def __init__(self) -> None:
+        self.asked: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def release(self, user_input: str) -> None:
+        self.gates.setdefault(user_input, asyncio.Event()).set()
+
+    async def reply(
+        self,
+        user_input: str,
+        chat_history: Sequence[ChatBotMessage],
+        method: str,
+        chat_uuid: UUID | None = None,
+        space: str | None = None,
+    ) -> str:
+        self.asked.append(user_input)
+        await self.gates.setdefault(user_input, asyncio.Event()).wait()
+        return f"re: {user_input}"
+
+
+@pytest.fixture
+def bot() -> GatedBot:
+    return GatedBot()
+
+
+@pytest.fixture
+def chat_store() -> AsyncStoreAdapter:
+    return AsyncStoreAdapter(MemoryStore[Chat]())
+
+
+def _write_space(root: Path) -> Path:
+    """A tiny GraphRAG output: 4 entities, 3 relationships, 3 communities on 2 levels, 2 text units."""
+    (root / "output").mkdir(parents=True)
+    (root / "settings.yaml").write_text(
+        "llm:\n  api_key: test\n  type: openai_chat\n  model: gpt-4o-mini\n"
+        "embeddings:\n  vector_store:\n    type: lancedb\n    db_uri: output/lancedb\n    container_name: default\n"
+        "  llm:\n    api_key: test\n    type: openai_embedding\n    model: text-embedding-3-small\n"
+        "storage:\n  type: file\n  base_dir: output\n"
+        "input:\n  type: file\n  file_type: text\n  base_dir: input\n  file_pattern: \".*\\\\.txt$\"\n",
+        encoding="utf-8",
+    )
+
+    def write(name: str, columns: dict) -> None:
+        pq.write_table(pa.table(columns), root / "output" / f"{name}.parquet")
+
+    entities = ["e0", "e1", "e2", "e3"]
+    titles = ["MICE", "ISS", "BONE LOSS", None]
+    write("create_final_entities", {
+        "id": entities, "human_readable_id": [0, 1, 2, 3], "title": titles,
+        "type": ["ORGANISM", "FACILITY", "CONDITION", None],
+        "description": ["Rodents flown in space", "Space station", "Loss of bone density", None],
+        "text_unit_ids": [["t0"], ["t0", "t1"], ["t1"], []],
+    })
+    # One row per node and level.
+    write("create_final_nodes", {
+        "id": entities + entities[:3], "human_readable_id": [0, 1, 2, 3, 0, 1, 2],
+        "title": titles + titles[:3], "level": [0, 0, 0, 0, 1, 1, 1],
+        "community": [0, 0, 1, None, 2, 2, None], "degree": [2, 1, 1, 0, 2, 1, 1],
+        "x": [0.0] * 7, "y": [0.0] * 7,
+    })
+    write("create_final_relationships", {
+        "id": ["r0", "r1", "r2"], "human_readable_id": [0, 1, 2],
+        "source": ["MICE", "MICE", "ISS"], "target": ["ISS", "BONE LOSS", "NOWHERE"],
+        "weight": [2.0, None, 1.0], "description": ["flown on", "suffer", "dangling"],
+        "combined_degree": [3, 3, 1],
+        "text_unit_ids": [["t0"], ["t1"], []],
+    })
+    write("create_final_communities", {
+        "id": ["c0", "c1", "c2"], "human_readable_id": [0, 1, 2], "community": [0, 1, 2],
+        "parent": [-1, -1, 0], "level": [0, 0, 1], "title": ["Community 0", "Community 1", "Community 2"],
+        "entity_ids": [["e0", "e1"], ["e2"], ["e0", "e1"]], "relationship_ids": [["r0"], [], ["r0"]],
+        "text_unit_ids": [["t0"], ["t1"], ["t0"]], "period": ["2024-01-01"] * 3, "size": [2, 1, 2],
+    })
+    write("create_final_community_reports", {
+        "id": ["p0", "p2"], "community": [0, 2], "parent": [-1, 0], "level": [0, 1],
+        "title": ["Spaceflight", "Mice on the ISS"], "summary": ["About spaceflight", "About mice"],
+        "full_content": ["# Spaceflight\n\nAbout spaceflight", "# Mice on the ISS\n\nAbout mice"],
+        "full_content_json": ["{}", "{}"], "period": ["2024-01-01"] * 2,
+        "rank": [7.5, 8.5], "rank_explanation": ["High impact", "Very high impact"],
+        "findings": [
+            [{"summary": "Mice fly", "explanation": "They were flown"}],
+            [{"summary": "Bone loss", "explanation": "Measured after flight"}, {"summary": "ISS", "explanation": "Where"}],
+        ],
+        "size": [2, 2],
+    })
+    # 1-based like graphrag's output; answers cite text units by row (`Sources (0)` is t0).
+    write("create_final_text_units", {
+        "id": ["t0", "t1"], "human_readable_id": [1, 2],
+        "text": ["Mice were flown on the ISS.", "The mice showed bone loss after the flight."],
+        "n_tokens": [7, 9], "document_ids": [["d0"], ["d0"]],
+        "entity_ids": [["e0", "e1"], ["e1", "e2"]], "relationship_ids": [["r0"], ["r1"]],
+    })
+    write("create_final_documents", {
+        "id": ["d0"], "human_readable_id": [1], "title": ["mice.txt"],
+        "text": ["Mice were flown on the ISS. The mice showed bone loss after the flight."],
+        "text_unit_ids": [["t0", "t1"]],
+    })
+    _write_vectors(root / "output" / "lancedb", "default-entity-description", entities, [
+        [1.0, 0.0, 0.0], [0.8, 0.6, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 2.0],
+    ])
+    _write_vectors(root / "output" / "lancedb", "default-community-full_content", ["p0", "p2"], [
+        [1.0, 0.0, 0.0], [0.0, 1.0, 0.0],
+    ])
+    return root
+
+
+def _write_vectors(db_uri: Path, name: str, ids: list[str], vectors: list[list[float]]) -> None:
+    """An embedding table as graphrag's LanceDB store writes it."""
+    import lancedb
+
+    lancedb.connect(str(db_uri)).create_table(name, pa.table({
+        "id": ids,
+        "text": [f"text of {i}" for i in ids],
+        "vector": pa.array(vectors, type=pa.list_(pa.float32(), len(vectors[0]))),
+        "attributes": ['{"title": "%s"}' % i for i in ids],
+    }))
+
+
+@pytest.fixture
+def graphrag_space(tmp_path) -> Path:
+    return _write_space(tmp_path / "space")
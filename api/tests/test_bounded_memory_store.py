@@ -0,0 +1,59 @@
+from api.graphbot.chats.models import ROLE, AppendMessage, Chat, ReadMessages
+from api.graphbot.store import BoundedMemoryStore
+from api.graphbot.store import bounded_memory_store
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_chat_is_evicted_first():
+    store = BoundedMemoryStore[Chat](shards=1, max_objects=2)
+    a, b, c = Chat(), Chat(), Chat()
+    store.create(a)
+    store.create(b)
+    assert store.get(a.uuid) is a        # `b` is now the least recently used
+
+    store.create(c)
+    assert store.get(b.uuid) is None
+    assert store.get(a.uuid) is a and store.get(c.uuid) is c
+    assert store.stats()["evicted_lru"] == 1
+
+
+def test_idle_chats_expire(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(bounded_memory_store.time, "monotonic", clock)
+    store = BoundedMemoryStore[Chat](shards=1, idle_ttl=60)
+    idle, active = Chat(), Chat()
+    store.create(idle)
+    store.create(active)
+
+    clock.now += 45
+    store.apply(active.uuid, AppendMessage(role=ROLE.USER, content="still here"))
+    clock.now += 30
+
+    assert store.get(idle.uuid) is None
+    assert store.get(active.uuid) is active
+    assert store.sweep() == 0
+    assert store.stats()["evicted_ttl"] == 1
+
+
+def test_trimmed_messages_keep_their_sequence_numbers():
+    store = BoundedMemoryStore[Chat](shards=1, trim=lambda chat: chat.trim_messages(3))
+    chat = Chat()
+    store.create(chat)
+    for i in range(5):
+        store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+
+    page = store.read(chat.uuid, ReadMessages(limit=2))
+    assert (page.start, page.end, page.first) == (3, 5, 2)
+    assert [m.content for m in page.messages] == ["m3", "m4"]
+
+    page = store.read(chat.uuid, ReadMessages(limit=2, before=page.next_before))
+    assert [m.content for m in page.messages] == ["m2"]
+    assert page.next_before is None
+    assert store.stats()["trimmed_items"] == 2
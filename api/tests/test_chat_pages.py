@@ -0,0 +1,43 @@
+import asyncio
+from uuid import UUID
+
+import httpx
+from fastapi import FastAPI
+
+from api.graphbot.chats.models import ROLE, AppendMessage, Chat
+from api.graphbot.chats.router import router as chats_router
+from api.graphbot.chats.service import ChatService
+from api.graphbot.store import AsyncStoreAdapter, BoundedMemoryStore
+
+
+def test_history_pages_by_sequence_number(bot):
+    store = BoundedMemoryStore[Chat](shards=1, trim=lambda chat: chat.trim_messages(5))
+    app = FastAPI()
+    app.include_router(chats_router, prefix="/chats")
+    app.state.chat_service = ChatService(AsyncStoreAdapter(store), bot)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            chat_uuid = UUID((await client.get("/chats")).json()["chat_uuid"])
+            for i in range(7):
+                store.apply(chat_uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+
+            chat = (await client.get(f"/chats/{chat_uuid}", params={"limit": 2})).json()
+            assert [(m["seq"], m["content"]) for m in chat["messages"]] == [(5, "m5"), (6, "m6")]
+            assert (chat["next_before"], chat["end"]) == (5, 7)
+
+            # Back to the oldest message kept: m0 and m1 were trimmed.
+            seen = chat["messages"]
+            before = chat["next_before"]
+            while before is not None:
+                page = (await client.get(
+                    f"/chats/{chat_uuid}/messages", params={"before": before, "limit": 2},
+                )).json()
+                seen = page["messages"] + seen
+                before = page["next_before"]
+            assert [m["seq"] for m in seen] == [2, 3, 4, 5, 6]
+
+            assert (await client.get(f"/chats/{chat_uuid}/messages", params={"limit": 0})).status_code == 422
+
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.graphbot.chats.router import router as chats_router
+from api.graphbot.chats.service import ChatQueueFullError, ChatQueueTimeoutError, ChatService
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_messages_are_answered_in_arrival_order(bot, chat_store):
+    async def main():
+        service = ChatService(chat_store, bot, max_queue_depth=4)
+        chat = await service.create_chat()
+        positions = {}
+
+        def send(text):
+            return asyncio.create_task(service.reply_to_user(
+                chat.uuid, text, "local", on_queued=lambda ticket, position: positions.setdefault(text, position),
+            ))
+
+        tasks = [send(text) for text in ("a", "b", "c")]
+        await _settle()
+        assert bot.asked == ["a"]
+        assert service.queue_status(chat.uuid) == {"processing": True, "waiting": 2, "max_waiting": 4}
+
+        for text in ("c", "b", "a"):            # released out of order, still answered in order
+            bot.release(text)
+        answers = await asyncio.gather(*tasks)
+
+        messages = (await service.require_chat(chat.uuid)).messages
+        return answers, positions, [m.content for m in messages], service
+
+    answers, positions, contents, service = asyncio.run(main())
+    assert answers == ["re: a", "re: b", "re: c"]
+    assert positions == {"a": 0, "b": 1, "c": 2}
+    assert contents == ["a", "re: a", "b", "re: b", "c", "re: c"]
+    assert not service._queues
+
+
+def test_full_queue_and_deadline(bot, chat_store):
+    async def main():
+        service = ChatService(chat_store, bot, max_queue_depth=1, queue_deadline=0.05)
+        chat = await service.create_chat()
+
+        first = asyncio.create_task(service.reply_to_user(chat.uuid, "a", "local"))
+        await _settle()
+        second = asyncio.create_task(service.reply_to_user(chat.uuid, "b", "local"))
+        await _settle()
+
+        with pytest.raises(ChatQueueFullError) as full:
+            await service.reply_to_user(chat.uuid, "c", "local")
+        assert full.value.position == 2
+
+        # Background jobs skip the depth limit.
+        tickets = []
+        job = asyncio.create_task(service.reply_to_user(
+            chat.uuid, "d", "local", wait=True, on_queued=lambda ticket, position: tickets.append(ticket),
+        ))
+        await _settle()
+
+        with pytest.raises(ChatQueueTimeoutError):
+            await second
+        assert service.queue_position(chat.uuid, tickets[0]) == 1
+
+        bot.release("a")
+        bot.release("d")
+        assert await first == "re: a"
+        assert await job == "re: d"
+        assert service.queue_position(chat.uuid, tickets[0]) is None
+
+    asyncio.run(main())
+
+
+def test_router_reports_positions_429_and_503(bot, chat_store):
+    app = FastAPI()
+    app.include_router(chats_router, prefix="/chats")
+    app.state.chat_service = ChatService(chat_store, bot, max_queue_depth=1, queue_deadline=0.2)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            chat_uuid = (await client.get("/chats")).json()["chat_uuid"]
+            url = f"/chats/{chat_uuid}/messages"
+
+            def post(text):
+                return asyncio.create_task(client.post(url, json={"message": text, "metodo": "local"}))
+
+            first = post("a")
+            await asyncio.sleep(0.02)
+            second = post("b")
+            await asyncio.sleep(0.02)
+
+            full = await client.post(url, json={"message": "c", "metodo": "local"})
+            assert full.status_code == 429
+            assert full.headers["Retry-After"] == "5" and full.headers["X-Queue-Position"] == "2"
+
+            timed_out = await second
+            assert timed_out.status_code == 503
+
+            bot.release("a")
+            answered = await first
+            assert answered.status_code == 200
+            assert answered.json() == {"answer": "re: a", "queue_position": 0}
+            assert answered.headers["X-Queue-Position"] == "0"
+
+            queue = (await client.get(f"/chats/{chat_uuid}/queue")).json()
+            assert queue == {"processing": False, "waiting": 0, "max_waiting": 1}
+
+    asyncio.run(main())
@@ -0,0 +1,27 @@
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.communities import CommunityHierarchy
+
+
+def test_hierarchy_orders_rollups_and_detail(graphrag_space):
+    hierarchy = KnowledgeIndex(graphrag_space).load().derived("communities", CommunityHierarchy)
+
+    total, page = hierarchy.communities()
+    assert total == 3
+    # Highest rated first, communities without a report last.
+    assert [c.community for c in page] == [2, 0, 1]
+    assert [c.community for c in hierarchy.communities(sort="size")[1]] == [2, 0, 1]
+    assert hierarchy.communities(level=0, min_rating=8)[0] == 0
+    assert hierarchy.communities(level=7) == (0, [])
+
+    level0 = hierarchy.rollups[0]
+    assert (level0.communities, level0.reports, level0.entities) == (2, 1, 3)
+    assert (level0.mean_rating, level0.max_rating) == (7.5, 7.5)
+    assert hierarchy.summary(1).title == "Community 1" and hierarchy.summary(1).rating is None
+
+    detail = hierarchy.detail(2)
+    assert detail.community.title == "Mice on the ISS" and detail.community.parent == 0
+    assert [c.community for c in detail.path] == [0]
+    assert [f.summary for f in detail.findings] == ["Bone loss", "ISS"]
+    assert detail.rating_explanation == "Very high impact"
+    assert [c.community for c in hierarchy.detail(0).children] == [2]
+    assert hierarchy.detail(99) is None
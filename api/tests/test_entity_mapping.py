@@ -0,0 +1,120 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from graphrag.model.entity import Entity
+from graphrag.query.context_builder.entity_extraction import map_query_to_entities
+
+from api.graphbot.chats.chatbot.graphrag_bot import GraphRAGBot
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.conversation import ConversationContext, ConversationContextBuilder
+from api.graphbot.knowledge.vector_index import InMemoryVectorStore, VectorIndex
+
+TITLES = ["MICE", "ISS", "BONE LOSS", "MUSCLE"]
+
+
+class _Embedder:
+    """Points a query at the entities it names; at MICE when it names none."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed(self, text: str) -> list[float]:
+        self.calls += 1
+        named = [float(title.lower() in text) for title in TITLES]
+        return named if any(named) else [1.0, 0.0, 0.0, 0.0]
+
+
+class _LocalContext:
+    """graphrag's `LocalSearchMixedContext`, recording how it was asked."""
+
+    def __init__(self, entities: dict[str, Entity]) -> None:
+        self.entities = entities
+        self.text_embedder = _Embedder()
+        self.calls = []
+
+    def build_context(self, query, conversation_history=None, **kwargs):
+        self.calls.append(kwargs)
+        return f"context {len(self.calls)}"
+
+
+@pytest.fixture
+def entities() -> dict[str, Entity]:
+    return {str(i): Entity(id=str(i), short_id=str(i), title=title) for i, title in enumerate(TITLES)}
+
+
+@pytest.fixture
+def store() -> InMemoryVectorStore:
+    ids = [str(i) for i in range(len(TITLES))]
+    vectors = np.eye(len(TITLES), dtype=np.float32) + 0.1
+    return InMemoryVectorStore(VectorIndex(ids, TITLES, [{} for _ in ids], vectors))
+
+
+def _titles(found: list[Entity]) -> list[str]:
+    return [entity.title for entity in found]
+
+
+def test_mentioned_entities_are_not_matched_twice(entities, store):
+    # How `GraphRAGSearch.local_search` passes the entities named in the query.
+    embedder = _Embedder()
+    found = map_query_to_entities(
+        "what happens to mice?", store, embedder, entities,
+        include_entity_names=["MICE"], exclude_entity_names=["MICE"], k=2,
+    )
+    assert _titles(found)[0] == "MICE"
+    assert _titles(found).count("MICE") == 1
+    assert embedder.calls == 1
+
+
+def test_no_embedding_call_when_mentions_fill_every_slot(entities, store):
+    embedder = _Embedder()
+    found = map_query_to_entities(
+        "mice on the iss", store, embedder, entities,
+        include_entity_names=["MICE", "ISS"], exclude_entity_names=["MICE", "ISS"], k=0,
+    )
+    assert _titles(found) == ["MICE", "ISS"]
+    assert embedder.calls == 0
+
+
+def test_conversation_builder_skips_the_embedding_when_slots_are_full(entities, store):
+    inner = _LocalContext(entities)
+    builder = ConversationContextBuilder(inner, ConversationContext(), store.index)
+    assert builder.build_context("mice", include_entity_names=["MICE"], top_k_mapped_entities=0) == "context 1"
+    assert inner.text_embedder.calls == 0
+    assert inner.calls == [{"include_entity_names": ["MICE"], "top_k_mapped_entities": 0}]
+
+
+def test_context_is_reused_while_the_mapped_entities_stay_the_same(entities, store):
+    inner = _LocalContext(entities)
+    conversation = ConversationContext()
+    builder = ConversationContextBuilder(inner, conversation, store.index)
+
+    assert builder.build_context("what happens to mice?", top_k_mapped_entities=1) == "context 1"
+    assert builder.build_context("and in space?", top_k_mapped_entities=1) == "context 1"
+    assert inner.calls == [{"include_entity_names": ["MICE"], "top_k_mapped_entities": 0}]
+    assert (conversation.reused_contexts, inner.text_embedder.calls) == (1, 2)
+
+    # Another entity selected, or another one named in the query: built again.
+    assert builder.build_context("what about bone loss?", top_k_mapped_entities=1) == "context 2"
+    assert inner.calls[-1]["include_entity_names"] == ["BONE LOSS"]
+    assert builder.build_context(
+        "what about bone loss?", include_entity_names=["ISS"], top_k_mapped_entities=1,
+    ) == "context 3"
+    assert inner.calls[-1]["include_entity_names"] == ["ISS", "BONE LOSS"]
+    assert conversation.reused_contexts == 1
+
+
+def test_reload_starts_every_conversation_over(graphrag_space, entities, store):
+    bot = GraphRAGBot(KnowledgeIndex(graphrag_space).load())
+    chat_uuid = uuid4()
+    inner = _LocalContext(entities)
+    ConversationContextBuilder(inner, bot.conversations.get(chat_uuid), store.index).build_context(
+        "mice", top_k_mapped_entities=1,
+    )
+
+    # The same chat and question after a new output was loaded: nothing carried over.
+    bot.reload()
+    conversation = bot.conversations.get(chat_uuid)
+    assert conversation.context is None and conversation.turns == 0
+    builder = ConversationContextBuilder(inner, conversation, store.index)
+    assert builder.build_context("mice", top_k_mapped_entities=1) == "context 2"
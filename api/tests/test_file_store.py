@@ -0,0 +1,103 @@
+from uuid import uuid4
+
+import pytest
+
+from api.graphbot.chats.models import ROLE, AppendMessage, Chat, ReadMessages
+from api.graphbot.store import FileStore, ObjectNotFoundError
+
+
+def _open(path, **kwargs) -> FileStore[Chat]:
+    return FileStore[Chat](path, Chat, **kwargs)
+
+
+def _contents(store: FileStore[Chat], chat: Chat) -> list[str]:
+    return [m.content for m in store.require(chat.uuid).messages]
+
+
+def test_reopen_replays_the_log(tmp_path):
+    path = tmp_path / "chats.json"
+    store = _open(path)
+    chat, gone = Chat(), Chat()
+    assert store.create(chat) and store.create(gone)
+    for i in range(3):
+        store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+    assert store.delete(gone.uuid)
+    store.close()
+
+    assert not path.exists()    # nothing compacted yet: everything comes from the log
+    store = _open(path)
+    assert _contents(store, chat) == ["m0", "m1", "m2"]
+    assert store.get(gone.uuid) is None
+    assert store.count() == 1
+    store.close()
+
+
+def test_replay_after_compaction_skips_records_in_the_snapshot(tmp_path):
+    path = tmp_path / "chats.json"
+    store = _open(path, compact_every=4)
+    chat = Chat()
+    store.create(chat)
+    for i in range(6):
+        store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+    store.close()
+
+    # Compacted at the 4th record, 3 records left in the log after it.
+    assert path.exists()
+    assert len(store.wal_path.read_text().splitlines()) == 3
+
+    store = _open(path)
+    assert _contents(store, chat) == [f"m{i}" for i in range(6)]
+    store.compact()
+    store.close()
+
+    assert store.wal_path.read_text() == ""
+    store = _open(path)
+    assert _contents(store, chat) == [f"m{i}" for i in range(6)]
+    store.close()
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    path = tmp_path / "chats.json"
+    store = _open(path)
+    chat = Chat()
+    store.create(chat)
+    store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content="kept"))
+    store.close()
+
+    valid = store.wal_path.stat().st_size
+    with open(store.wal_path, "a", encoding="utf-8") as f:
+        f.write('{"op":"mutate","uuid":')      # crash in the middle of a write
+
+    store = _open(path)
+    assert _contents(store, chat) == ["kept"]
+    assert store.wal_path.stat().st_size == valid
+    store.apply(chat.uuid, AppendMessage(role=ROLE.ASSISTANT, content="after"))
+    store.close()
+
+    store = _open(path)
+    assert _contents(store, chat) == ["kept", "after"]
+    store.close()
+
+
+def test_paging_over_a_replayed_chat(tmp_path):
+    path = tmp_path / "chats.json"
+    store = _open(path)
+    chat = Chat()
+    store.create(chat)
+    for i in range(5):
+        store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+    store.close()
+
+    store = _open(path)
+    page = store.read(chat.uuid, ReadMessages(limit=2))
+    assert (page.start, page.end, page.first) == (3, 5, 0)
+    assert [m.content for m in page.messages] == ["m3", "m4"]
+
+    pages = [page]
+    while pages[-1].next_before is not None:
+        pages.append(store.read(chat.uuid, ReadMessages(limit=2, before=pages[-1].next_before)))
+    assert [m.content for p in reversed(pages) for m in p.messages] == [f"m{i}" for i in range(5)]
+
+    with pytest.raises(ObjectNotFoundError):
+        store.read(uuid4(), ReadMessages(limit=2))
+    store.close()
@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+import pytest
+
+from api.graphbot.graph.encoding import _HEADER, BINARY_MAGIC, FLAG_DESCRIPTIONS, to_binary, to_json
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.graph import KnowledgeGraph
+
+MICE, ISS, BONE_LOSS, UNTITLED = range(4)
+
+
+@pytest.fixture
+def graph(graphrag_space) -> KnowledgeGraph:
+    # r2 points at an entity that does not exist: only r0 (weight 2) and r1 (no weight) are edges.
+    return KnowledgeIndex(graphrag_space).load().derived("graph", KnowledgeGraph)
+
+
+def _decode(data: bytes) -> dict:
+    """`to_binary` read back the way the frontend maps it, into `to_json`'s shape."""
+    magic, _version, level, flags, n, e, s, b = _HEADER.unpack_from(data)
+    assert magic == BINARY_MAGIC
+    pos = _HEADER.size
+
+    def take(dtype: str, count: int) -> np.ndarray:
+        nonlocal pos
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=pos)
+        pos += array.nbytes
+        return array
+
+    community, degree = take("<i4", n), take("<i4", n)
+    source, target, weight = take("<u4", e), take("<u4", e), take("<f4", e)
+    offsets = take("<u4", s + 1)
+    assert pos % 4 == 0 and len(data) == pos + b + (-b % 4)
+    strings = [data[pos + offsets[i]:pos + offsets[i + 1]].decode() for i in range(s)]
+    ids, labels, edge_ids, descriptions = strings[:n], strings[n:2 * n], strings[2 * n:2 * n + e], strings[2 * n + e:]
+
+    nodes = [
+        {"id": ids[i], "label": labels[i], "community": int(community[i]), "level": level, "degree": int(degree[i])}
+        for i in range(n)
+    ]
+    edges = [
+        {"id": edge_ids[i], "source": ids[source[i]], "target": ids[target[i]], "weight": float(weight[i])}
+        for i in range(e)
+    ]
+    if flags & FLAG_DESCRIPTIONS:
+        for edge, description in zip(edges, descriptions):
+            edge["description"] = description
+    return {"nodes": nodes, "edges": edges}
+
+
+@pytest.mark.parametrize("level", [0, 1])
+@pytest.mark.parametrize("descriptions", [True, False])
+def test_binary_encoding_carries_the_json_graph(graph, level, descriptions):
+    view = graph.select(level=level)
+    decoded = _decode(to_binary(graph, view, descriptions=descriptions))
+    assert decoded == json.loads(to_json(graph, view, descriptions=descriptions))
+    assert [n["label"] for n in decoded["nodes"]] == ["MICE", "ISS", "BONE LOSS", ""]
+    assert [(e["id"], e["source"], e["target"]) for e in decoded["edges"]] == [("r0", "e0", "e1"), ("r1", "e0", "e2")]
+
+
+def test_filters_select_nodes_and_the_edges_between_them(graph):
+    assert graph.communities[0].tolist() == [0, 0, 1, -1]
+    assert graph.communities[1].tolist() == [2, 2, -1, -1]
+
+    view = graph.select(min_degree=1)
+    assert view.nodes.tolist() == [MICE, ISS, BONE_LOSS] and view.edges.tolist() == [0, 1]
+    view = graph.select(community=0)
+    assert view.nodes.tolist() == [MICE, ISS] and graph.edge_ids[view.edges].tolist() == ["r0"]
+    assert (view.source.tolist(), view.target.tolist()) == ([0], [1])
+    view = graph.select(level=1, community=2)
+    assert view.nodes.tolist() == [MICE, ISS] and view.community.tolist() == [2, 2]
+
+    # The highest degree nodes, the heaviest edges.
+    assert graph.select(max_nodes=1).nodes.tolist() == [MICE]
+    assert graph.edge_ids[graph.select(max_edges=1).edges].tolist() == ["r0"]
+    with pytest.raises(ValueError):
+        graph.select(level=7)
+
+
+def test_adjacency_rows_are_sorted_heaviest_first(graph):
+    adjacency = graph.adjacency
+    assert adjacency.indptr.tolist() == [0, 2, 3, 4, 4]
+    assert adjacency.neighbors[adjacency.row(MICE)].tolist() == [ISS, BONE_LOSS]
+    assert adjacency.weights[adjacency.row(MICE)].tolist() == [2.0, 0.0]
+    assert adjacency.neighbors[adjacency.row(BONE_LOSS)].tolist() == [MICE]
+    assert sorted(adjacency.expand(np.array([ISS, BONE_LOSS, UNTITLED])).tolist()) == [MICE, MICE]
+
+    neighbors, edges, weights = graph.top_neighbors(MICE, limit=1)
+    assert (neighbors.tolist(), graph.edge_ids[edges].tolist(), weights.tolist()) == ([ISS], ["r0"], [2.0])
+
+
+def test_shortest_path_prefers_strong_relationships(graph):
+    path = graph.shortest_path(ISS, BONE_LOSS)
+    assert path.nodes.tolist() == [ISS, MICE, BONE_LOSS]
+    assert graph.edge_ids[path.edges].tolist() == ["r0", "r1"]
+    # 1 / weight; a relationship without weight is as long as it gets.
+    assert path.cost == pytest.approx(0.5 + 1e6)
+
+    assert graph.shortest_path(MICE, UNTITLED) is None
+    same = graph.shortest_path(ISS, ISS)
+    assert same.nodes.tolist() == [ISS] and same.cost == 0
+
+
+def test_ego_network_grows_by_hops_up_to_max_nodes(graph):
+    assert graph.ego(ISS).tolist() == [MICE, ISS]
+    assert graph.ego(ISS, hops=2).tolist() == [MICE, ISS, BONE_LOSS]
+    assert graph.ego(BONE_LOSS, hops=2, max_nodes=2).tolist() == [MICE, BONE_LOSS]
+    assert graph.ego(UNTITLED, hops=3).tolist() == [UNTITLED]
@@ -0,0 +1,124 @@
+import json
+import logging
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from graphrag.index.create_pipeline_config import create_pipeline_config
+from graphrag.index.typing import PipelineRunResult
+
+from api.graphbot.knowledge import indexing
+from api.graphbot.knowledge.indexing import (
+    STATE_FILENAME, IndexingDriver, IndexingError, IndexingMeter, IndexRunState, ThreadTuner, WorkflowMetrics,
+    _HttpRequestFilter, _merge_stats,
+)
+from api.graphbot.knowledge.ingest import LOCK_FILE, VERSIONS_DIR, IngestError, _exclusive
+
+
+@pytest.mark.parametrize("threads, requests, rate_limited, expected", [
+    (8, 0, 0, 8),           # no LLM calls: nothing to learn from
+    (8, 10, 1, 4),          # over the tolerance: halved
+    (1, 10, 5, 1),
+    (8, 100, 1, 8),         # within the tolerance, but not clean enough to grow
+    (8, 10, 0, 10),         # clean and every thread busy: grown by a quarter
+    (16, 10, 0, 16),        # clean, but fewer calls than threads
+    (64, 100, 0, 64),
+])
+def test_thread_tuner_halves_on_rate_limits_and_grows_when_busy(threads, requests, rate_limited, expected):
+    metrics = WorkflowMetrics("extract_graph", threads, llm_requests=requests, rate_limited=rate_limited)
+    assert ThreadTuner(min_threads=1, max_threads=64).update(threads, metrics) == expected
+
+
+def _http_record(status: int) -> logging.LogRecord:
+    # As httpx logs every response.
+    return logging.LogRecord(
+        "httpx", logging.INFO, __file__, 0, 'HTTP Request: %s %s "%s %d %s"',
+        ("POST", "https://api.openai.com/v1/chat/completions", "HTTP/1.1", status, "-"), None,
+    )
+
+
+def test_http_filter_counts_requests_and_shows_only_failures():
+    meter = IndexingMeter(documents=2)
+    http_filter = _HttpRequestFilter(meter)
+    assert not http_filter.filter(_http_record(200))      # no workflow running: not counted
+
+    meter.start("extract_graph", 4)
+    shown = [http_filter.filter(_http_record(status)) for status in (200, 429, 200, 500)]
+    other = logging.LogRecord("httpx", logging.INFO, __file__, 0, "Retrying", (), None)
+    assert http_filter.filter(other)
+
+    metrics = meter.finish()
+    assert shown == [False, True, False, True]
+    assert (metrics.llm_requests, metrics.rate_limited) == (4, 1)
+
+
+def test_stats_of_every_segment_are_kept(tmp_path):
+    state = IndexRunState(run_id="r", num_threads=4)
+    for workflows in ({"create_base_text_units": {"overall": 1.0}}, {"extract_graph": {"overall": 9.0}}):
+        (tmp_path / "stats.json").write_text(json.dumps({"workflows": workflows}), encoding="utf-8")
+        _merge_stats(tmp_path, state)
+    assert list(state.stats) == ["create_base_text_units", "extract_graph"]
+
+    state.save(tmp_path / STATE_FILENAME)
+    assert IndexRunState.load(tmp_path / STATE_FILENAME) == state
+    assert IndexRunState.load(tmp_path / "missing.json") is None
+
+
+def _pipeline(fail: str | None, ran: list[str], found: list[list[str]]):
+    """graphrag's resume run: skips the workflows whose table exists, writes one table per workflow."""
+    async def iter_index(config, cache=None, is_resume_run=False, callbacks=None, progress_logger=None, dataset=None):
+        output = Path(config.storage.base_dir)
+        found.append(sorted(p.stem for p in output.glob("*.parquet")))
+        for workflow in (w.name for w in create_pipeline_config(config).workflows):
+            if workflow in config.skip_workflows or (output / f"{workflow}.parquet").exists():
+                continue
+            ran.append(workflow)
+            if workflow == fail:
+                yield PipelineRunResult(workflow, None, [RuntimeError("LLM down")])
+                return
+            pq.write_table(pa.table({"workflow": [workflow]}), output / f"{workflow}.parquet")
+            yield PipelineRunResult(workflow, None, None)
+
+    return iter_index
+
+
+def test_resumed_run_is_built_aside_and_published(graphrag_space, monkeypatch):
+    (graphrag_space / "input").mkdir()
+    (graphrag_space / "input" / "mice.txt").write_text("Mice were flown on the ISS.", encoding="utf-8")
+    output, versions = graphrag_space / "output", graphrag_space / VERSIONS_DIR
+    served = (output / "create_final_entities.parquet").read_bytes()
+
+    ran, found = [], []
+    monkeypatch.setattr(indexing, "iter_index", _pipeline("extract_graph", ran, found))
+    with pytest.raises(IndexingError):
+        IndexingDriver(graphrag_space).run()
+
+    # The served output is untouched; the run is left in its staging version.
+    assert not output.is_symlink() and (output / "create_final_entities.parquet").read_bytes() == served
+    [staging] = versions.glob(".*.tmp")
+    state = IndexRunState.load(staging / STATE_FILENAME)
+    assert state.completed == ["create_final_documents", "create_base_text_units", "create_final_text_units"]
+
+    # A table of a workflow the run has not completed, as an interrupted workflow may leave.
+    pq.write_table(pa.table({"workflow": ["stale"]}), staging / "create_final_entities.parquet")
+    ran.clear()
+    monkeypatch.setattr(indexing, "iter_index", _pipeline(None, ran, found))
+    resumed = IndexingDriver(graphrag_space, resume=True).run()
+
+    assert found[-1] == sorted(state.completed)          # the stale table was deleted first
+    assert ran[0] == "extract_graph" and "create_base_text_units" not in ran
+    assert resumed.run_id == state.run_id and len(resumed.completed) == 11
+    assert output.resolve() == versions / state.run_id
+    assert pq.read_table(output / "create_final_entities.parquet")["workflow"].to_pylist() == ["create_final_entities"]
+    assert (versions / "initial" / "create_final_entities.parquet").read_bytes() == served
+    assert not list(versions.glob(".*.tmp"))
+
+
+def test_driver_refuses_to_run_during_an_ingestion(graphrag_space):
+    versions = graphrag_space / VERSIONS_DIR
+    versions.mkdir()
+    with _exclusive(versions / LOCK_FILE):
+        with pytest.raises(IngestError):
+            IndexingDriver(graphrag_space).run()
+    assert not list(versions.glob(".*.tmp"))
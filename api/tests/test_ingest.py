@@ -0,0 +1,274 @@
+import asyncio
+import os
+import re
+import shutil
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import FastAPI
+from graphrag.config.load_config import load_config
+from graphrag.index.input.factory import create_input
+from graphrag.index.config.embeddings import entity_description_embedding
+
+from api.graphbot.chats.chatbot import DummyBot
+from api.graphbot.ingest.models import INGEST_STATUS
+from api.graphbot.ingest.router import router as ingest_router
+from api.graphbot.ingest.service import IngestInProgressError, IngestService
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.ingest import (
+    LOCK_FILE, VERSIONS_DIR, IngestError, IngestPlan, IngestResult, Ingestor, _exclusive,
+)
+
+
+class _Ingestor:
+    """Plans from the input folder; `run` blocks until released."""
+
+    def __init__(self, input_dir, changed=()) -> None:
+        self._input = input_dir
+        self.changed = list(changed)
+        self.runs = 0
+        self.release = threading.Event()
+
+    def input_dir(self):
+        return self._input
+
+    def plan(self) -> IngestPlan:
+        time.sleep(0.05)            # leaves room for a second request to interleave
+        return IngestPlan(new=sorted(p.name for p in self._input.iterdir()), changed=self.changed)
+
+    def run(self, plan):
+        self.runs += 1
+        self.release.wait(5)
+        return IngestResult(plan)
+
+
+class _Index:
+    def reload(self) -> bool:
+        return False
+
+
+def _service(tmp_path, **kwargs) -> tuple[IngestService, _Ingestor]:
+    ingestor = _Ingestor(tmp_path, **kwargs)
+    return IngestService(ingestor, _Index(), DummyBot()), ingestor
+
+
+def test_concurrent_starts_run_one_ingestion(tmp_path):
+    service, ingestor = _service(tmp_path)
+
+    async def main():
+        results = await asyncio.gather(
+            service.start({"a.txt": "A"}), service.start({"b.txt": "B"}), return_exceptions=True,
+        )
+        ingestor.release.set()
+        await service._task
+        return results
+
+    results = asyncio.run(main())
+    assert sum(isinstance(r, IngestInProgressError) for r in results) == 1
+    assert ingestor.runs == 1
+    assert service.last.status == INGEST_STATUS.DONE
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt"]
+
+
+def test_refused_plan_removes_the_written_documents(tmp_path):
+    (tmp_path / "old.txt").write_text("kept", encoding="utf-8")
+    service, ingestor = _service(tmp_path, changed=["old.txt"])
+
+    with pytest.raises(IngestError):
+        asyncio.run(service.start({"new.txt": "new", "old.txt": "kept"}))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["old.txt"]
+    assert ingestor.runs == 0
+
+
+def test_one_ingestion_per_root_across_processes(tmp_path):
+    with _exclusive(tmp_path / LOCK_FILE):
+        with pytest.raises(IngestError):
+            with _exclusive(tmp_path / LOCK_FILE):
+                pass
+    with _exclusive(tmp_path / LOCK_FILE):
+        pass
+
+
+@pytest.mark.parametrize("enabled, token, headers, expected", [
+    (False, "", {}, 403),
+    (True, "s3cret", {}, 401),
+    (True, "s3cret", {"Authorization": "Bearer nope"}, 401),
+    (True, "s3cret", {"Authorization": "Bearer s3cret"}, 202),
+    (True, "", {}, 202),
+])
+def test_post_ingest_is_opt_in(tmp_path, enabled, token, headers, expected):
+    service, ingestor = _service(tmp_path)
+    ingestor.release.set()
+    app = FastAPI()
+    app.include_router(ingest_router, prefix="/ingest")
+    app.state.settings = SimpleNamespace(ingest_enabled=enabled, ingest_token=token)
+    app.state.ingest_service = service
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/ingest", json={"documents": [{"name": "a.txt", "text": "A"}]}, headers=headers)
+            if service._task is not None:
+                await service._task
+            return response
+
+    assert asyncio.run(main()).status_code == expected
+    assert (tmp_path / "a.txt").exists() == (expected == 202)
+
+
+class _ReloadCounter(DummyBot):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reloads = 0
+
+    def reload(self) -> None:
+        self.reloads += 1
+
+
+def _publish_by_hand(root, version: str, drop_entities: int = 0) -> None:
+    """What another process's `Ingestor.run` leaves behind: a new version and the link moved to it."""
+    versions, output = root / VERSIONS_DIR, root / "output"
+    if not output.is_symlink():
+        versions.mkdir()
+        os.replace(output, versions / "initial")
+        output.symlink_to(versions / "initial", target_is_directory=True)
+    shutil.copytree(output.resolve(), versions / version, ignore=shutil.ignore_patterns("arrow", "vector_index"))
+    entities = pq.read_table(versions / version / "create_final_entities.parquet")
+    pq.write_table(entities.slice(0, entities.num_rows - drop_entities), versions / version / "create_final_entities.parquet")
+
+    link = root / ".output.link"
+    link.symlink_to(versions / version, target_is_directory=True)
+    os.replace(link, output)
+
+
+def test_every_process_reloads_a_version_published_elsewhere(graphrag_space):
+    _publish_by_hand(graphrag_space, "v1")
+    index = KnowledgeIndex(graphrag_space).load()
+    versions = graphrag_space / VERSIONS_DIR
+    # Tables and vectors both come from the version loaded, not through the link.
+    assert index.config.storage.base_dir == str(versions / "v1")
+    assert index.config.embeddings.vector_store["db_uri"] == str(versions / "v1" / "lancedb")
+    assert len(index.vectors(entity_description_embedding)) == 4
+
+    chatbot = _ReloadCounter()
+    service = IngestService(_Ingestor(graphrag_space), index, chatbot, watch_interval=0.01)
+
+    async def main():
+        service.watch()
+        await asyncio.sleep(0.05)
+        assert not index.output_moved() and chatbot.reloads == 0
+
+        _publish_by_hand(graphrag_space, "v2", drop_entities=1)
+        assert index.output_moved()
+        for _ in range(100):
+            if chatbot.reloads:
+                break
+            await asyncio.sleep(0.01)
+        await service.stop()
+
+    asyncio.run(main())
+    assert chatbot.reloads == 1 and not index.output_moved()
+    assert index.config.embeddings.vector_store["db_uri"] == str(versions / "v2" / "lancedb")
+    assert index.arrow("create_final_entities").num_rows == 3
+
+
+def test_prune_keeps_versions_that_were_current_recently(tmp_path):
+    versions = tmp_path / VERSIONS_DIR
+    for age, name in ((3600, "a"), (2400, "b"), (60, "c"), (0, "d")):
+        (versions / name).mkdir(parents=True)
+        os.utime(versions / name, (time.time() - age, time.time() - age))
+    output = tmp_path / "output"
+    output.symlink_to(versions / "d", target_is_directory=True)
+
+    Ingestor(tmp_path, keep_versions=1, prune_after=600)._prune(output, versions)
+    # `c` stopped being current a minute ago: another process may still be reading it.
+    assert sorted(p.name for p in versions.iterdir()) == ["c", "d"]
+
+
+def _write_inputs(root, documents: dict[str, str]) -> dict[str, str]:
+    """Writes input files; returns graphrag's document id of each, by title."""
+    (root / "input").mkdir(exist_ok=True)
+    for name, text in documents.items():
+        (root / "input" / name).write_text(text, encoding="utf-8")
+    config = load_config(root)
+    dataset = asyncio.run(create_input(config.input, root_dir=config.root_dir))
+    return dict(zip(dataset["title"], dataset["id"]))
+
+
+def _write_documents(output, rows: dict[str, str]) -> None:
+    pq.write_table(pa.table({
+        "id": list(rows.values()), "human_readable_id": list(range(1, len(rows) + 1)), "title": list(rows),
+        "text": [""] * len(rows), "text_unit_ids": [[] for _ in rows],
+    }), output / "create_final_documents.parquet")
+
+
+async def _merge_new_documents(config, staging) -> None:
+    """Stands in for graphrag's update run: the current output plus every input document."""
+    shutil.copytree(config.storage.base_dir, staging, ignore=shutil.ignore_patterns("arrow", "vector_index"))
+    dataset = await create_input(config.input, root_dir=config.root_dir)
+    _write_documents(staging, dict(zip(dataset["title"], dataset["id"])))
+    (staging / "delta").mkdir()
+
+
+def test_plan_compares_documents_by_id_and_title(graphrag_space):
+    ids = _write_inputs(graphrag_space, {"same.txt": "same", "edited.txt": "new text", "fresh.txt": "fresh"})
+    _write_documents(graphrag_space / "output", {
+        "same.txt": ids["same.txt"], "edited.txt": "id-of-the-old-text", "gone.txt": "id-of-gone",
+    })
+
+    ingestor = Ingestor(graphrag_space)
+    plan = ingestor.plan()
+    assert (plan.new, plan.changed, plan.deleted, plan.unchanged) == (["fresh.txt"], ["edited.txt"], ["gone.txt"], 1)
+    with pytest.raises(IngestError, match="edited.txt"):
+        ingestor.run(plan)
+
+
+def test_run_publishes_new_versions_behind_the_output_link(monkeypatch, graphrag_space):
+    monkeypatch.setattr(Ingestor, "_build", staticmethod(_merge_new_documents))
+    output, versions = graphrag_space / "output", graphrag_space / VERSIONS_DIR
+    ids = _write_inputs(graphrag_space, {"mice.txt": "Mice on the ISS."})
+    _write_documents(output, ids)
+    index = KnowledgeIndex(graphrag_space).load()
+    ingestor = Ingestor(graphrag_space, keep_versions=2, prune_after=0)
+
+    assert ingestor.run().version is None         # nothing new: nothing published
+    assert not output.is_symlink()
+
+    _write_inputs(graphrag_space, {"bone.txt": "Bone loss."})
+    first = ingestor.run()
+    assert re.fullmatch(r"\d{8}-\d{6}-[0-9a-f]{8}", first.version)
+    # The original output became a version too; the link now points at the new one.
+    assert output.is_symlink() and output.resolve() == versions / first.version
+    assert (versions / "initial" / "create_final_entities.parquet").exists()
+    assert not (versions / first.version / "delta").exists()
+    assert not [p for p in versions.iterdir() if p.name.endswith(".tmp")]
+
+    assert index.output_moved() and index.reload()
+    assert sorted(index.arrow("create_final_documents")["title"].to_pylist()) == ["bone.txt", "mice.txt"]
+    assert not index.reload()
+
+    _write_inputs(graphrag_space, {"retina.txt": "Retina."})
+    second = ingestor.run()
+    # keep_versions=2: the current one and the one before it; `initial` is pruned.
+    assert sorted(p.name for p in versions.iterdir() if p.is_dir()) == sorted([first.version, second.version])
+    assert output.resolve() == versions / second.version
+
+
+def test_failed_build_leaves_the_current_version(monkeypatch, graphrag_space):
+    async def fail(config, staging):
+        staging.mkdir()
+        raise IngestError("Indexing failed: extract_graph")
+
+    monkeypatch.setattr(Ingestor, "_build", staticmethod(fail))
+    _write_documents(graphrag_space / "output", {})
+    _write_inputs(graphrag_space, {"a.txt": "A"})
+
+    with pytest.raises(IngestError):
+        Ingestor(graphrag_space).run()
+    assert not (graphrag_space / "output").is_symlink()
+    assert [p.name for p in (graphrag_space / VERSIONS_DIR).iterdir()] == [LOCK_FILE]
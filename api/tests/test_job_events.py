@@ -0,0 +1,75 @@
+import asyncio
+from uuid import uuid4
+
+from api.graphbot.jobs import router as jobs_router
+from api.graphbot.jobs.models import JOB_STATUS, Job
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+class _Service:
+    def __init__(self, job: Job) -> None:
+        self.job = job
+
+    def require_job(self, job_uuid):
+        return self.job
+
+    def positions(self, job: Job):
+        return None, None
+
+
+def test_keepalives_share_one_waiter(monkeypatch):
+    monkeypatch.setattr(jobs_router, "SSE_KEEPALIVE_SECONDS", 0.01)
+
+    async def main():
+        job = Job(chat_uuid=uuid4(), message="hi")
+        response = await jobs_router.stream_job_events(_Request(), job.uuid, _Service(job))
+        baseline = len(asyncio.all_tasks())
+        chunks, tasks = [], []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk)
+            tasks.append(len(asyncio.all_tasks()) - baseline)
+            if len(chunks) == 20:
+                job.status = JOB_STATUS.DONE
+                job.answer = "hello"
+                job.done.set()
+        await asyncio.sleep(0)
+        return chunks, tasks, len(asyncio.all_tasks()) - baseline
+
+    chunks, tasks, left = asyncio.run(main())
+    assert chunks[0].startswith("event: status")
+    assert chunks.count(": keepalive\n\n") >= 18
+    assert chunks[-1].startswith("event: done") and "hello" in chunks[-1]
+    assert max(tasks) <= 1          # one waiter, not one per keepalive
+    assert left == 0
+
+
+def test_job_positions(bot, chat_store):
+    from api.graphbot.chats.service import ChatService
+    from api.graphbot.jobs.service import JobService
+    from api.graphbot.store import MemoryStore
+
+    async def main():
+        chats = ChatService(chat_store, bot)
+        chat = await chats.create_chat()
+        service = JobService(MemoryStore[Job](), chats, workers=1)
+        jobs = [await service.submit(chat.uuid, text, "local") for text in ("a", "b", "c")]
+        assert [service.positions(job) for job in jobs] == [(0, None), (1, None), (2, None)]
+
+        service.start()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert [service.positions(job) for job in jobs] == [(None, 0), (0, None), (1, None)]
+
+        for text in ("a", "b", "c"):
+            bot.release(text)
+        await service.wait(jobs[-1].uuid, timeout=1)
+        await service.stop()
+        return [service.positions(job) for job in jobs], [job.answer for job in jobs]
+
+    positions, answers = asyncio.run(main())
+    assert positions == [(None, None)] * 3
+    assert answers == ["re: a", "re: b", "re: c"]
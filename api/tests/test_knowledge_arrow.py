@@ -0,0 +1,34 @@
+import numpy as np
+
+from api.graphbot.knowledge import KnowledgeIndex, TextIndex
+from api.graphbot.knowledge.graph import KnowledgeGraph
+from api.graphbot.knowledge.method_router import SearchMethodRouter
+
+
+def test_graph_text_and_router_never_build_dataframes(graphrag_space):
+    index = KnowledgeIndex(graphrag_space).load()
+
+    graph = index.derived("graph", KnowledgeGraph)
+    text = index.derived("text_index", TextIndex)
+    hits = SearchMethodRouter(index).entity_hits("mice and bone loss")
+
+    assert index._tables == {}                  # everything above read the Arrow tables
+
+    assert graph.ids.tolist() == ["e0", "e1", "e2", "e3"]
+    assert graph.titles.tolist() == ["MICE", "ISS", "BONE LOSS", ""]
+    assert graph.degree.tolist() == [2, 1, 1, 0]
+    assert graph.levels == (0, 1)
+    assert graph.communities[0].tolist() == [0, 0, 1, -1]
+    assert graph.communities[1].tolist() == [2, 2, -1, -1]
+    # The relationship to an unknown title is dropped; a null weight reads as 0.
+    assert graph.edge_ids.tolist() == ["r0", "r1"]
+    assert graph.edge_source.tolist() == [0, 0] and graph.edge_target.tolist() == [1, 2]
+    np.testing.assert_array_equal(graph.edge_weight, [2.0, 0.0])
+
+    assert [hit.id for hit in text.autocomplete("bo")] == ["e2"]
+    assert text.mentions("what happened to the mice on the ISS?") == ["MICE", "ISS"]
+    assert [hit.id for hit in text.search("spaceflight", kinds=("report",))] == ["0"]
+    assert hits == ("MICE", "BONE LOSS")
+
+    # graphrag's search still gets its DataFrames, built on demand.
+    assert index.require_table("create_final_entities")["title"].tolist()[:3] == ["MICE", "ISS", "BONE LOSS"]
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from api.graphbot.knowledge.llm_cache import SQLitePipelineCache
+
+
+def test_children_share_the_file_and_clear_only_their_subtree(tmp_path):
+    async def main():
+        cache = SQLitePipelineCache(tmp_path / "llm_cache.sqlite3")
+        extract, nested = cache.child("extract_graph"), cache.child("extract_graph").child("gleanings")
+        other = cache.child("extract_graph_2")     # shares the prefix, not the subtree
+
+        await extract.set("k", {"answer": 1})
+        await nested.set("k", "nested")
+        await other.set("k", "other")
+        assert await extract.get("k") == {"answer": 1}
+        assert await cache.get("k") is None
+
+        await extract.clear()
+        return await nested.has("k"), await other.get("k"), cache.stats.snapshot()
+
+    nested_left, other_value, stats = asyncio.run(main())
+    assert not nested_left and other_value == "other"
+    assert stats["extract_graph"] == {"hits": 1, "misses": 0, "writes": 1, "hit_rate": 1.0}
+    assert stats["/"]["misses"] == 1
+
+
+def test_import_copies_json_cache_files_once(tmp_path):
+    source = tmp_path / "cache"
+    (source / "summarize").mkdir(parents=True)
+    (source / "summarize" / "chat_1_v2").write_text(json.dumps({"result": "summary"}), encoding="utf-8")
+    (source / "summarize" / "broken").write_text("{not json", encoding="utf-8")
+
+    cache = SQLitePipelineCache(source / "llm_cache.sqlite3")
+    assert cache.import_json_cache(source) == 1
+    assert cache.import_json_cache(source) == 0
+    assert asyncio.run(cache.child("summarize").get("chat_1_v2")) == "summary"
+    assert cache.summary()["summarize"]["entries"] == 1
+    cache.close()
+
+
+def test_hits_and_misses_add_up_across_runs(tmp_path):
+    path = tmp_path / "llm_cache.sqlite3"
+
+    async def run():
+        cache = SQLitePipelineCache(path)
+        summarize = cache.child("summarize")
+        if await summarize.get("k") is None:
+            await summarize.set("k", "summary")
+        await summarize.get("k")
+        cache.close()
+
+    asyncio.run(run())
+    asyncio.run(run())
+
+    cache = SQLitePipelineCache(path)
+    assert cache.summary()["summarize"] == {
+        "entries": 1, "bytes": len('{"result": "summary"}'),
+        "hits": 3, "misses": 1, "writes": 1, "hit_rate": 0.75,
+    }
+    cache.close()
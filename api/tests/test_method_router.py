@@ -0,0 +1,37 @@
+import pytest
+
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.method_router import SearchMethodRouter
+
+
+@pytest.fixture
+def router(graphrag_space) -> SearchMethodRouter:
+    return SearchMethodRouter(KnowledgeIndex(graphrag_space).load())
+
+
+@pytest.mark.parametrize("query, method, hits", [
+    # Titles followed by punctuation, in any case.
+    ("Tell me about the ISS.", "local", ("ISS",)),
+    ("What about bone-loss? And mice...", "local", ("BONE LOSS", "MICE")),
+    ("How does the ISS connect to bone loss?", "drift", ("ISS", "BONE LOSS")),
+    ("¿Cuál es la relación entre MICE e ISS?", "drift", ("MICE", "ISS")),
+    ("Give me an overview of the corpus.", "global", ()),
+    ("Resumen general, por favor", "global", ()),
+])
+def test_routes(router, query, method, hits):
+    decision = router.route(query)
+    assert (decision.method, decision.entity_hits) == (method, hits)
+
+
+@pytest.mark.parametrize("query", [
+    "I presume the study used ovariectomy.",       # "resume"
+    "Effects on connective tissue",                # "connect"
+    "The trendiest assays",                        # "trend"
+])
+def test_cues_match_whole_words_only(router, query):
+    assert router.route(query).reason == "default"
+
+
+def test_mice_and_iss_without_a_relational_cue_stay_local(router):
+    decision = router.route("Mice interacting? ISS crews, interactively")
+    assert decision.method == "local" and decision.entity_hits == ("MICE", "ISS")
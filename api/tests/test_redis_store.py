@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from uuid import uuid4
+
+import pytest
+
+from api.graphbot.chats.models import ROLE, AppendMessage, Chat, ChatMessage, ReadMessages
+from api.graphbot.chats.redis_store import RedisChatStore
+from api.graphbot.store import ObjectNotFoundError
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+def _store(server: fakeredis.FakeServer, **kwargs) -> RedisChatStore:
+    return RedisChatStore(client=fakeredis.FakeRedis(server=server), **kwargs)
+
+
+def _chat(store: RedisChatStore, count: int) -> Chat:
+    chat = Chat()
+    assert store.create(chat)
+    for i in range(count):
+        store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+    return chat
+
+
+def test_paging_keeps_sequence_numbers_across_trims(server):
+    store = _store(server, max_messages=5)
+    chat = _chat(store, 8)
+
+    page = store.read(chat.uuid, ReadMessages(limit=2))
+    assert (page.start, page.end, page.first) == (6, 8, 3)
+    assert [m.content for m in page.messages] == ["m6", "m7"]
+
+    page = store.read(chat.uuid, ReadMessages(limit=10, before=page.next_before))
+    assert [m.content for m in page.messages] == ["m3", "m4", "m5"]
+    assert page.next_before is None
+
+    assert store.read(chat.uuid, ReadMessages(limit=2, before=3)).messages == []
+    with pytest.raises(ObjectNotFoundError):
+        store.read(uuid4(), ReadMessages(limit=2))
+
+
+def test_page_is_a_snapshot_when_another_client_appends(server):
+    store, other = _store(server, max_messages=5), _store(server, max_messages=5)
+    chat = _chat(store, 5)
+
+    @dataclass(frozen=True)
+    class RacingRead(ReadMessages):
+        def bounds(self, first, end):
+            # Another instance appends (and trims) between the size reads and the page read.
+            if end == 5:
+                other.apply(chat.uuid, AppendMessage(role=ROLE.ASSISTANT, content="late"))
+            return super().bounds(first, end)
+
+    page = store.read(chat.uuid, RacingRead(limit=2))
+    assert (page.start, page.end, page.first) == (4, 6, 1)
+    assert [m.content for m in page.messages] == ["m4", "late"]
+
+
+def test_create_writes_the_chat_and_its_messages_together(server, monkeypatch):
+    store = _store(server)
+    chat = Chat(messages=[ChatMessage(role=ROLE.USER, content="m0")])
+
+    def lost(pipe, obj):
+        raise ConnectionError("connection lost")
+
+    monkeypatch.setattr(store, "_write_messages", lost)
+    with pytest.raises(ConnectionError):
+        store.create(chat)
+    monkeypatch.undo()
+    assert store.get(chat.uuid) is None
+
+    assert store.create(chat) and not store.create(chat)
+    assert [m.content for m in _store(server).require(chat.uuid).messages] == ["m0"]
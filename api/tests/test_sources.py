@@ -0,0 +1,32 @@
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.sources import SourceIndex, snippet
+
+
+def test_citations_expand_to_text_units_once_in_order(graphrag_space):
+    sources = KnowledgeIndex(graphrag_space).load().derived("sources", SourceIndex)
+
+    # Text units are cited by row, as graphrag numbers them; entities by human_readable_id.
+    assert sources.text_unit("1").id == "t1"
+    assert sources.text_unit("0").human_readable_id == "1"
+    assert sources.text_unit("2") is None
+    assert sources.entity_row("e2") == sources.entity_row("2") == sources.entity_row("BONE LOSS") == 2
+
+    total, units = sources.entity_sources("ISS")
+    assert total == 2 and [u.id for u in units] == ["t0", "t1"]
+    assert units[0].short_id == "0" and units[0].documents[0].title == "mice.txt"
+
+    citation = sources.expand(sources=["0"], entities=["2", "99"], relationships=["0"])
+    assert [u.id for u in citation.text_units] == ["t0", "t1"]
+    assert citation.cited_by == {"t0": ["sources:0", "relationships:0"], "t1": ["entities:2"]}
+    assert citation.missing == ["entities:99"]
+
+    document = sources.document("d0", max_chars=20)
+    assert document.truncated and document.text_unit_ids == ["t0", "t1"]
+
+
+def test_snippet_centres_on_the_first_mention():
+    text = "Mice were flown on the ISS. " * 3 + "The mice showed bone loss after the flight."
+
+    cut, truncated = snippet(text, ["bone loss"], 30)
+    assert truncated and "bone loss" in cut and cut.startswith("…")
+    assert snippet(text, ["bone loss"], None) == (text, False)
@@ -0,0 +1,103 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from api.graphbot.knowledge import KnowledgeIndex
+from api.graphbot.knowledge.spaces import KnowledgeSpaces, SpaceNotFoundError
+
+
+class _Space:
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+        self.loaded = False
+        self.closed = False
+
+
+def _spaces(default: _Space, budget: int) -> tuple[KnowledgeSpaces[_Space], _Space]:
+    spaces = KnowledgeSpaces(
+        {name: Path(name) for name in ("default", "a", "b")},
+        build=lambda name, root: _Space(name, 40_000_000),
+        load=lambda space: setattr(space, "loaded", True),
+        weigh=lambda space: space.size if space.loaded else 0,
+        close=lambda space: setattr(space, "closed", True),
+        memory_budget=budget,
+        is_loaded=lambda space: space.loaded,
+    )
+    spaces.add("default", default, pinned=True)
+    return spaces
+
+
+def _stats(spaces) -> dict:
+    return {s["name"]: (s["loaded"], s["pinned"], s["approx_mb"]) for s in spaces.stats()}
+
+
+def test_default_space_loaded_elsewhere_is_reported_and_weighed():
+    default = _Space("default", 50_000_000)
+    spaces = _spaces(default, budget=100_000_000)
+    assert _stats(spaces)["default"] == (False, True, 0.0)
+
+    default.loaded = True                   # e.g. by a graph request on the shared index
+    assert _stats(spaces)["default"] == (True, True, 50.0)
+
+    # 50 MB pinned + 40 + 40 is over the 100 MB budget: the least recently used other space goes.
+    a = spaces.get("a")
+    assert not a.closed
+    b = spaces.get("b")
+    assert a.closed and not b.closed and not default.closed
+    assert _stats(spaces) == {
+        "default": (True, True, 50.0),
+        "a": (False, False, 0.0),
+        "b": (True, False, 40.0),
+    }
+
+
+def test_unknown_space():
+    spaces = _spaces(_Space("default", 0), budget=0)
+    with pytest.raises(SpaceNotFoundError):
+        spaces.get("nope")
+
+
+def test_touch_does_not_wait_for_a_slow_weigh(graphrag_space):
+    weighing, release = threading.Event(), threading.Event()
+    default = _Space("default", 10)
+    default.loaded = True
+
+    def weigh(space):
+        weighing.set()
+        release.wait(5)
+        return space.size
+
+    spaces = KnowledgeSpaces({"default": Path("default")}, build=None, load=None, weigh=weigh,
+                             is_loaded=lambda space: space.loaded)
+    spaces.add("default", default, pinned=True)
+
+    stats = threading.Thread(target=spaces.stats)
+    stats.start()
+    assert weighing.wait(5)
+    started = time.perf_counter()
+    assert spaces.touch("default") is default
+    assert time.perf_counter() - started < 0.5
+    release.set()
+    stats.join()
+
+    # Nor does weighing an index wait for one of its slow loads.
+    index = KnowledgeIndex(graphrag_space).load()
+    held = threading.Event()
+
+    def load_slowly():
+        with index._lazy_lock:
+            held.set()
+            release.wait(5)
+
+    release.clear()
+    loading = threading.Thread(target=load_slowly)
+    loading.start()
+    assert held.wait(5)
+    started = time.perf_counter()
+    assert index.approx_bytes() > 0
+    assert time.perf_counter() - started < 0.5
+    release.set()
+    loading.join()
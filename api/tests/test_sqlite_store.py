@@ -0,0 +1,122 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+from api.graphbot.chats.models import ROLE, AppendMessage, Chat, ReadMessages
+from api.graphbot.chats.sqlite_store import SQLiteChatStore
+from api.graphbot.store import ObjectNotFoundError
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteChatStore(tmp_path / "chats.sqlite3")
+    yield store
+    store.close()
+
+
+def _chat(store: SQLiteChatStore, count: int) -> Chat:
+    chat = Chat()
+    assert store.create(chat)
+    for i in range(count):
+        store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"m{i}"))
+    return chat
+
+
+def test_paging_walks_back_to_the_first_message(store):
+    chat = _chat(store, 5)
+
+    page = store.read(chat.uuid, ReadMessages(limit=2))
+    assert (page.start, page.end, page.first) == (3, 5, 0)
+    assert [m.content for m in page.messages] == ["m3", "m4"]
+
+    page = store.read(chat.uuid, ReadMessages(limit=2, before=page.next_before))
+    assert [m.content for m in page.messages] == ["m1", "m2"]
+    page = store.read(chat.uuid, ReadMessages(limit=2, before=page.next_before))
+    assert [m.content for m in page.messages] == ["m0"]
+    assert page.next_before is None
+
+    with pytest.raises(ObjectNotFoundError):
+        store.read(uuid4(), ReadMessages(limit=2))
+    with pytest.raises(ObjectNotFoundError):
+        store.apply(uuid4(), AppendMessage(role=ROLE.USER, content="nowhere"))
+
+
+def test_reopen_keeps_chats_and_message_order(tmp_path):
+    path = tmp_path / "chats.sqlite3"
+    store = SQLiteChatStore(path)
+    chat = _chat(store, 3)
+    store.close()
+
+    store = SQLiteChatStore(path)
+    assert [m.content for m in store.require(chat.uuid).messages] == ["m0", "m1", "m2"]
+    assert store.count() == 1
+    assert store.delete(chat.uuid)
+    assert store.read(_chat(store, 0).uuid, ReadMessages(limit=5)).messages == []
+    store.close()
+
+
+def test_appends_from_several_threads_are_all_kept(store):
+    chat = _chat(store, 0)
+
+    def append(worker: int) -> None:
+        for i in range(25):
+            store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content=f"{worker}:{i}"))
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(append, range(4)))
+
+    contents = [m.content for m in store.require(chat.uuid).messages]
+    assert len(contents) == 100
+    for worker in range(4):
+        # Each writer's own messages stay in the order it wrote them.
+        assert [c for c in contents if c.startswith(f"{worker}:")] == [f"{worker}:{i}" for i in range(25)]
+
+
+def test_mutate_writes_only_the_messages_that_changed(store):
+    chat = _chat(store, 5)
+    conn = store._conn()
+
+    changes = conn.total_changes
+    store.mutate(chat.uuid, AppendMessage(role=ROLE.ASSISTANT, content="m5"))
+    assert conn.total_changes - changes == 1
+
+    # Trimming deletes the two oldest rows and moves `first`; the kept rows are not rewritten.
+    changes = conn.total_changes
+    store.mutate(chat.uuid, lambda c: c.trim_messages(4))
+    assert conn.total_changes - changes == 3
+
+    store.apply(chat.uuid, AppendMessage(role=ROLE.USER, content="m6"))
+    page = store.read(chat.uuid, ReadMessages(limit=3, before=5))
+    assert (page.start, page.end, page.first) == (2, 7, 2)
+    assert [m.content for m in page.messages] == ["m2", "m3", "m4"]
+    assert page.next_before is None
+    assert store.require(chat.uuid).offset == 2
+
+
+def test_files_of_the_rowid_schema_are_migrated(tmp_path):
+    path = tmp_path / "chats.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE chats (uuid TEXT PRIMARY KEY, created_at REAL NOT NULL) WITHOUT ROWID;
+        CREATE TABLE messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chat_uuid TEXT NOT NULL REFERENCES chats(uuid) ON DELETE CASCADE,
+            role TEXT NOT NULL, content TEXT NOT NULL);
+        CREATE INDEX messages_by_chat ON messages (chat_uuid, id);
+    """)
+    a, b = Chat(), Chat()
+    conn.executemany("INSERT INTO chats VALUES (?, 0)", ((str(a.uuid),), (str(b.uuid),)))
+    conn.executemany("INSERT INTO messages (chat_uuid, role, content) VALUES (?, 'user', ?)", (
+        (str(a.uuid), "a0"), (str(b.uuid), "b0"), (str(a.uuid), "a1"),
+    ))
+    conn.commit()
+    conn.close()
+
+    store = SQLiteChatStore(path)
+    assert [m.content for m in store.require(a.uuid).messages] == ["a0", "a1"]
+    store.apply(b.uuid, AppendMessage(role=ROLE.USER, content="b1"))
+    page = store.read(b.uuid, ReadMessages(limit=5))
+    assert (page.start, page.end) == (0, 2) and [m.content for m in page.messages] == ["b0", "b1"]
+    store.close()
@@ -0,0 +1,60 @@
+import numpy as np
+import pyarrow as pa
+
+from api.graphbot.knowledge.vector_index import VectorIndex
+
+
+def _index(vectors: np.ndarray) -> VectorIndex:
+    ids = [str(i) for i in range(len(vectors))]
+    return VectorIndex(ids=ids, texts=ids, attributes=[{} for _ in ids], vectors=vectors)
+
+
+def test_saved_index_is_normalised_and_memory_mapped(tmp_path):
+    index = _index(np.array([[3.0, 4.0], [0.0, 2.0], [0.0, 0.0]], dtype=np.float32))
+    index.save(tmp_path, "col")
+
+    loaded = VectorIndex.load(tmp_path, "col")
+    assert isinstance(loaded.vectors, np.memmap)
+    np.testing.assert_allclose(np.linalg.norm(loaded.vectors, axis=1), [1.0, 1.0, 0.0], atol=1e-6)
+    assert loaded.search([0.0, 1.0], k=1)[0][0] == 1
+
+
+def test_unnormalised_saved_matrix_is_normalised_not_skipped(tmp_path):
+    index = _index(np.array([[1.0, 0.0]], dtype=np.float32))
+    index.save(tmp_path, "col")
+    # A matrix written by something else, not normalised.
+    np.save(tmp_path / "col.npy", np.array([[3.0, 4.0]], dtype=np.float32))
+
+    loaded = VectorIndex.load(tmp_path, "col")
+    np.testing.assert_allclose(loaded.vectors, [[0.6, 0.8]], atol=1e-6)
+    assert loaded.search([0.6, 0.8], k=1)[0][1] > 0.999
+
+
+def test_saving_again_leaves_mapped_readers_on_their_file(tmp_path):
+    _index(np.array([[1.0, 0.0]], dtype=np.float32)).save(tmp_path, "col")
+    reader = VectorIndex.load(tmp_path, "col")
+
+    _index(np.array([[0.0, 1.0], [1.0, 0.0]], dtype=np.float32)).save(tmp_path, "col", source_mtime=2.0)
+    # Replaced, not rewritten: the mapped matrix keeps its old pages.
+    np.testing.assert_allclose(reader.vectors, [[1.0, 0.0]])
+    assert len(VectorIndex.load(tmp_path, "col")) == 2
+    assert VectorIndex.saved_mtime(tmp_path, "col") == 2.0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["col.json", "col.npy"]
+
+
+def test_empty_lancedb_table_gives_an_empty_index(tmp_path):
+    import lancedb
+
+    schema = pa.schema([
+        ("id", pa.string()), ("text", pa.string()),
+        ("vector", pa.list_(pa.float32(), 3)), ("attributes", pa.string()),
+    ])
+    lancedb.connect(str(tmp_path / "lancedb")).create_table("default-entity-description", schema=schema)
+
+    index = VectorIndex.from_lancedb(str(tmp_path / "lancedb"), "default-entity-description")
+    assert (len(index), index.dim) == (0, 3)
+    assert index.search([1.0, 0.0, 0.0], k=5) == []
+    assert index.search_batch(np.ones((2, 3)), k=5)[0].shape == (2, 0)
+
+    index.save(tmp_path / "cache", "empty")
+    assert VectorIndex.load(tmp_path / "cache", "empty").vectors.shape == (0, 3)
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from graphrag.index.config.embeddings import community_full_content_embedding, entity_description_embedding
+
+from api.graphbot.knowledge import KnowledgeIndex, search, worker_pool
+from api.graphbot.knowledge.worker_pool import SearchProcessPool
+
+
+class _ThreadPool(SearchProcessPool):
+    """Threads instead of spawned processes, with a slow warm-up."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.built: list[ThreadPoolExecutor] = []
+
+    def _warm_executor(self) -> ThreadPoolExecutor:
+        time.sleep(0.2)
+        executor = ThreadPoolExecutor(self.workers)
+        self.built.append(executor)
+        return executor
+
+
+def test_restart_keeps_serving_from_the_old_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker_pool, "_run", lambda method, query: (method, query, threading.current_thread().name))
+    pool = _ThreadPool(tmp_path, workers=2)
+    pool.start()
+    first = pool._executor
+
+    async def main():
+        restart = asyncio.create_task(asyncio.to_thread(pool.restart))
+        await asyncio.sleep(0.05)
+        # Mid-restart: answered by the old pool, without blocking the loop or building another one.
+        started = time.perf_counter()
+        assert (await pool.run("local", "q"))[:2] == ("local", "q")
+        assert time.perf_counter() - started < 0.15
+        await restart
+
+    asyncio.run(main())
+    assert len(pool.built) == 2
+    assert pool._executor is pool.built[1] and pool._executor is not first
+    pool.shutdown()
+
+
+def test_first_query_starts_the_pool_off_the_loop(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker_pool, "_run", lambda method, query: query)
+    pool = _ThreadPool(tmp_path, workers=1)
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        answers = await asyncio.gather(pool.run("local", "a"), pool.run("local", "b"))
+        ticker.cancel()
+        return answers, ticks
+
+    answers, ticks = asyncio.run(main())
+    assert answers == ["a", "b"]
+    assert ticks >= 5                   # the loop kept running during the 0.2 s warm-up
+    assert len(pool.built) == 1
+    pool.shutdown()
+
+
+class _Engine:
+    """Stands in for graphrag's search engine: answers with what it was built from."""
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.context_builder = SimpleNamespace(text_embedder=None)
+        self.context_builder_params = {}
+
+    async def asearch(self, query: str):
+        return SimpleNamespace(response=f"{len(self.kwargs['entities'])} entities", context_data={})
+
+
+def test_a_started_worker_answers_without_building_anything(monkeypatch, graphrag_space, caplog):
+    monkeypatch.setattr(worker_pool, "_search", None)
+    monkeypatch.setattr(search, "get_text_embedder", lambda config: SimpleNamespace())     # no tokenizer download
+    worker_pool._init_worker(graphrag_space, None, 16)
+    index = worker_pool._search.index
+
+    assert "Could not warm" not in caplog.text
+    assert {"create_final_entities", "create_final_relationships", "create_final_text_units"} <= set(index._tables)
+    assert set(index._vectors) == {entity_description_embedding, community_full_content_embedding}
+
+    def rebuilt(*args, **kwargs):
+        raise AssertionError("built on the first query")
+
+    for name in ("read_indexer_entities", "read_indexer_relationships", "read_indexer_reports",
+                 "read_indexer_text_units", "read_indexer_covariates", "get_text_embedder"):
+        monkeypatch.setattr(search, name, rebuilt)
+    monkeypatch.setattr(KnowledgeIndex, "_load_vectors", staticmethod(rebuilt))
+    monkeypatch.setattr(KnowledgeIndex, "table", rebuilt)
+    monkeypatch.setattr(search, "get_local_search_engine", _Engine)
+
+    assert worker_pool._run("local", "what happened to the MICE?") == "4 entities"
+
+
+def test_query_submitted_during_a_swap_goes_to_the_new_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(worker_pool, "_run", lambda method, query: query)
+    pool = _ThreadPool(tmp_path, workers=1)
+
+    class _Swapped(ThreadPoolExecutor):
+        def submit(self, *args, **kwargs):
+            # `restart` runs between `run` reading the executor and submitting to it.
+            pool.restart()
+            return super().submit(*args, **kwargs)
+
+    pool._executor = _Swapped(1)
+    assert asyncio.run(pool.run("local", "q")) == "q"
+    assert pool._executor is pool.built[0]
+    pool.shutdown()